@@ -1,73 +1,72 @@
+import sys
 from functools import partial
-import os
+from typing import Optional
+
 import click
-from cdo_sdk_python import (
-    ApiClient,
-    InventoryApi,
-    AIAssistantApi,
-    AiQuestion,
-)
+from cdo_sdk_python import ApiClient
+from cdo_sdk_python.exceptions import ApiException
 
-from cdo_api import execute_using_cdo_api
-from transactions_api import wait_for_transaction_to_finish
+from cdo_api import execute_using_cdo_api, get_api_host
+from services.ai_answer_cache_service import AiAnswerCacheService, DEFAULT_TTL_SECONDS
+from services.ai_assistant_service import AiAssistantService
+from utils.cache_dir import get_tenant_key
+from utils.cli_options import (
+    base_url_option,
+    cdo_api_token_option,
+    answer_cache_ttl_option,
+    no_answer_cache_option,
+)
 
 
 @click.command()
-@click.option(
-    "--base-url",
-    help="Enter the CDO Base URL",
-    prompt=True,
-    type=click.Choice(
-        [
-            "https://www.defenseorchestrator.com",
-            "https://apj.cdo.cisco.com",
-            "https://www.defenseorchestator.eu",
-            "https://au.cdo.cisco.com",
-            "https://in.cdo.cisco.com",
-        ],
-        case_sensitive=True,
-    ),
-    default="https://www.defenseorchestrator.com",
-)
-@click.option(
-    "--cdo-api-token",
-    help="Enter the CDO API token",
-    prompt=True,
-    hide_input=True,
-    default=lambda: os.environ.get("CDO_API_TOKEN"),
-    show_default="CDO_API_TOKEN environment variable",
-)
+@base_url_option()
+@cdo_api_token_option()
 @click.option(
     "--question",
     help="Enter the question you want to ask the AI Assistant",
     prompt=True,
 )
-def ask_ai_assistant_question_cmd(base_url: str, cdo_api_token: str, question: str):
+@answer_cache_ttl_option(DEFAULT_TTL_SECONDS)
+@no_answer_cache_option()
+def ask_ai_assistant_question_cmd(
+    base_url: str,
+    cdo_api_token: str,
+    question: str,
+    answer_cache_ttl: float,
+    no_cache: bool,
+):
+    answer_cache = (
+        None
+        if no_cache
+        else AiAnswerCacheService(
+            tenant=get_tenant_key(cdo_api_token),
+            region=get_api_host(base_url),
+            ttl_seconds=answer_cache_ttl,
+        )
+    )
     execute_using_cdo_api(
         base_url,
         cdo_api_token,
-        partial(ask_ai_assistant_question, question),
+        partial(ask_ai_assistant_question, question, answer_cache),
     )
 
 
-def ask_ai_assistant_question(question: str, api_client: str):
-    ai_assistant_api = AIAssistantApi(api_client)
-    cdo_transaction = ai_assistant_api.ask_ai_assistant(
-        ai_question=AiQuestion(content=question)
-    )
-    wait_for_transaction_to_finish(
-        cdo_transaction,
-        api_client,
-        "Received answer from AI Assistant",
-        "Failed to get answer from AI assistant",
-    )
-
-    messages = ai_assistant_api.get_ai_assistant_conversation_messages(
-        cdo_transaction.entity_uid
-    )
-    request = [message for message in messages if message.content == question][0]
-    response = [message for message in messages if message.in_reply_to == request.uid][0]
-    print(f"The AI assistant said {response.content}")
+def ask_ai_assistant_question(
+    question: str,
+    answer_cache: Optional[AiAnswerCacheService],
+    api_client: ApiClient,
+):
+    try:
+        answer = AiAssistantService(api_client, answer_cache).ask(
+            question,
+            on_update=lambda transaction: print(
+                f"CDO transaction status: {transaction.cdo_transaction_status}"
+            ),
+        )
+    except (RuntimeError, ApiException) as e:
+        print(f"Failed to get answer from AI assistant: {e}")
+        sys.exit(1)
+    print(f"The AI assistant said {answer}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,116 @@
+import json
+import sys
+from functools import partial
+from typing import Optional
+
+import click
+from cdo_sdk_python import ApiClient
+
+from cdo_api import execute_using_cdo_api, get_api_host
+from parsers.question_parser import QuestionParser
+from services.ai_answer_cache_service import AiAnswerCacheService, DEFAULT_TTL_SECONDS
+from services.ai_assistant_service import AiAssistantService
+from utils.cache_dir import get_tenant_key
+from utils.cli_options import (
+    base_url_option,
+    cdo_api_token_option,
+    answer_cache_ttl_option,
+    no_answer_cache_option,
+)
+
+
+@click.command(
+    help="Ask the AI Assistant every question in a file, several at a time, and write the answers as JSON lines as they arrive."
+)
+@base_url_option(prompt=False)
+@cdo_api_token_option(prompt=False)
+@click.option(
+    "--questions-file",
+    type=click.Path(exists=True, dir_okay=False),
+    required=True,
+    help='Text file with one question per line, or a .jsonl file of {"question": ...} objects.',
+)
+@click.option(
+    "--max-in-flight",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="The maximum number of questions to have the AI Assistant work on at once.",
+)
+@click.option(
+    "--output-file",
+    type=click.File(mode="w"),
+    default="-",
+    help="Where to write the question/answer pairs. Defaults to stdout.",
+)
+@answer_cache_ttl_option(DEFAULT_TTL_SECONDS)
+@no_answer_cache_option()
+def ask_ai_assistant_questions_cmd(
+    base_url: str,
+    cdo_api_token: str,
+    questions_file: str,
+    max_in_flight: int,
+    output_file,
+    answer_cache_ttl: float,
+    no_cache: bool,
+):
+    answer_cache = (
+        None
+        if no_cache
+        else AiAnswerCacheService(
+            tenant=get_tenant_key(cdo_api_token),
+            region=get_api_host(base_url),
+            ttl_seconds=answer_cache_ttl,
+        )
+    )
+    execute_using_cdo_api(
+        base_url,
+        cdo_api_token,
+        partial(
+            ask_ai_assistant_questions,
+            QuestionParser(questions_file),
+            max_in_flight,
+            answer_cache,
+            output_file,
+        ),
+    )
+
+
+def ask_ai_assistant_questions(
+    question_parser: QuestionParser,
+    max_in_flight: int,
+    answer_cache: Optional[AiAnswerCacheService],
+    output_file,
+    api_client: ApiClient,
+):
+    ai_assistant_service = AiAssistantService(api_client, answer_cache)
+    answered = 0
+    failed = 0
+    for result in ai_assistant_service.ask_many(
+        question_parser.iter_questions(), max_in_flight
+    ):
+        if result.succeeded:
+            answered += 1
+        else:
+            failed += 1
+        output_file.write(
+            json.dumps(
+                {
+                    "question": result.question,
+                    "answer": result.answer,
+                    "error": result.error,
+                }
+            )
+            + "\n"
+        )
+        output_file.flush()
+    for result in question_parser.rejected_rows:
+        failed += 1
+        click.echo(f"{result.question}: {result.error}", err=True)
+    click.echo(f"Answered {answered} question(s); {failed} failed.", err=True)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    ask_ai_assistant_questions_cmd()
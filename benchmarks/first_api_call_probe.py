@@ -0,0 +1,23 @@
+"""Runs cli.py with the given arguments, but prints the wall-clock time of the first
+HTTP request the SDK makes and exits instead of sending it."""
+
+import os
+import runpy
+import sys
+import time
+
+import urllib3
+
+
+def _exit_on_first_request(*_args, **_kwargs):
+    print(f"first_api_call_at={time.time()}", flush=True)
+    os._exit(0)
+
+
+urllib3.PoolManager.request = _exit_on_first_request
+urllib3.PoolManager.urlopen = _exit_on_first_request
+
+repository_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repository_root)
+sys.argv = ["cli.py", *sys.argv[1:]]
+runpy.run_path(os.path.join(repository_root, "cli.py"), run_name="__main__")
@@ -0,0 +1,176 @@
+"""A local stand-in for the SSH console of FTDs waiting to be onboarded, so that
+headless onboarding can be tested without real devices.
+
+Every connection gets an FTD CLI prompt that accepts `configure manager add ...`
+commands and records the CLI keys it was given. Point the address (and ssh_port) of
+each row of a headless FTD CSV file at the server to use it.
+"""
+
+import os
+import socket
+import sys
+import threading
+import time
+from typing import List, Optional
+
+import click
+import paramiko
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY_ROOT)
+
+from services.ftd_ssh_service import FTD_CLI_PROMPT, SUCCESS_MESSAGE  # noqa: E402
+
+BANNER = "Copyright 2004-2024, Cisco and/or its affiliates. All rights reserved.\r\n"
+
+
+class _FtdServerInterface(paramiko.ServerInterface):
+    def __init__(self, username: str, password: str):
+        self.username = username
+        self.password = password
+
+    def get_allowed_auths(self, _username: str) -> str:
+        return "password"
+
+    def check_auth_password(self, username: str, password: str) -> int:
+        if username == self.username and password == self.password:
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind: str, _chanid: int) -> int:
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_pty_request(self, *_args) -> bool:
+        return True
+
+    def check_channel_shell_request(self, _channel: paramiko.Channel) -> bool:
+        return True
+
+
+class MockFtdSshServer:
+    def __init__(
+        self,
+        port: int = 0,
+        username: str = "admin",
+        password: str = "Admin123",
+        key_push_latency_seconds: float = 0.0,
+    ):
+        self.username = username
+        self.password = password
+        self.key_push_latency_seconds = key_push_latency_seconds
+        self.host_key = paramiko.RSAKey.generate(2048)
+        self.cli_keys: List[str] = []
+        self._lock = threading.Lock()
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind(("127.0.0.1", port))
+        # headless onboarding opens a session per FTD in flight
+        self._socket.listen(1024)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._socket.getsockname()[1]
+
+    def __enter__(self) -> "MockFtdSshServer":
+        self._thread = threading.Thread(
+            target=self._serve_forever, name="mock-ftd-ssh-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self._socket.close()
+
+    def _serve_forever(self) -> None:
+        while True:
+            try:
+                client, _address = self._socket.accept()
+            except OSError:
+                return
+            threading.Thread(
+                target=self._handle_session, args=(client,), daemon=True
+            ).start()
+
+    def _handle_session(self, client: socket.socket) -> None:
+        with paramiko.Transport(client) as transport:
+            transport.add_server_key(self.host_key)
+            try:
+                transport.start_server(
+                    server=_FtdServerInterface(self.username, self.password)
+                )
+            except paramiko.SSHException:
+                return
+            channel = transport.accept(timeout=30)
+            if channel is None:
+                return
+            try:
+                with channel:
+                    self._run_shell(channel)
+            except (EOFError, OSError, paramiko.SSHException):
+                # the client hung up without exiting the CLI
+                pass
+
+    def _run_shell(self, channel: paramiko.Channel) -> None:
+        channel.sendall(f"{BANNER}{FTD_CLI_PROMPT}".encode("utf-8"))
+        for line in self._read_lines(channel):
+            channel.sendall(f"{line}\r\n".encode("utf-8"))
+            if line == "exit":
+                return
+            channel.sendall(
+                f"{self._run_command(line)}\r\n{FTD_CLI_PROMPT}".encode("utf-8")
+            )
+
+    def _run_command(self, command: str) -> str:
+        if not command:
+            return ""
+        if not command.startswith("configure manager add "):
+            return f"Syntax error: Illegal parameter '{command.split()[0]}'"
+        time.sleep(self.key_push_latency_seconds)
+        with self._lock:
+            self.cli_keys.append(command)
+        return (
+            f"{SUCCESS_MESSAGE}.\r\n"
+            "Please make note of reg_key as this will be required while adding Device in FMC."
+        )
+
+    @staticmethod
+    def _read_lines(channel: paramiko.Channel):
+        buffer = ""
+        while True:
+            chunk = channel.recv(4096)
+            if not chunk:
+                return
+            buffer += chunk.decode("utf-8", errors="replace")
+            while "\n" in buffer:
+                line, buffer = buffer.split("\n", 1)
+                yield line.strip()
+
+
+@click.command(help="Run a mock FTD SSH console until interrupted.")
+@click.option("--port", type=int, default=2222, show_default=True)
+@click.option("--username", default="admin", show_default=True)
+@click.option("--password", default="Admin123", show_default=True)
+@click.option(
+    "--key-push-latency",
+    type=float,
+    default=0.0,
+    show_default=True,
+    help="Seconds the FTD takes to accept a CLI key.",
+)
+def mock_ftd_ssh_server(
+    port: int, username: str, password: str, key_push_latency: float
+):
+    with MockFtdSshServer(port, username, password, key_push_latency) as server:
+        click.echo(f"Mock FTD SSH console listening on 127.0.0.1:{server.port}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+        click.echo(f"Received {len(server.cli_keys)} CLI key(s)")
+
+
+if __name__ == "__main__":
+    mock_ftd_ssh_server()
@@ -0,0 +1,333 @@
+"""A local stand-in for the parts of the SCC API these scripts use, so that they can
+be benchmarked and regression-tested without a live tenant.
+
+Transactions finish `transaction_latency_seconds` after they are submitted, and fail
+with probability `error_rate`. Set `SCC_BASE_URL` to the server's URL to point the
+scripts at it.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import click
+
+CDFMC_DOMAIN_UID = "e276abec-e0f2-11e3-8169-6d9ed49b625f"
+ACCESS_POLICIES = [
+    {"id": "0050568A-0D0A-0ed3-0000-004294967299", "name": "Default Access Control"},
+]
+_NAME_QUERY_REGEX = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+
+class _MockTransaction:
+    def __init__(
+        self,
+        transaction_type: str,
+        entity_uid: Optional[str],
+        completes_at: float,
+        fails: bool,
+    ):
+        self.transaction_uid = str(uuid.uuid4())
+        self.transaction_type = transaction_type
+        self.entity_uid = entity_uid
+        self.submitted_at = time.time()
+        self.completes_at = completes_at
+        self.fails = fails
+
+    def to_json(self) -> Dict[str, Any]:
+        if time.monotonic() < self.completes_at:
+            status = "IN_PROGRESS"
+        else:
+            status = "ERROR" if self.fails else "DONE"
+        return {
+            "transactionUid": self.transaction_uid,
+            "tenantUid": MockSccState.TENANT_UID,
+            "entityUid": self.entity_uid,
+            "transactionType": self.transaction_type,
+            "cdoTransactionStatus": status,
+            "transactionDetails": (
+                {"error": "Mock failure"} if status == "ERROR" else None
+            ),
+            "submissionTime": self.submitted_at,
+        }
+
+
+class MockSccState:
+    TENANT_UID = "00000000-0000-0000-0000-000000000001"
+
+    def __init__(self, transaction_latency_seconds: float, error_rate: float):
+        self.transaction_latency_seconds = transaction_latency_seconds
+        self.error_rate = error_rate
+        self.lock = threading.Lock()
+        self.devices: Dict[str, Dict[str, Any]] = {}
+        self.transactions: Dict[str, _MockTransaction] = {}
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.cdfmc = {
+            "uid": str(uuid.uuid4()),
+            "name": "cdFMC",
+            "deviceType": "CDFMC",
+            "fmcDomainUid": CDFMC_DOMAIN_UID,
+            "softwareVersion": "7.6.0",
+        }
+
+    def add_device(self, device: Dict[str, Any]) -> Dict[str, Any]:
+        device.setdefault("uid", str(uuid.uuid4()))
+        with self.lock:
+            self.devices[device["uid"]] = device
+        return device
+
+    def start_transaction(
+        self, transaction_type: str, entity_uid: Optional[str]
+    ) -> _MockTransaction:
+        transaction = _MockTransaction(
+            transaction_type,
+            entity_uid,
+            completes_at=time.monotonic() + self.transaction_latency_seconds,
+            fails=random.random() < self.error_rate,
+        )
+        with self.lock:
+            self.transactions[transaction.transaction_uid] = transaction
+        return transaction
+
+    def find_devices(self, q: Optional[str]) -> List[Dict[str, Any]]:
+        with self.lock:
+            devices = list(self.devices.values())
+        if not q:
+            return devices
+        if q.startswith("name:"):
+            names = set(_NAME_QUERY_REGEX.findall(q)) or {q[len("name:") :]}
+            return [device for device in devices if device["name"] in names]
+        if q.startswith("deviceType:"):
+            return [
+                device for device in devices if device["deviceType"] == q.split(":")[1]
+            ]
+        return devices
+
+
+class MockSccRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "MockSccServer"
+
+    def log_message(self, *_args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        url = urlparse(self.path)
+        # the SDK is configured with `.../api/rest`, the cdFMC calls are not
+        path = url.path.removeprefix("/api/rest")
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        if self.server.request_latency_seconds:
+            time.sleep(self.server.request_latency_seconds)
+        for route_method, route, handler in _ROUTES:
+            match = route.fullmatch(path)
+            if match and route_method == method:
+                status, response = handler(
+                    self.server.state, query, body, *match.groups()
+                )
+                return self._send(status, response)
+        self._send(404, {"error": f"No mock for {method} {path}"})
+
+    def _send(self, status: int, response: Any) -> None:
+        content = json.dumps(response).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def _page(items: List[Dict[str, Any]], query: Dict[str, str]) -> Dict[str, Any]:
+    limit, offset = int(query.get("limit", 50)), int(query.get("offset", 0))
+    return {
+        "count": len(items),
+        "limit": limit,
+        "offset": offset,
+        "items": items[offset : offset + limit],
+    }
+
+
+def _get_devices(state: MockSccState, query, _body) -> Tuple[int, Any]:
+    return 200, _page(state.find_devices(query.get("q")), query)
+
+
+def _get_device(state: MockSccState, _query, _body, device_uid) -> Tuple[int, Any]:
+    device = state.devices.get(device_uid)
+    return (200, device) if device else (404, {"error": "Device not found"})
+
+
+def _create_ftd(state: MockSccState, _query, body) -> Tuple[int, Any]:
+    device = state.add_device(
+        {
+            "name": body["name"],
+            "deviceType": "CDFMC_MANAGED_FTD",
+            "connectivityState": "PENDING_SETUP",
+            "ftdLicenses": body.get("licenses"),
+            "ftdPerformanceTier": body.get("performanceTier"),
+            "cdFmcInfo": {"cliKey": f"configure manager add mock {uuid.uuid4()}"},
+        }
+    )
+    return 202, state.start_transaction("CREATE_FTD", device["uid"]).to_json()
+
+
+def _register_ftd(state: MockSccState, _query, body) -> Tuple[int, Any]:
+    device = state.devices.get(body["ftdUid"])
+    if device is None:
+        return 404, {"error": "Device not found"}
+    device["connectivityState"] = "ONLINE"
+    return 202, state.start_transaction("REGISTER_FTD", device["uid"]).to_json()
+
+
+def _onboard_ztp(state: MockSccState, _query, body) -> Tuple[int, Any]:
+    state.add_device(
+        {
+            "name": body["name"],
+            "deviceType": "CDFMC_MANAGED_FTD",
+            "serial": body.get("serialNumber"),
+            "connectivityState": "ONLINE",
+        }
+    )
+    # like the real API, ZTP transactions do not say which device they created
+    return 202, state.start_transaction("ONBOARD_FTD_ZTP", None).to_json()
+
+
+def _get_transaction(
+    state: MockSccState, _query, _body, transaction_uid
+) -> Tuple[int, Any]:
+    transaction = state.transactions.get(transaction_uid)
+    if transaction is None:
+        return 404, {"error": "Transaction not found"}
+    return 200, transaction.to_json()
+
+
+def _get_managers(state: MockSccState, query, _body) -> Tuple[int, Any]:
+    return 200, _page([state.cdfmc], query)
+
+
+def _get_users(state: MockSccState, query, _body) -> Tuple[int, Any]:
+    return 200, _page(list(state.users.values()), query)
+
+
+def _create_user(state: MockSccState, _query, body) -> Tuple[int, Any]:
+    with state.lock:
+        if body["name"] in state.users:
+            return 409, {"error": "User already exists"}
+        user = {
+            "uid": str(uuid.uuid4()),
+            "name": body["name"],
+            "roles": [body.get("role")],
+            "apiOnlyUser": body.get("apiOnlyUser", False),
+        }
+        state.users[body["name"]] = user
+    return 200, user
+
+
+def _get_access_policies(
+    state: MockSccState, query, _body, _domain_uid
+) -> Tuple[int, Any]:
+    page = _page(ACCESS_POLICIES, query)
+    return 200, {"items": page["items"], "paging": {"count": page["count"]}}
+
+
+_ROUTES = [
+    ("GET", re.compile(r"/v1/inventory/devices"), _get_devices),
+    ("GET", re.compile(r"/v1/inventory/devices/([^/]+)"), _get_device),
+    ("POST", re.compile(r"/v1/inventory/devices/ftds"), _create_ftd),
+    ("POST", re.compile(r"/v1/inventory/devices/ftds/register"), _register_ftd),
+    ("POST", re.compile(r"/v1/inventory/devices/ftds/ztp"), _onboard_ztp),
+    ("GET", re.compile(r"/v1/transactions/([^/]+)"), _get_transaction),
+    ("GET", re.compile(r"/v1/inventory/managers"), _get_managers),
+    ("GET", re.compile(r"/v1/users"), _get_users),
+    ("POST", re.compile(r"/v1/users"), _create_user),
+    (
+        "GET",
+        re.compile(r"/v1/cdfmc/api/fmc_config/v1/domain/([^/]+)/policy/accesspolicies"),
+        _get_access_policies,
+    ),
+]
+
+
+class MockSccServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # the benchmarks open many concurrent connections
+    request_queue_size = 1024
+
+    def __init__(
+        self,
+        port: int = 0,
+        transaction_latency_seconds: float = 1.0,
+        error_rate: float = 0.0,
+        request_latency_seconds: float = 0.0,
+    ):
+        super().__init__(("127.0.0.1", port), MockSccRequestHandler)
+        self.state = MockSccState(transaction_latency_seconds, error_rate)
+        self.request_latency_seconds = request_latency_seconds
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/api/rest"
+
+    def __enter__(self) -> "MockSccServer":
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="mock-scc-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+@click.command(help="Run a mock SCC API server until interrupted.")
+@click.option("--port", type=int, default=8080, show_default=True)
+@click.option(
+    "--transaction-latency",
+    type=float,
+    default=1.0,
+    show_default=True,
+    help="Seconds until a submitted transaction finishes.",
+)
+@click.option(
+    "--error-rate",
+    type=click.FloatRange(0, 1),
+    default=0.0,
+    show_default=True,
+    help="The fraction of transactions that end in ERROR.",
+)
+@click.option(
+    "--request-latency",
+    type=float,
+    default=0.0,
+    show_default=True,
+    help="Seconds added to every response.",
+)
+def mock_scc_server(
+    port: int, transaction_latency: float, error_rate: float, request_latency: float
+):
+    with MockSccServer(
+        port, transaction_latency, error_rate, request_latency
+    ) as server:
+        click.echo(f"Mock SCC API listening; export SCC_BASE_URL={server.base_url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    mock_scc_server()
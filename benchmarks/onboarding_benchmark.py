@@ -0,0 +1,333 @@
+import asyncio
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+
+import click
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY_ROOT)
+
+from cdo_sdk_python import Configuration, ZtpOnboardingInput  # noqa: E402
+
+from benchmarks.mock_scc_server import MockSccServer  # noqa: E402
+from services.async_api_client import AsyncApiClient  # noqa: E402
+from services.async_cdfmc_api_service import AsyncCdFmcApiService  # noqa: E402
+from services.async_inventory_api_service import (  # noqa: E402
+    AsyncInventoryApiService,
+)
+from services.inventory_api_service import InventoryApiService  # noqa: E402
+from services.scc_api_client import SccApiClient  # noqa: E402
+from services.transaction_poller import TransactionFailedError  # noqa: E402
+from utils.rate_limiter import RateLimiter, set_rate_limiter  # noqa: E402
+
+
+def _percentile(sorted_samples: List[float], percentile: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[round(percentile * (len(sorted_samples) - 1))]
+
+
+class _DeviceTimings:
+    """End-to-end latency of every device, and which devices failed: either in a
+    transaction that ended in ERROR (as `--error-rate` asks the mock for), or with
+    any other error, which points at the client or the mock rather than the API."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.transaction_failures: List[str] = []
+        self.other_errors: List[str] = []
+
+
+def _summarise(
+    device_count: int, elapsed_seconds: float, timings: _DeviceTimings
+) -> Dict[str, float]:
+    latencies = sorted(timings.latencies)
+    return {
+        "devices": device_count,
+        "transaction_failures": len(timings.transaction_failures),
+        "other_errors": len(timings.other_errors),
+        "elapsed_s": round(elapsed_seconds, 2),
+        "devices_per_s": round(device_count / elapsed_seconds, 1),
+        "p50_ms": round(_percentile(latencies, 0.5) * 1000, 1),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 1),
+    }
+
+
+def _ztp_inputs(
+    device_count: int,
+    fmc_access_policy_uid: str = "0050568A-0D0A-0ed3-0000-004294967299",
+) -> List[ZtpOnboardingInput]:
+    return [
+        ZtpOnboardingInput(
+            name=f"benchmark-ftd-{index}",
+            serial_number=f"JAD{index:08d}",
+            fmc_access_policy_uid=fmc_access_policy_uid,
+            admin_password="Benchmark123!",
+            licenses=["BASE"],
+        )
+        for index in range(device_count)
+    ]
+
+
+def benchmark_inventory_api_service(
+    server: MockSccServer, device_count: int, max_in_flight: int
+) -> Dict[str, Dict[str, float]]:
+    api_client = SccApiClient(
+        Configuration(host=server.base_url, access_token="benchmark")
+    )
+    api_client.configuration.connection_pool_maxsize = max_in_flight
+    inventory_api_service = InventoryApiService(api_client)
+
+    timings = _DeviceTimings()
+    with _timing_onboard_ftd_ztp_device(timings):
+        started_at = time.perf_counter()
+        inventory_api_service.onboard_ftd_ztp_devices(
+            _ztp_inputs(device_count), max_in_flight=max_in_flight
+        )
+        ztp_summary = _summarise(
+            device_count, time.perf_counter() - started_at, timings
+        )
+
+    started_at = time.perf_counter()
+    listed_device_count = sum(1 for _ in inventory_api_service.iter_devices())
+    list_elapsed_seconds = time.perf_counter() - started_at
+    list_summary = {
+        "devices": listed_device_count,
+        "elapsed_s": round(list_elapsed_seconds, 2),
+        "devices_per_s": round(listed_device_count / list_elapsed_seconds, 1),
+    }
+    return {
+        "InventoryApiService.onboard_ftd_ztp_devices": ztp_summary,
+        "InventoryApiService.iter_devices": list_summary,
+    }
+
+
+async def _benchmark_async_inventory_api_service(
+    server: MockSccServer, device_count: int, max_in_flight: int
+) -> Dict[str, Dict[str, float]]:
+    timings = _DeviceTimings()
+    async with AsyncApiClient(
+        server.base_url, "benchmark", max_connections=max_in_flight
+    ) as api_client:
+        # resolve the access policy through cdFMC, as the CLI does
+        cdfmc_api_service = await AsyncCdFmcApiService.create(api_client)
+        access_policy = await cdfmc_api_service.get_first_access_policy_uid()
+        inventory_api_service = AsyncInventoryApiService(api_client)
+        in_flight = asyncio.Semaphore(max_in_flight)
+
+        async def timed_onboard_ftd_ztp_device(ztp_onboarding_input):
+            async with in_flight:
+                started_at = time.perf_counter()
+                try:
+                    await inventory_api_service.onboard_ftd_ztp_device(
+                        ztp_onboarding_input
+                    )
+                except TransactionFailedError:
+                    timings.transaction_failures.append(ztp_onboarding_input.name)
+                except Exception:
+                    timings.other_errors.append(ztp_onboarding_input.name)
+                finally:
+                    timings.latencies.append(time.perf_counter() - started_at)
+
+        started_at = time.perf_counter()
+        await asyncio.gather(
+            *(
+                timed_onboard_ftd_ztp_device(ztp_onboarding_input)
+                for ztp_onboarding_input in _ztp_inputs(device_count, access_policy.id)
+            )
+        )
+        elapsed_seconds = time.perf_counter() - started_at
+    return {
+        "AsyncInventoryApiService.onboard_ftd_ztp_device": _summarise(
+            device_count, elapsed_seconds, timings
+        )
+    }
+
+
+def benchmark_async_inventory_api_service(
+    server: MockSccServer, device_count: int, max_in_flight: int
+) -> Dict[str, Dict[str, float]]:
+    """The same ZTP onboarding as the service benchmark, driven from one event loop
+    by the asyncio services instead of a thread per device."""
+    return asyncio.run(
+        _benchmark_async_inventory_api_service(server, device_count, max_in_flight)
+    )
+
+
+@contextmanager
+def _environment(**values: str) -> Iterator[None]:
+    saved_values = {name: os.environ.get(name) for name in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for name, value in saved_values.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+@contextmanager
+def _timing_onboard_ftd_ztp_device(timings: _DeviceTimings) -> Iterator[None]:
+    """Time each device end to end, from submission to the device being resolved,
+    by wrapping the method every worker calls."""
+    onboard_ftd_ztp_device = InventoryApiService._onboard_ftd_ztp_device
+
+    def timed_onboard_ftd_ztp_device(self, ztp_onboarding_input, *args, **kwargs):
+        started_at = time.perf_counter()
+        try:
+            return onboard_ftd_ztp_device(self, ztp_onboarding_input, *args, **kwargs)
+        except TransactionFailedError:
+            timings.transaction_failures.append(ztp_onboarding_input.name)
+            raise
+        except Exception:
+            timings.other_errors.append(ztp_onboarding_input.name)
+            raise
+        finally:
+            timings.latencies.append(time.perf_counter() - started_at)
+
+    InventoryApiService._onboard_ftd_ztp_device = timed_onboard_ftd_ztp_device
+    try:
+        yield
+    finally:
+        InventoryApiService._onboard_ftd_ztp_device = onboard_ftd_ztp_device
+
+
+def benchmark_onboard_multiple_ftds(
+    server: MockSccServer, device_count: int, max_in_flight: int
+) -> Dict[str, Dict[str, float]]:
+    from onboard_multiple_ftds import main
+
+    timings = _DeviceTimings()
+    with tempfile.TemporaryDirectory() as working_dir:
+        csv_file = os.path.join(working_dir, "ftd-ztp.csv")
+        with open(csv_file, mode="w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["name", "serial_number", "licenses", "admin_password"])
+            for index in range(device_count):
+                writer.writerow(
+                    [f"cli-ftd-{index}", f"JAE{index:08d}", "BASE", "Benchmark123!"]
+                )
+        # keep the inventory/token caches of the benchmark out of the user's cache
+        with _environment(
+            XDG_CACHE_HOME=working_dir, SCC_BASE_URL=server.base_url
+        ), _timing_onboard_ftd_ztp_device(timings):
+            started_at = time.perf_counter()
+            failed_run = 0
+            try:
+                main.main(
+                    [
+                        "--ztp-ftd-csv-file",
+                        csv_file,
+                        "--max-in-flight",
+                        str(max_in_flight),
+                        "--region",
+                        "us",
+                        "--api-token",
+                        "benchmark",
+                    ],
+                    standalone_mode=False,
+                )
+            except SystemExit as e:
+                failed_run = 1 if e.code else 0
+            elapsed_seconds = time.perf_counter() - started_at
+    return {
+        "onboard_multiple_ftds --ztp-ftd-csv-file": {
+            **_summarise(device_count, elapsed_seconds, timings),
+            "failed_run": failed_run,
+        }
+    }
+
+
+BENCHMARKS: Dict[str, Callable[[MockSccServer, int, int], Dict]] = {
+    "service": benchmark_inventory_api_service,
+    "async": benchmark_async_inventory_api_service,
+    "cli": benchmark_onboard_multiple_ftds,
+}
+
+
+@click.command(
+    help="Measure bulk onboarding throughput and tail latency against a local mock SCC API."
+)
+@click.option(
+    "--sizes",
+    default="10,100,1000,10000",
+    show_default=True,
+    help="Comma-separated numbers of devices to onboard.",
+)
+@click.option(
+    "--max-in-flight", type=click.IntRange(min=1), default=100, show_default=True
+)
+@click.option(
+    "--transaction-latency",
+    type=float,
+    default=0.5,
+    show_default=True,
+    help="Seconds until a mock transaction finishes.",
+)
+@click.option(
+    "--error-rate",
+    type=click.FloatRange(0, 1),
+    default=0.0,
+    show_default=True,
+    help="The fraction of mock transactions that end in ERROR.",
+)
+@click.option(
+    "--benchmark",
+    "benchmarks",
+    type=click.Choice(list(BENCHMARKS)),
+    multiple=True,
+    help="Only run these benchmarks (default: all).",
+)
+@click.option(
+    "--rate-limit/--no-rate-limit",
+    default=False,
+    show_default=True,
+    help="Keep the client-side API rate limiter on. It is tuned for SCC, so it is off by default to measure the client itself.",
+)
+@click.option(
+    "--output-file",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the results as JSON to this file, e.g. to track them across commits.",
+)
+def onboarding_benchmark(
+    sizes: str,
+    max_in_flight: int,
+    transaction_latency: float,
+    error_rate: float,
+    benchmarks: List[str],
+    rate_limit: bool,
+    output_file: str,
+):
+    if not rate_limit:
+        set_rate_limiter(RateLimiter(initial_rate=1e6, max_rate=1e6, burst=1_000_000))
+    results = {}
+    for device_count in [int(size) for size in sizes.split(",")]:
+        for benchmark_name in benchmarks or BENCHMARKS:
+            # a fresh server per run, so that runs do not see each other's devices
+            with MockSccServer(
+                transaction_latency_seconds=transaction_latency, error_rate=error_rate
+            ) as server:
+                for name, summary in BENCHMARKS[benchmark_name](
+                    server, device_count, max_in_flight
+                ).items():
+                    results[f"{name} x{device_count}"] = summary
+                    click.echo(
+                        f"{name} x{device_count}: "
+                        + ", ".join(f"{key}={value}" for key, value in summary.items())
+                    )
+    if output_file:
+        with open(output_file, mode="w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    onboarding_benchmark()
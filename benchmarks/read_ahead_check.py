@@ -0,0 +1,81 @@
+"""Checks that `keyed_bounded_submit` streams its input: a single key held at its
+limit must not make it read the whole input into memory, as it did when idle
+workers let it read past `max_queued`."""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY_ROOT)
+
+from utils.concurrency import keyed_bounded_submit  # noqa: E402
+
+
+class _CountingIterator:
+    def __init__(self, items):
+        self._items = iter(items)
+        self.read = 0
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = next(self._items)
+        with self._lock:
+            self.read += 1
+        return item
+
+
+def check_saturated_key(
+    items: int, max_in_flight: int, max_in_flight_for_key: int, max_queued: int
+) -> int:
+    """Run `items` items that all share one key and return the most items read
+    ahead of the ones completed."""
+    counting_items = _CountingIterator(("sdc", index) for index in range(items))
+    completed = 0
+    peak_read_ahead = 0
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        for _item, future in keyed_bounded_submit(
+            executor,
+            lambda _item: time.sleep(0.001),
+            counting_items,
+            max_in_flight,
+            get_key=lambda item: item[0],
+            get_max_in_flight_for_key=lambda _key: max_in_flight_for_key,
+            max_queued=max_queued,
+        ):
+            future.result()
+            completed += 1
+            peak_read_ahead = max(peak_read_ahead, counting_items.read - completed)
+    if completed != items:
+        raise AssertionError(f"Only {completed} of {items} items completed")
+    return peak_read_ahead
+
+
+@click.command(help="Check that a saturated key does not read the whole input ahead.")
+@click.option("--items", type=int, default=5000, show_default=True)
+@click.option("--max-in-flight", type=int, default=20, show_default=True)
+@click.option("--max-in-flight-for-key", type=int, default=5, show_default=True)
+@click.option("--max-queued", type=int, default=200, show_default=True)
+def read_ahead_check(
+    items: int, max_in_flight: int, max_in_flight_for_key: int, max_queued: int
+):
+    peak_read_ahead = check_saturated_key(
+        items, max_in_flight, max_in_flight_for_key, max_queued
+    )
+    # one key may have max_in_flight queued (the default per-key limit) behind the
+    # ones it has in flight
+    limit = min(max_queued, max_in_flight) + max_in_flight_for_key
+    click.echo(f"Read at most {peak_read_ahead} of {items} items ahead (limit {limit})")
+    if peak_read_ahead > limit:
+        raise click.ClickException("keyed_bounded_submit read past its limits")
+
+
+if __name__ == "__main__":
+    read_ahead_check()
@@ -0,0 +1,92 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import click
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROBE = os.path.join(REPOSITORY_ROOT, "benchmarks", "first_api_call_probe.py")
+
+HELP_COMMANDS = {
+    "cli.py --help": ["cli.py", "--help"],
+    "cli.py list-devices --help": ["cli.py", "list-devices", "--help"],
+    "cli.py onboard-ftds --help": ["cli.py", "onboard-ftds", "--help"],
+}
+FIRST_API_CALL_ARGS = [
+    "list-devices",
+    "--base-url",
+    "https://www.defenseorchestrator.com",
+    "--cdo-api-token",
+    "startup-benchmark",
+    "--inventory-cache-ttl",
+    "0",
+]
+
+
+def _summarise(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "min_ms": round(samples[0] * 1000, 1),
+        "median_ms": round(statistics.median(samples) * 1000, 1),
+        "p90_ms": round(samples[int(0.9 * (len(samples) - 1))] * 1000, 1),
+    }
+
+
+def time_help(args: List[str], runs: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args],
+            cwd=REPOSITORY_ROOT,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        samples.append(time.perf_counter() - started_at)
+    return _summarise(samples)
+
+
+def time_to_first_api_call(runs: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(runs):
+        started_at = time.time()
+        output = subprocess.run(
+            [sys.executable, PROBE, *FIRST_API_CALL_ARGS],
+            cwd=REPOSITORY_ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        first_api_call_at = float(output.split("first_api_call_at=")[1].split()[0])
+        samples.append(first_api_call_at - started_at)
+    return _summarise(samples)
+
+
+@click.command(
+    help="Measure CLI start-up latency: how long --help takes, and how long it takes to get to the first API call."
+)
+@click.option("--runs", type=click.IntRange(min=1), default=10, show_default=True)
+@click.option(
+    "--output-file",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the results as JSON to this file, e.g. to track them across commits.",
+)
+def startup_benchmark(runs: int, output_file: str):
+    results = {name: time_help(args, runs) for name, args in HELP_COMMANDS.items()}
+    results["time to first API call (list-devices)"] = time_to_first_api_call(runs)
+    for name, summary in results.items():
+        click.echo(
+            f"{name:45} min {summary['min_ms']:8.1f} ms   "
+            f"median {summary['median_ms']:8.1f} ms   p90 {summary['p90_ms']:8.1f} ms"
+        )
+    if output_file:
+        with open(output_file, mode="w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    startup_benchmark()
@@ -1,8 +1,18 @@
+import os
 from typing import Callable
 from cdo_sdk_python import Configuration, ApiClient
 
+from services.scc_api_client import SccApiClient
+from utils.metrics import MetricsExporter
+
+def get_api_host(base_url: str) -> str:
+  """The host the SDK calls for `base_url`, which also keys the local caches."""
+  return f"{base_url}/api/rest"
+
 def execute_using_cdo_api(base_url: str, bearer_token: str, function_to_execute: Callable[[ApiClient], None]):
-  configuration = Configuration(host=f"{base_url}/api/rest")
+  configuration = Configuration(host=get_api_host(base_url))
   configuration.access_token = bearer_token
-  with ApiClient(configuration) as api_client:
+  # SccApiClient routes every call through the shared rate limiter and records its
+  # metrics, which are written to CDO_METRICS_FILE (if set) when we are done
+  with SccApiClient(configuration) as api_client, MetricsExporter(os.environ.get("CDO_METRICS_FILE")):
     function_to_execute(api_client)
\ No newline at end of file
@@ -0,0 +1,89 @@
+import importlib
+from typing import Dict, List, Optional, Tuple
+
+import click
+
+# subcommand name -> ("module:command", short help). The short help is kept here so
+# that `cli.py --help` does not have to import any of the subcommand modules, which
+# pull in cdo_sdk_python, rich, questionary and friends.
+LAZY_SUBCOMMANDS: Dict[str, Tuple[str, str]] = {
+    "list-devices": (
+        "list_devices:list_devices_command",
+        "List every device in the inventory.",
+    ),
+    "sync-devices": (
+        "sync_devices:sync_devices_command",
+        "Report inventory changes since the last sync.",
+    ),
+    "export-devices": (
+        "export_devices:export_devices_command",
+        "Export the inventory to JSONL, CSV or Parquet.",
+    ),
+    "create-ftd": (
+        "create_ftd_device:create_ftd_command",
+        "Create a cdFMC-managed FTD.",
+    ),
+    "register-ftd": (
+        "register_ftd_device:register_ftd_command",
+        "Finish onboarding an FTD that has been created.",
+    ),
+    "onboard-ftds": (
+        "onboard_multiple_ftds:main",
+        "Onboard FTDs in bulk from a CSV file.",
+    ),
+    "onboard-asa": (
+        "onboard_asa_device:onboard_asa_command",
+        "Onboard an ASA.",
+    ),
+    "onboard-asas": (
+        "onboard_multiple_asas:main",
+        "Onboard ASAs in bulk from a CSV file.",
+    ),
+    "create-users": (
+        "create_cdo_users:create_users_command",
+        "Create users in bulk, skipping any that already exist.",
+    ),
+    "fan-out": (
+        "fan_out:fan_out_command",
+        "Run an operation against many tenants at once.",
+    ),
+    "ask-ai-assistant": (
+        "ask_ai_assistant_question:ask_ai_assistant_question_cmd",
+        "Ask the AI Assistant a question.",
+    ),
+    "ask-ai-assistant-batch": (
+        "ask_ai_assistant_questions:ask_ai_assistant_questions_cmd",
+        "Ask the AI Assistant many questions at once.",
+    ),
+}
+
+
+class LazyGroup(click.Group):
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted([*super().list_commands(ctx), *LAZY_SUBCOMMANDS])
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name not in LAZY_SUBCOMMANDS:
+            return super().get_command(ctx, cmd_name)
+        module_name, command_name = LAZY_SUBCOMMANDS[cmd_name][0].split(":")
+        return getattr(importlib.import_module(module_name), command_name)
+
+    def format_commands(
+        self, ctx: click.Context, formatter: click.HelpFormatter
+    ) -> None:
+        rows = [
+            (cmd_name, LAZY_SUBCOMMANDS[cmd_name][1])
+            for cmd_name in self.list_commands(ctx)
+            if cmd_name in LAZY_SUBCOMMANDS
+        ]
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup)
+def cli():
+    """Security Cloud Control (CDO) SDK examples."""
+
+
+if __name__ == "__main__":
+    cli()
@@ -1,13 +1,15 @@
-import os
-from typing import Dict
+from typing import Dict, Iterable, List, Optional
 from functools import partial
-from cdo_sdk_python import Configuration, ApiClient, UsersApi
+import click
+from cdo_sdk_python import ApiClient
 from cdo_sdk_python.models.user_create_or_update_input import UserCreateOrUpdateInput
 
 from cdo_api import execute_using_cdo_api
-
-configuration = Configuration(host="https://www.defenseorchestrator.com/api/rest")
-configuration.access_token = os.environ["BEARER_TOKEN"]
+from models.user_provisioning_result import UserProvisioningResult, SKIPPED, FAILED
+from parsers.user_parser import UserParser
+from services.users_api_service import UsersApiService
+from utils.cli_options import base_url_option, cdo_api_token_option
+from validators.user_file_validator import UserFileValidator
 
 users = {
     "londo.mollari@babylon5.universe": "ROLE_SUPER_ADMIN",
@@ -16,14 +18,54 @@ users = {
     "john.sheridan@babylon5.universe": "ROLE_SUPER_ADMIN",
 }
 
-def create_users(users: Dict[str, str], api_client: ApiClient):
-   api_instance = UsersApi(api_client)
-   for username, role in users.items():
-     user_api_response = api_instance.create_user(
-         user_create_or_update_input=UserCreateOrUpdateInput(
-             name=username, role=role, api_only_user=False
-         )
-     )
-     print(f"User {username} created with role {role}. Response: {user_api_response}")
+def validate_users_file(_ctx: click.Context, _param: click.Parameter, value: str) -> str:
+   if value and not UserFileValidator(value).validate_header():
+     raise click.BadParameter(f"Users file {value} is invalid.")
+   return value
+
+@click.command()
+@base_url_option(prompt=False)
+@cdo_api_token_option(prompt=False)
+@click.option(
+    "--users-file",
+    type=str,
+    callback=validate_users_file,
+    help="CSV (name,role,api_only_user) or .jsonl file with the users to create. Defaults to a few example users.",
+)
+@click.option(
+    "--max-in-flight",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="The maximum number of users to create concurrently.",
+)
+def create_users_command(base_url: str, cdo_api_token: str, users_file: Optional[str], max_in_flight: int):
+   user_parser = UserParser(users_file) if users_file else None
+   users_to_create = user_parser.iter_users_to_provision() if user_parser else (
+       UserCreateOrUpdateInput(name=username, role=role, api_only_user=False) for username, role in users.items()
+   )
+   rejected_rows = user_parser.rejected_rows if user_parser else []
+   execute_using_cdo_api(base_url, cdo_api_token, partial(create_users, users_to_create, max_in_flight, rejected_rows))
+
+def create_users(users: Iterable[UserCreateOrUpdateInput], max_in_flight: int, rejected_rows: List[UserProvisioningResult], api_client: ApiClient):
+   users_api_service = UsersApiService(api_client)
+   existing_usernames = users_api_service.get_existing_usernames()
+   print(f"Found {len(existing_usernames)} existing user(s).")
+   counts: Dict[str, int] = {}
+   for result in users_api_service.provision_users(users, max_in_flight, existing_usernames):
+     counts[result.status] = counts.get(result.status, 0) + 1
+     if result.status == SKIPPED:
+       print(f"User {result.name} already exists, skipping.")
+     elif result.status == FAILED:
+       print(f"User {result.name} not created: {result.error}")
+     else:
+       print(f"User {result.name} created.")
+   for result in rejected_rows:
+     print(f"User {result.name} not created: {result.error}")
+   counts[FAILED] = counts.get(FAILED, 0) + len(rejected_rows)
+   print(", ".join(f"{count} {status}" for status, count in counts.items() if count) or "No users to create.")
+   if counts[FAILED]:
+     raise SystemExit(1)
 
-execute_using_cdo_api("https://www.defenseorchestrator.com", os.environ["BEARER_TOKEN"], partial(create_users, users))
+if __name__ == "__main__":
+   create_users_command()
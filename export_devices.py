@@ -0,0 +1,119 @@
+from functools import partial
+from typing import Optional
+
+import click
+from cdo_sdk_python import ApiClient
+
+from cdo_api import execute_using_cdo_api
+from services.device_projection import normalise_device_fields
+from services.inventory_api_service import InventoryApiService
+from services.inventory_export_service import (
+    InventoryExportService,
+    EXPORT_FORMATS,
+    DEFAULT_EXPORT_FIELDS,
+    get_export_format,
+)
+from utils.cli_options import (
+    base_url_option,
+    cdo_api_token_option,
+    parallel_workers_option,
+)
+
+
+@click.command(
+    help="Export the inventory to a JSONL, CSV or Parquet file, page by page as the devices are fetched. CSV and Parquet columns are strings, with values written as in JSON (e.g. true, 42)."
+)
+@base_url_option(prompt=False)
+@cdo_api_token_option(prompt=False)
+@click.option(
+    "--output-file",
+    type=str,
+    required=True,
+    help="Where to write the devices; - for stdout (gzipped with --compress). A .gz suffix compresses JSONL and CSV output.",
+)
+@click.option(
+    "--format",
+    "export_format",
+    type=click.Choice(EXPORT_FORMATS),
+    help="Defaults to the extension of --output-file. Parquet needs the optional pyarrow package (pip install pyarrow).",
+)
+@click.option(
+    "--fields",
+    type=str,
+    help=f"Comma-separated device fields to export, by their API (connectivityState) or SDK (connectivity_state) names; the columns use the API names. Defaults to all fields for JSONL and to {','.join(DEFAULT_EXPORT_FIELDS)} otherwise.",
+)
+@click.option(
+    "--compress",
+    is_flag=True,
+    help="gzip JSONL/CSV output, or use gzip instead of snappy for Parquet. Implied by a .gz suffix.",
+)
+@click.option("--q", type=str, help="Only export devices matching this query.")
+@parallel_workers_option()
+def export_devices_command(
+    base_url: str,
+    cdo_api_token: str,
+    output_file: str,
+    export_format: Optional[str],
+    fields: Optional[str],
+    compress: bool,
+    q: Optional[str],
+    parallel_workers: int,
+):
+    export_format = export_format or get_export_format(output_file)
+    if export_format is None:
+        raise click.BadParameter(
+            "Cannot tell the format from the file name; pass --format.",
+            param_hint="--format",
+        )
+    if fields:
+        try:
+            # the exported columns are named after the API fields, whichever names
+            # were given
+            fields = normalise_device_fields(fields.split(","))
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--fields")
+    else:
+        fields = None
+    try:
+        inventory_export_service = InventoryExportService(
+            output_file,
+            export_format,
+            fields=fields,
+            compress=compress or output_file.endswith(".gz"),
+        )
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--output-file")
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    execute_using_cdo_api(
+        base_url,
+        cdo_api_token,
+        partial(export_devices, inventory_export_service, q, parallel_workers),
+    )
+
+
+def export_devices(
+    inventory_export_service: InventoryExportService,
+    q: Optional[str],
+    parallel_workers: int,
+    api_client: ApiClient,
+):
+    inventory_api_service = InventoryApiService(api_client)
+    if inventory_export_service.fields is None:
+        devices = inventory_api_service.iter_devices(
+            q=q, parallel_workers=parallel_workers
+        )
+    else:
+        # only the exported fields are decoded, not the full device models
+        devices = inventory_api_service.iter_device_records(
+            inventory_export_service.fields, q=q, parallel_workers=parallel_workers
+        )
+    device_count = inventory_export_service.export(devices)
+    click.echo(
+        f"Exported {device_count} device(s) to {inventory_export_service.output_file}.",
+        err=True,
+    )
+
+
+if __name__ == "__main__":
+    export_devices_command()
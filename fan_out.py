@@ -0,0 +1,126 @@
+import json
+import sys
+from functools import partial
+from typing import Any, Dict, Iterator, Optional
+
+import click
+from cdo_sdk_python import ApiClient
+
+from models.tenant import Tenant
+from parsers.tenant_manifest_parser import TenantManifestParser
+from parsers.user_parser import UserParser
+from services.inventory_api_service import InventoryApiService
+from services.tenant_fan_out_service import TenantFanOutService
+from services.users_api_service import UsersApiService
+from validators.user_file_validator import UserFileValidator
+
+
+def list_devices(
+    q: Optional[str], _tenant: Tenant, api_client: ApiClient
+) -> Iterator[Dict[str, Any]]:
+    for device in InventoryApiService(api_client).iter_devices(q=q):
+        yield {"device": device.to_dict()}
+
+
+def create_users(
+    users_file: str, max_in_flight: int, _tenant: Tenant, api_client: ApiClient
+) -> Iterator[Dict[str, Any]]:
+    user_parser = UserParser(users_file)
+    for result in UsersApiService(api_client).provision_users(
+        user_parser.iter_users_to_provision(), max_in_flight
+    ):
+        yield {"user": result.name, "status": result.status, "error": result.error}
+    for result in user_parser.rejected_rows:
+        yield {"user": result.name, "status": result.status, "error": result.error}
+
+
+@click.command(
+    help="Run the same operation against every tenant in a manifest, concurrently, and write the merged results as JSON lines."
+)
+@click.option(
+    "--manifest",
+    type=click.Path(exists=True, dir_okay=False),
+    required=True,
+    help="JSON or YAML file listing the tenants (name, region, and api_token or api_token_env). See tenants.yaml.sample.",
+)
+@click.option(
+    "--operation",
+    type=click.Choice(["list-devices", "create-users"]),
+    required=True,
+    help="list-devices: every device (matching --q) in every tenant. create-users: create the users in --users-file in every tenant, skipping existing ones.",
+)
+@click.option("--q", type=str, help="Only list devices matching this inventory query.")
+@click.option(
+    "--users-file",
+    type=str,
+    help="CSV or .jsonl file with the users to create (for create-users).",
+)
+@click.option(
+    "--max-tenants",
+    type=click.IntRange(min=1),
+    default=16,
+    show_default=True,
+    help="The maximum number of tenants to work on at once.",
+)
+@click.option(
+    "--max-tenants-per-region",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="The maximum number of tenants in the same region to work on at once.",
+)
+@click.option(
+    "--max-in-flight",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="The maximum number of concurrent requests per tenant (for create-users).",
+)
+@click.option(
+    "--output-file",
+    type=click.File(mode="w"),
+    default="-",
+    help="Where to write the JSON lines. Defaults to stdout.",
+)
+def fan_out_command(
+    manifest: str,
+    operation: str,
+    q: Optional[str],
+    users_file: Optional[str],
+    max_tenants: int,
+    max_tenants_per_region: int,
+    max_in_flight: int,
+    output_file,
+):
+    if operation == "create-users":
+        if not users_file or not UserFileValidator(users_file).validate_header():
+            raise click.BadParameter(
+                "create-users needs a valid --users-file.", param_hint="--users-file"
+            )
+        tenant_operation = partial(create_users, users_file, max_in_flight)
+    else:
+        tenant_operation = partial(list_devices, q)
+
+    try:
+        tenants = TenantManifestParser(manifest).get_tenants()
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--manifest")
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    # a tenant has failed if the operation failed, or if any of its records did
+    failed_tenants = set()
+    fan_out_service = TenantFanOutService(max_tenants, max_tenants_per_region)
+    for record in fan_out_service.run(tenants, tenant_operation):
+        if record.get("error"):
+            failed_tenants.add(record["tenant"])
+        output_file.write(json.dumps(record, default=str) + "\n")
+    click.echo(
+        f"Ran {operation} against {len(tenants)} tenant(s); {len(failed_tenants)} had errors.",
+        err=True,
+    )
+    if failed_tenants:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    fan_out_command()
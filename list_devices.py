@@ -1,12 +1,59 @@
-import os
-from cdo_sdk_python import ApiClient, InventoryApi, DevicePage
+from functools import partial
+from typing import List, Optional
 
-from cdo_api import execute_using_cdo_api
+import click
+from cdo_sdk_python import ApiClient
 
-def list_devices(api_client: ApiClient):
-  api_instance = InventoryApi(api_client)
-  api_response: DevicePage = api_instance.get_devices()
-  print(f"Number of devices: {api_response.count}")
-  print(f"Devices: {api_response.items}")
+from cdo_api import execute_using_cdo_api, get_api_host
+from services.device_projection import normalise_device_fields
+from services.inventory_api_service import InventoryApiService
+from services.inventory_cache_service import InventoryCacheService, DEFAULT_TTL_SECONDS
+from utils.cache_dir import get_tenant_key
+from utils.cli_options import base_url_option, cdo_api_token_option, parallel_workers_option
 
-execute_using_cdo_api("https://www.defenseorchestrator.com", os.environ["BEARER_TOKEN"], list_devices)
\ No newline at end of file
+@click.command()
+@base_url_option(prompt=False)
+@cdo_api_token_option(prompt=False)
+@click.option(
+  "--inventory-cache-ttl",
+  type=float,
+  default=DEFAULT_TTL_SECONDS,
+  show_default=True,
+  envvar="INVENTORY_CACHE_TTL_SECONDS",
+  help="How long, in seconds, a cached inventory snapshot is used before the devices are fetched again.",
+)
+@click.option(
+  "--fields",
+  type=str,
+  help="Comma-separated device fields to list (e.g. uid,name,connectivityState). Only these fields are decoded, which is much faster on large inventories.",
+)
+@parallel_workers_option()
+def list_devices_command(base_url: str, cdo_api_token: str, inventory_cache_ttl: float, fields: Optional[str], parallel_workers: int):
+  if fields:
+    try:
+      fields = normalise_device_fields(fields.split(","))
+    except ValueError as e:
+      raise click.BadParameter(str(e), param_hint="--fields")
+  else:
+    fields = None
+  with InventoryCacheService(
+    tenant=get_tenant_key(cdo_api_token),
+    region=get_api_host(base_url),
+    ttl_seconds=inventory_cache_ttl,
+  ) as inventory_cache:
+    execute_using_cdo_api(base_url, cdo_api_token, partial(list_devices, inventory_cache, fields, parallel_workers))
+
+def list_devices(inventory_cache: InventoryCacheService, fields: Optional[List[str]], parallel_workers: int, api_client: ApiClient):
+  inventory_api_service = InventoryApiService(api_client, inventory_cache)
+  if fields is None:
+    devices = inventory_api_service.iter_devices(parallel_workers=parallel_workers)
+  else:
+    devices = inventory_api_service.iter_device_records(fields, parallel_workers=parallel_workers)
+  device_count = 0
+  for device in devices:
+    device_count += 1
+    print(f"Device: {device}")
+  print(f"Number of devices: {device_count}")
+
+if __name__ == "__main__":
+  list_devices_command()
@@ -0,0 +1,14 @@
+from typing import Optional
+
+
+class AiAnswer:
+    def __init__(
+        self, question: str, answer: Optional[str] = None, error: Optional[str] = None
+    ):
+        self.question = question
+        self.answer = answer
+        self.error = error
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
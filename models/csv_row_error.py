@@ -0,0 +1,21 @@
+from typing import Optional
+
+
+class CsvRowError:
+    def __init__(
+        self,
+        line_number: int,
+        name: Optional[str],
+        message: str,
+        is_inventory_conflict: bool = False,
+    ):
+        self.line_number = line_number
+        self.name = name
+        self.message = message
+        # the row is fine in itself, but its device is already in the inventory
+        self.is_inventory_conflict = is_inventory_conflict
+
+    def __str__(self) -> str:
+        if self.name:
+            return f"Line {self.line_number} ({self.name}): {self.message}"
+        return f"Line {self.line_number}: {self.message}"
@@ -0,0 +1,6 @@
+class FtdSshTarget:
+    def __init__(self, address: str, username: str, password: str, port: int = 22):
+        self.address = address
+        self.username = username
+        self.password = password
+        self.port = port
@@ -0,0 +1,27 @@
+from typing import Any, Dict, Optional
+
+from cdo_sdk_python import Device
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+
+class InventoryChange:
+    def __init__(self, change: str, device_uid: str, device: Optional[Device] = None):
+        self.change = change
+        self.device_uid = device_uid
+        # for removed devices, this is the last version we knew about
+        self.device = device
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "change": self.change,
+            "uid": self.device_uid,
+            "name": self.device.name if self.device else None,
+            "device": (
+                self.device.model_dump(mode="json", by_alias=True, exclude_none=True)
+                if self.device
+                else None
+            ),
+        }
@@ -0,0 +1,17 @@
+from typing import Optional
+
+
+class OnboardingJournalEntry:
+    def __init__(
+        self,
+        name: str,
+        state: Optional[str] = None,
+        transaction_uid: Optional[str] = None,
+        device_uid: Optional[str] = None,
+        error: Optional[str] = None,
+    ):
+        self.name = name
+        self.state = state
+        self.transaction_uid = transaction_uid
+        self.device_uid = device_uid
+        self.error = error
@@ -0,0 +1,22 @@
+from typing import Optional
+
+from cdo_sdk_python import Device
+
+
+class OnboardingResult:
+    def __init__(
+        self,
+        name: str,
+        device: Optional[Device] = None,
+        error: Optional[str] = None,
+        skipped: bool = False,
+    ):
+        self.name = name
+        self.device = device
+        self.error = error
+        # already onboarded by the run being resumed
+        self.skipped = skipped
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
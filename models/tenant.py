@@ -0,0 +1,5 @@
+class Tenant:
+    def __init__(self, name: str, region: str, api_token: str):
+        self.name = name
+        self.region = region
+        self.api_token = api_token
@@ -0,0 +1,16 @@
+from typing import Optional
+
+CREATED = "created"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+class UserProvisioningResult:
+    def __init__(self, name: str, status: str, error: Optional[str] = None):
+        self.name = name
+        self.status = status
+        self.error = error
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status != FAILED
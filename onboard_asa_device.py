@@ -1,5 +1,4 @@
 from functools import partial
-import os
 import sys
 import time
 import click
@@ -12,33 +11,12 @@ from cdo_sdk_python import (
 
 from cdo_api import execute_using_cdo_api
 from transactions_api import wait_for_transaction_to_finish
+from utils.cli_options import base_url_option, cdo_api_token_option
 
 
 @click.command()
-@click.option(
-    "--base-url",
-    help="Enter the CDO Base URL",
-    prompt=True,
-    type=click.Choice(
-        [
-            "https://www.defenseorchestrator.com",
-            "https://apj.cdo.cisco.com",
-            "https://www.defenseorchestator.eu",
-            "https://au.cdo.cisco.com",
-            "https://in.cdo.cisco.com",
-        ],
-        case_sensitive=True,
-    ),
-    default="https://www.defenseorchestrator.com",
-)
-@click.option(
-    "--cdo-api-token",
-    help="Enter the CDO API token",
-    prompt=True,
-    hide_input=True,
-    default=lambda: os.environ.get("CDO_API_TOKEN"),
-    show_default="CDO_API_TOKEN environment variable",
-)
+@base_url_option()
+@cdo_api_token_option()
 @click.option("--device-name", help="Enter the ASA device name", prompt=True)
 @click.option(
     "--device-address", help="Enter the ASA's management interface address", prompt=True
@@ -94,7 +72,13 @@ def onboard_asa_device(
         )
     )
 
-    wait_for_transaction_to_finish(cdo_transaction, api_client)
+    wait_for_transaction_to_finish(
+        cdo_transaction,
+        api_client,
+        f"ASA {device_name} onboarded",
+        f"Failed to onboard ASA {device_name}",
+    )
+
 
 if __name__ == "__main__":
     onboard_asa_command()
@@ -0,0 +1,128 @@
+from typing import List, Optional
+
+import click
+from cdo_sdk_python import ApiClient, ConnectorsApi, SdcPage
+from rich.console import Console
+
+from models.onboarding_result import OnboardingResult
+from parsers.asa_parser import AsaParser
+from services.inventory_api_service import InventoryApiService
+from services.inventory_cache_service import InventoryCacheService
+from services.scc_credentials_service import SccCredentialsService
+from utils.cache_dir import get_tenant_key
+from utils.cli_options import metrics_file_option, metrics_interval_option
+from utils.metrics import MetricsExporter
+from utils.onboarding_summary import print_onboarding_summary
+from utils.region_mapping import supported_regions
+from validators.asa_csv_validator import AsaCsvValidator
+
+
+def validate_asa_csv_file(
+    _ctx: click.Context, _param: click.Parameter, value: str
+) -> str:
+    # rows are validated as they are streamed to the onboarding workers, so only
+    # the header is checked up front
+    if not AsaCsvValidator(value).validate_header():
+        raise click.BadParameter(f"CSV file {value} is invalid.")
+    return value
+
+
+@click.command(
+    help="Onboard ASAs in bulk from a CSV file, several at a time, limiting how many onboard through each connector at once."
+)
+@click.option(
+    "--asa-csv-file",
+    type=str,
+    required=True,
+    callback=validate_asa_csv_file,
+    help="Path to the CSV file with the ASAs to onboard: name, address, username, password, connector_type (SDC or CDG), and optionally connector_name and ignore_certificate. See asa.csv.sample.",
+)
+@click.option(
+    "--max-in-flight",
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True,
+    help="The maximum number of ASAs to onboard concurrently.",
+)
+@click.option(
+    "--max-in-flight-per-sdc",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="The maximum number of ASAs to onboard concurrently through any one SDC.",
+)
+@click.option(
+    "--max-in-flight-cdg",
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True,
+    help="The maximum number of ASAs to onboard concurrently through the CDG.",
+)
+@click.option(
+    "--default-sdc",
+    type=str,
+    help="The name of the tenant's default SDC, which ASAs without a connector_name onboard through. Looked up automatically if the tenant has a single SDC.",
+)
+@click.option(
+    "--region",
+    help="The region for the API.",
+    type=click.Choice(supported_regions),
+    required=True,
+)
+@click.option("--api-token", type=str, help="The API token.", required=True)
+@metrics_file_option()
+@metrics_interval_option()
+def main(
+    asa_csv_file: str,
+    max_in_flight: int,
+    max_in_flight_per_sdc: int,
+    max_in_flight_cdg: int,
+    default_sdc: Optional[str],
+    region: str,
+    api_token: str,
+    metrics_file: Optional[str],
+    metrics_interval: Optional[float],
+) -> None:
+    console = Console()
+    asa_parser = AsaParser(asa_csv_file)
+    credentials_service = SccCredentialsService(region=region, api_token=api_token)
+    with credentials_service.get_api_client(
+        max_connections=max_in_flight
+    ) as api_client, MetricsExporter(
+        metrics_file, interval_seconds=metrics_interval
+    ), InventoryCacheService(
+        tenant=get_tenant_key(api_token), region=credentials_service.base_url
+    ) as inventory_cache:
+        inventory_api_service = InventoryApiService(
+            api_client=api_client, inventory_cache=inventory_cache
+        )
+        default_sdc = default_sdc or get_only_sdc_name(api_client)
+        if default_sdc is None:
+            console.print(
+                "[orange]The tenant has several SDCs; ASAs without a connector_name are limited separately from the SDC they use. Pass --default-sdc to count them against it.[/orange]"
+            )
+        console.print(
+            f"[orange]Onboarding ASA(s) from {asa_csv_file}, {max_in_flight} at a time "
+            f"(at most {max_in_flight_per_sdc} per SDC and {max_in_flight_cdg} through the CDG)...[/orange]"
+        )
+        results: List[OnboardingResult] = inventory_api_service.onboard_asa_devices(
+            asa_parser.iter_asas_to_onboard(),
+            max_in_flight=max_in_flight,
+            max_in_flight_per_sdc=max_in_flight_per_sdc,
+            max_in_flight_cdg=max_in_flight_cdg,
+            default_sdc_name=default_sdc,
+        )
+    print_onboarding_summary(console, results, asa_parser.rejected_rows, "ASA")
+
+
+def get_only_sdc_name(api_client: ApiClient) -> Optional[str]:
+    """The name of the tenant's SDC if it has exactly one, which is then its default
+    SDC; the API does not say which SDC is the default otherwise."""
+    sdc_page: SdcPage = ConnectorsApi(api_client).get_sdcs(limit="2")
+    if len(sdc_page.items) == 1:
+        return sdc_page.items[0].name
+    return None
+
+
+if __name__ == "__main__":
+    main()
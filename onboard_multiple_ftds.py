@@ -1,20 +1,35 @@
+import os
 import re
-from typing import List
+from contextlib import nullcontext
+from typing import List, Optional, Union
 
 import click
 from rich.console import Console
-from cdo_sdk_python import ApiClient, Configuration, FtdCreateOrUpdateInput
-from click_option_group import MutuallyExclusiveOptionGroup, AllOptionGroup, optgroup
+from click_option_group import (
+    MutuallyExclusiveOptionGroup,
+    AllOptionGroup,
+    RequiredMutuallyExclusiveOptionGroup,
+    optgroup,
+)
 
+from models.onboarding_result import OnboardingResult
 from parsers.ftd_parser import FtdParser
+from parsers.ftd_ztp_parser import FtdZtpParser
 from services.cdfmc_api_service import CdFmcApiService
+from services.cdfmc_domain_cache_service import CdFmcDomainCacheService
+from services.ftd_ssh_service import FtdSshService
 from services.inventory_api_service import InventoryApiService
+from services.inventory_cache_service import InventoryCacheService
+from services.onboarding_journal import OnboardingJournal
 from services.scc_credentials_service import SccCredentialsService
+from utils.cache_dir import get_tenant_key
+from utils.cli_options import metrics_file_option, metrics_interval_option
+from utils.metrics import MetricsExporter
+from utils.onboarding_summary import print_onboarding_summary
 from utils.region_mapping import supported_regions
 from validators.ftd_csv_validator import FtdCsvValidator
 from validators.ftd_ztp_csv_validator import FtdZtpCsvValidator
 
-
 UUID_REGEX = re.compile(
     r"^[a-fA-F0-9]{8}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{12}$"
 )
@@ -27,11 +42,15 @@ def validate_uuid(ctx: click.Context, param: click.Parameter, value: str) -> str
 
 
 def validate_ftd_csv_file(
-    _ctx: click.Context, _param: click.Parameter, value: str
+    ctx: click.Context, _param: click.Parameter, value: str
 ) -> str:
     if value:
-        validator = FtdCsvValidator(value)
-        if not validator.validate():
+        # rows are validated as they are streamed to the onboarding workers, so only
+        # the header is checked up front
+        validator = FtdCsvValidator(
+            value, requires_ssh_credentials=ctx.params.get("headless", False)
+        )
+        if not validator.validate_header():
             raise click.BadParameter(f"CSV file {value} is invalid.")
     return value
 
@@ -41,7 +60,7 @@ def validate_ztp_ftd_csv_file(
 ) -> str:
     if value:
         validator = FtdZtpCsvValidator(value)
-        if not validator.validate():
+        if not validator.validate_header():
             raise click.BadParameter(f"CSV file {value} is invalid.")
     return value
 
@@ -55,13 +74,51 @@ def validate_ztp_ftd_csv_file(
     callback=validate_uuid,
     help="The ID of the access policy to apply to this device when onboarded.",
 )
-@click.option(
+@optgroup.group(
+    "FTD CSV file",
+    cls=RequiredMutuallyExclusiveOptionGroup,
+    help="The CSV file with the FTDs to onboard.",
+)
+@optgroup.option(
     "--ftd-csv-file",
-    required=True,
     type=str,
     callback=validate_ftd_csv_file,
     help="Path to the CSV file with FTD information. The CSV file should contain the FTD address, username, password, licenses, and performance tier if the FTD is virtual.",
 )
+@optgroup.option(
+    "--ztp-ftd-csv-file",
+    type=str,
+    callback=validate_ztp_ftd_csv_file,
+    help="Path to the CSV file with FTDs to onboard using Zero-Touch Provisioning. The CSV file should contain the FTD name, serial number, licenses, and admin password.",
+)
+@click.option(
+    "--headless",
+    is_flag=True,
+    is_eager=True,
+    help="Paste the CLI keys into the FTDs over SSH instead of asking you to do it. The FTD CSV file must then contain the address, username and password (and optionally ssh_port) of each FTD.",
+)
+@click.option(
+    "--max-in-flight",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="The maximum number of ZTP or headless onboardings to run concurrently.",
+)
+@click.option(
+    "--journal-file",
+    type=str,
+    help="Where to record the progress of each FTD, so that an interrupted run can be resumed. Without this option or --resume, no journal is kept. With --resume alone, defaults to the CSV file name with a .journal.jsonl suffix.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Continue the run recorded in the journal file: FTDs that were onboarded are skipped and transactions that were still running are waited on instead of being started again.",
+)
+@click.option(
+    "--pre-validate",
+    is_flag=True,
+    help="Check every row of the CSV file, including for names (and ZTP serial numbers) repeated in the file or already in the inventory, and report all the errors before onboarding anything.",
+)
 @click.option(
     "--region",
     help="The region for the API.",
@@ -69,31 +126,184 @@ def validate_ztp_ftd_csv_file(
     required=True,
 )
 @click.option("--api-token", type=str, help="The API token.", required=True)
+@click.option(
+    "--refresh-cdfmc-cache",
+    is_flag=True,
+    help="Discard the cached cdFMC domain for this tenant and look it up again.",
+)
+@metrics_file_option()
+@metrics_interval_option()
 def main(
-    ftd_csv_file: str, region: str, api_token: str, fmc_access_policy_id: str
+    ftd_csv_file: str,
+    ztp_ftd_csv_file: str,
+    headless: bool,
+    max_in_flight: int,
+    journal_file: str,
+    resume: bool,
+    pre_validate: bool,
+    region: str,
+    api_token: str,
+    fmc_access_policy_id: str,
+    refresh_cdfmc_cache: bool,
+    metrics_file: Optional[str],
+    metrics_interval: Optional[float],
 ) -> None:
     console = Console()
-    api_token, base_url = SccCredentialsService(
-        region=region, api_token=api_token
-    ).get_credentials()
-    with ApiClient(Configuration(host=base_url, access_token=api_token)) as api_client:
+    if headless and ztp_ftd_csv_file:
+        raise click.UsageError(
+            "--headless only applies to --ftd-csv-file; ZTP onboarding needs no CLI keys."
+        )
+    if journal_file or resume:
+        journal_file = (
+            journal_file or f"{ftd_csv_file or ztp_ftd_csv_file}.journal.jsonl"
+        )
+        if os.path.exists(journal_file) and not resume:
+            raise click.UsageError(
+                f"Journal file {journal_file} already exists. Pass --resume to continue that run, or delete it to start again."
+            )
+    credentials_service = SccCredentialsService(region=region, api_token=api_token)
+    with credentials_service.get_api_client(
+        max_connections=max_in_flight
+    ) as api_client, (
+        OnboardingJournal(journal_file, resume=resume)
+        if journal_file
+        else nullcontext()
+    ) as journal, MetricsExporter(
+        metrics_file, interval_seconds=metrics_interval
+    ), InventoryCacheService(
+        tenant=get_tenant_key(api_token), region=credentials_service.base_url
+    ) as inventory_cache:
+        if resume:
+            console.print(
+                f"[orange]Resuming from {journal_file}: {journal.count_finished()} FTD(s) were already onboarded.[/orange]"
+            )
         if fmc_access_policy_id is None:
-            cdfmc_api_service = CdFmcApiService(api_client)
+            cdfmc_domain_cache = CdFmcDomainCacheService(
+                tenant=get_tenant_key(api_token), region=credentials_service.base_url
+            )
+            if refresh_cdfmc_cache:
+                cdfmc_domain_cache.invalidate()
+            cdfmc_api_service = CdFmcApiService(api_client, cdfmc_domain_cache)
             fmc_access_policy = cdfmc_api_service.get_first_access_policy_uid()
             fmc_access_policy_id = fmc_access_policy.id
             console.print(
                 f'[orange]Using FMC Access Policy "{fmc_access_policy.name}" (UID: {fmc_access_policy_id})...[/orange]'
             )
 
+        inventory_api_service = InventoryApiService(
+            api_client=api_client, inventory_cache=inventory_cache
+        )
+        if pre_validate:
+            pre_validate_csv_file(
+                console,
+                inventory_api_service,
+                (
+                    FtdZtpCsvValidator(ztp_ftd_csv_file)
+                    if ztp_ftd_csv_file
+                    else FtdCsvValidator(
+                        ftd_csv_file, requires_ssh_credentials=headless
+                    )
+                ),
+                journal,
+            )
+        if ztp_ftd_csv_file:
+            onboard_ztp_ftds(
+                console,
+                inventory_api_service,
+                FtdZtpParser(
+                    fmc_access_policy_uid=fmc_access_policy_id,
+                    ftd_ztp_csv_file=ztp_ftd_csv_file,
+                ),
+                max_in_flight,
+                journal,
+            )
+            return
+
         ftd_parser = FtdParser(
-            fmc_access_policy_uid=fmc_access_policy_id, ftd_csv_file=ftd_csv_file
+            fmc_access_policy_uid=fmc_access_policy_id,
+            ftd_csv_file=ftd_csv_file,
+            requires_ssh_credentials=headless,
+        )
+        if headless:
+            onboard_ftds_headless(
+                console, inventory_api_service, ftd_parser, max_in_flight, journal
+            )
+            return
+
+        console.print(f"[orange]Onboarding FTD(s) from {ftd_csv_file}...[/orange]")
+        results: List[OnboardingResult] = inventory_api_service.onboard_ftd_devices(
+            ftd_parser.iter_ftds_to_onboard(), journal
         )
-        ftd_inputs: List[FtdCreateOrUpdateInput] = ftd_parser.get_ftds_to_onboard()
-        console.print(f"[orange]Onboarding {len(ftd_inputs)} FTD(s)...[/orange]")
+        print_onboarding_summary(console, results, ftd_parser.rejected_rows, "FTD")
+
 
-        inventory_api_service = InventoryApiService(api_client=api_client)
-        for ftd_input in ftd_inputs:
-            inventory_api_service.onboard_ftd_device(ftd_input)
+def pre_validate_csv_file(
+    console: Console,
+    inventory_api_service: InventoryApiService,
+    validator: Union[FtdCsvValidator, FtdZtpCsvValidator],
+    journal: Optional[OnboardingJournal],
+) -> None:
+    errors = [
+        error
+        for error in validator.validate_file(
+            inventory_api_service.get_inventory_index()
+        )
+        # the FTDs in the journal were onboarded (or started) by the run being
+        # resumed, so they are expected to be in the inventory already; their rows
+        # must still be valid
+        if not (
+            error.is_inventory_conflict
+            and journal is not None
+            and journal.get(error.name) is not None
+        )
+    ]
+    for error in errors:
+        console.print(f"[red]{error}[/red]")
+    if errors:
+        console.print(
+            f"[red]Found {len(errors)} error(s) in {validator.csv_file}; nothing was onboarded.[/red]"
+        )
+        raise SystemExit(1)
+    console.print(f"[green]{validator.csv_file} is valid.[/green]")
+
+
+def onboard_ztp_ftds(
+    console: Console,
+    inventory_api_service: InventoryApiService,
+    ftd_ztp_parser: FtdZtpParser,
+    max_in_flight: int,
+    journal: Optional[OnboardingJournal],
+) -> None:
+    console.print(
+        f"[orange]Onboarding FTD(s) from {ftd_ztp_parser.ftd_ztp_csv_file} using ZTP, {max_in_flight} at a time...[/orange]"
+    )
+    results: List[OnboardingResult] = inventory_api_service.onboard_ftd_ztp_devices(
+        ftd_ztp_parser.iter_ztp_ftds_to_onboard(),
+        max_in_flight=max_in_flight,
+        journal=journal,
+    )
+    print_onboarding_summary(console, results, ftd_ztp_parser.rejected_rows, "FTD")
+
+
+def onboard_ftds_headless(
+    console: Console,
+    inventory_api_service: InventoryApiService,
+    ftd_parser: FtdParser,
+    max_in_flight: int,
+    journal: Optional[OnboardingJournal],
+) -> None:
+    console.print(
+        f"[orange]Onboarding FTD(s) from {ftd_parser.ftd_csv_file} over SSH, {max_in_flight} at a time...[/orange]"
+    )
+    results: List[OnboardingResult] = (
+        inventory_api_service.onboard_ftd_devices_headless(
+            ftd_parser.iter_ftds_with_ssh_targets(),
+            FtdSshService(),
+            max_in_flight=max_in_flight,
+            journal=journal,
+        )
+    )
+    print_onboarding_summary(console, results, ftd_parser.rejected_rows, "FTD")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,54 @@
+import csv
+from typing import Iterator, List
+
+from cdo_sdk_python import AsaCreateOrUpdateInput
+
+from models.onboarding_result import OnboardingResult
+from validators.asa_csv_validator import AsaCsvValidator
+
+
+class AsaParser:
+    def __init__(self, asa_csv_file: str):
+        self.asa_csv_file = asa_csv_file
+        self.validator = AsaCsvValidator(asa_csv_file)
+        self.rejected_rows: List[OnboardingResult] = []
+
+    def iter_asas_to_onboard(self) -> Iterator[AsaCreateOrUpdateInput]:
+        """Validate and convert the CSV one row at a time. Invalid rows are recorded in
+        `rejected_rows` instead of stopping the rest of the file from being onboarded.
+        """
+        with open(self.asa_csv_file, mode="r") as file:
+            reader = csv.DictReader(file)
+            check_row = self.validator.row_checker()
+            for row in reader:
+                errors = check_row(row, reader.line_num)
+                if errors:
+                    self._reject(
+                        row, reader.line_num, [error.message for error in errors]
+                    )
+                    continue
+                try:
+                    asa_input = AsaCreateOrUpdateInput(
+                        name=row["name"],
+                        device_address=row["address"],
+                        username=row["username"],
+                        password=row["password"],
+                        connector_type=row["connector_type"],
+                        connector_name=row.get("connector_name") or None,
+                        ignore_certificate=(row.get("ignore_certificate") or "").lower()
+                        == "true",
+                    )
+                except (AttributeError, KeyError, ValueError) as e:
+                    # anything the validator let through but the SDK rejects
+                    self._reject(row, reader.line_num, [str(e)])
+                    continue
+                yield asa_input
+
+    def _reject(self, row: dict, line_number: int, reasons: List[str]) -> None:
+        self.rejected_rows.append(
+            OnboardingResult(
+                name=row.get("name") or f"line {line_number}",
+                error=f"Invalid row on line {line_number} of {self.asa_csv_file}: "
+                + "; ".join(reasons),
+            )
+        )
@@ -1,36 +1,82 @@
 import csv
-from typing import List
+from typing import Iterator, List, Tuple
 
-import questionary
 from cdo_sdk_python import FtdCreateOrUpdateInput
 
+from models.ftd_ssh_target import FtdSshTarget
+from models.onboarding_result import OnboardingResult
+from validators.ftd_csv_validator import FtdCsvValidator
+
 
 class FtdParser:
-    def __init__(self, fmc_access_policy_uid: str, ftd_csv_file: str):
+    def __init__(
+        self,
+        fmc_access_policy_uid: str,
+        ftd_csv_file: str,
+        requires_ssh_credentials: bool = False,
+    ):
         self.fmc_access_policy_uid = fmc_access_policy_uid
         self.ftd_csv_file = ftd_csv_file
+        self.validator = FtdCsvValidator(ftd_csv_file, requires_ssh_credentials)
+        self.rejected_rows: List[OnboardingResult] = []
 
     def get_ftds_to_onboard(
         self,
     ) -> List[FtdCreateOrUpdateInput]:
-        return self._parse_csv()
+        return list(self.iter_ftds_to_onboard())
+
+    def iter_ftds_to_onboard(self) -> Iterator[FtdCreateOrUpdateInput]:
+        for ftd_input, _ in self.iter_ftds_with_ssh_targets():
+            yield ftd_input
 
-    def _parse_csv(self) -> List[FtdCreateOrUpdateInput]:
-        ftd_credentials = []
+    def iter_ftds_with_ssh_targets(
+        self,
+    ) -> Iterator[Tuple[FtdCreateOrUpdateInput, FtdSshTarget]]:
+        """Validate and convert the CSV one row at a time. Invalid rows are recorded in
+        `rejected_rows` instead of stopping the rest of the file from being onboarded.
+        The SSH target is None for rows without an address.
+        """
         with open(self.ftd_csv_file, mode="r") as file:
             reader = csv.DictReader(file)
+            check_row = self.validator.row_checker()
             for row in reader:
-                licenses = row["licenses"].split(";")
-                virtual = row["virtual"].lower() == "true"
-                performance_tier = row.get("performance_tier")
-                ftd_credentials.append(
-                    FtdCreateOrUpdateInput(
+                errors = check_row(row, reader.line_num)
+                if errors:
+                    self._reject(
+                        row, reader.line_num, [error.message for error in errors]
+                    )
+                    continue
+                try:
+                    ftd_input = FtdCreateOrUpdateInput(
                         name=row["name"],
-                        licenses=licenses,
-                        virtual=virtual,
-                        performance_tier=performance_tier,
+                        licenses=row["licenses"].split(";"),
+                        virtual=row["virtual"].lower() == "true",
+                        # physical FTDs have no performance tier
+                        performance_tier=row.get("performance_tier") or None,
                         fmc_access_policy_uid=self.fmc_access_policy_uid,
                         device_type="CDFMC_MANAGED_FTD",
-                    ),
-                )
-        return ftd_credentials
+                    )
+                    ssh_target = (
+                        FtdSshTarget(
+                            address=row["address"],
+                            username=row["username"],
+                            password=row["password"],
+                            port=int(row.get("ssh_port") or 22),
+                        )
+                        if row.get("address")
+                        else None
+                    )
+                except (AttributeError, KeyError, ValueError) as e:
+                    # anything the validator let through but the SDK rejects
+                    self._reject(row, reader.line_num, [str(e)])
+                    continue
+                yield ftd_input, ssh_target
+
+    def _reject(self, row: dict, line_number: int, reasons: List[str]) -> None:
+        self.rejected_rows.append(
+            OnboardingResult(
+                name=row.get("name") or f"line {line_number}",
+                error=f"Invalid row on line {line_number} of {self.ftd_csv_file}: "
+                + "; ".join(reasons),
+            )
+        )
@@ -0,0 +1,55 @@
+import csv
+from typing import Iterator, List
+
+from cdo_sdk_python import ZtpOnboardingInput
+
+from models.onboarding_result import OnboardingResult
+from validators.ftd_ztp_csv_validator import FtdZtpCsvValidator
+
+
+class FtdZtpParser:
+    def __init__(self, fmc_access_policy_uid: str, ftd_ztp_csv_file: str):
+        self.fmc_access_policy_uid = fmc_access_policy_uid
+        self.ftd_ztp_csv_file = ftd_ztp_csv_file
+        self.validator = FtdZtpCsvValidator(ftd_ztp_csv_file)
+        self.rejected_rows: List[OnboardingResult] = []
+
+    def get_ztp_ftds_to_onboard(self) -> List[ZtpOnboardingInput]:
+        return list(self.iter_ztp_ftds_to_onboard())
+
+    def iter_ztp_ftds_to_onboard(self) -> Iterator[ZtpOnboardingInput]:
+        """Validate and convert the CSV one row at a time. Invalid rows are recorded in
+        `rejected_rows` instead of stopping the rest of the file from being onboarded.
+        """
+        with open(self.ftd_ztp_csv_file, mode="r") as file:
+            reader = csv.DictReader(file)
+            check_row = self.validator.row_checker()
+            for row in reader:
+                errors = check_row(row, reader.line_num)
+                if errors:
+                    self._reject(
+                        row, reader.line_num, [error.message for error in errors]
+                    )
+                    continue
+                try:
+                    ztp_onboarding_input = ZtpOnboardingInput(
+                        name=row["name"],
+                        serial_number=row["serial_number"],
+                        licenses=row["licenses"].split(";"),
+                        admin_password=row["admin_password"],
+                        fmc_access_policy_uid=self.fmc_access_policy_uid,
+                    )
+                except (AttributeError, KeyError, ValueError) as e:
+                    # anything the validator let through but the SDK rejects
+                    self._reject(row, reader.line_num, [str(e)])
+                    continue
+                yield ztp_onboarding_input
+
+    def _reject(self, row: dict, line_number: int, reasons: List[str]) -> None:
+        self.rejected_rows.append(
+            OnboardingResult(
+                name=row.get("name") or f"line {line_number}",
+                error=f"Invalid row on line {line_number} of {self.ftd_ztp_csv_file}: "
+                + "; ".join(reasons),
+            )
+        )
@@ -0,0 +1,42 @@
+import json
+from typing import Iterator, List
+
+from models.ai_answer import AiAnswer
+
+
+class QuestionParser:
+    def __init__(self, questions_file: str):
+        self.questions_file = questions_file
+        self.rejected_rows: List[AiAnswer] = []
+
+    def iter_questions(self) -> Iterator[str]:
+        """Stream questions from a text file (one per line; blank lines and lines
+        starting with # are skipped) or a JSONL file of `{"question": ...}` objects.
+        Invalid JSONL lines are recorded in `rejected_rows`."""
+        with open(self.questions_file, mode="r") as file:
+            for line_number, line in enumerate(file, start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if not self.questions_file.endswith(".jsonl"):
+                    yield line
+                    continue
+                question = self._parse_json_line(line)
+                if question is None:
+                    self.rejected_rows.append(
+                        AiAnswer(
+                            question=f"line {line_number}",
+                            error=f"Invalid row on line {line_number} of {self.questions_file}",
+                        )
+                    )
+                    continue
+                yield question
+
+    @staticmethod
+    def _parse_json_line(line: str) -> str | None:
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        question = row.get("question") if isinstance(row, dict) else None
+        return question if isinstance(question, str) and question.strip() else None
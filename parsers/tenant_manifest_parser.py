@@ -0,0 +1,69 @@
+import json
+import os
+from typing import Any, Dict, List
+
+from models.tenant import Tenant
+from utils.region_mapping import supported_regions
+
+
+class TenantManifestParser:
+    """Reads a JSON or YAML manifest of tenants to run an operation against:
+
+        tenants:
+          - name: customer-a
+            region: us
+            api_token_env: CUSTOMER_A_API_TOKEN   # or `api_token: ...`
+
+    A bare list of tenants is accepted too.
+    """
+
+    def __init__(self, manifest_file: str):
+        self.manifest_file = manifest_file
+
+    def get_tenants(self) -> List[Tenant]:
+        manifest = self._load()
+        entries = (
+            manifest.get("tenants", []) if isinstance(manifest, dict) else manifest
+        )
+        if not isinstance(entries, list) or not all(
+            isinstance(entry, dict) for entry in entries
+        ):
+            raise ValueError(f"{self.manifest_file} is not a list of tenants")
+        tenants = [self._to_tenant(index, entry) for index, entry in enumerate(entries)]
+        names = [tenant.name for tenant in tenants]
+        duplicate_names = {name for name in names if names.count(name) > 1}
+        if duplicate_names:
+            raise ValueError(
+                f"Tenant names must be unique in {self.manifest_file}: {', '.join(sorted(duplicate_names))}"
+            )
+        return tenants
+
+    def _load(self) -> Any:
+        with open(self.manifest_file, mode="r") as file:
+            if not self.manifest_file.endswith((".yaml", ".yml")):
+                try:
+                    return json.load(file)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{self.manifest_file} is not valid JSON: {e}")
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError(
+                    "YAML manifests need PyYAML (pip install pyyaml); use JSON otherwise."
+                )
+            try:
+                return yaml.safe_load(file)
+            except yaml.YAMLError as e:
+                raise ValueError(f"{self.manifest_file} is not valid YAML: {e}")
+
+    def _to_tenant(self, index: int, entry: Dict[str, Any]) -> Tenant:
+        name = entry.get("name") or f"tenant-{index + 1}"
+        region = entry.get("region")
+        if region not in supported_regions:
+            raise ValueError(f"Tenant {name} has an unsupported region: {region}")
+        api_token = entry.get("api_token")
+        if not api_token and entry.get("api_token_env"):
+            api_token = os.environ.get(entry["api_token_env"])
+        if not api_token:
+            raise ValueError(f"Tenant {name} has no API token")
+        return Tenant(name=name, region=region, api_token=api_token)
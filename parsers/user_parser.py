@@ -0,0 +1,61 @@
+import csv
+import json
+from typing import Iterator, List, Optional
+
+from cdo_sdk_python import UserCreateOrUpdateInput
+
+from models.user_provisioning_result import UserProvisioningResult, FAILED
+from validators.user_file_validator import UserFileValidator
+
+
+class UserParser:
+    def __init__(self, users_file: str):
+        self.users_file = users_file
+        self.validator = UserFileValidator(users_file)
+        self.rejected_rows: List[UserProvisioningResult] = []
+
+    def iter_users_to_provision(self) -> Iterator[UserCreateOrUpdateInput]:
+        """Stream users from a CSV (name, role and optionally api_only_user columns)
+        or JSONL file with the same fields. Invalid rows are recorded in
+        `rejected_rows`."""
+        with open(self.users_file, mode="r") as file:
+            if self.users_file.endswith(".jsonl"):
+                rows = (
+                    (line_number, self._parse_json_line(line))
+                    for line_number, line in enumerate(file, start=1)
+                    if line.strip()
+                )
+            else:
+                reader = csv.DictReader(file)
+                rows = ((reader.line_num, row) for row in reader)
+            for line_number, row in rows:
+                if row is None:
+                    self._reject({}, line_number, ["not a JSON object"])
+                    continue
+                errors = self.validator.get_row_errors(row)
+                if errors:
+                    self._reject(row, line_number, errors)
+                    continue
+                yield UserCreateOrUpdateInput(
+                    name=row["name"],
+                    role=row["role"],
+                    api_only_user=str(row.get("api_only_user")).lower() == "true",
+                )
+
+    def _reject(self, row: dict, line_number: int, reasons: List[str]) -> None:
+        self.rejected_rows.append(
+            UserProvisioningResult(
+                name=row.get("name") or f"line {line_number}",
+                status=FAILED,
+                error=f"Invalid row on line {line_number} of {self.users_file}: "
+                + "; ".join(reasons),
+            )
+        )
+
+    @staticmethod
+    def _parse_json_line(line: str) -> Optional[dict]:
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        return row if isinstance(row, dict) else None
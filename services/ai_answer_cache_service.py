@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from utils.cache_dir import get_user_cache_dir, write_json_cache_file
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+_WHITESPACE_REGEX = re.compile(r"\s+")
+_file_lock = threading.Lock()
+
+
+def normalise_question(question: str) -> str:
+    """`  What ASAs are  OFFLINE? ` -> `what asas are offline`, so that trivially
+    different phrasings of the same question share an answer."""
+    return _WHITESPACE_REGEX.sub(" ", question).strip().rstrip("?!. ").casefold()
+
+
+class AiAnswerCacheService:
+    """Remembers the AI Assistant's answers for each tenant and region, keyed by the
+    normalised question, for `ttl_seconds`. Expired answers are dropped whenever the
+    cache is written."""
+
+    def __init__(
+        self,
+        tenant: str,
+        region: str,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        cache_file: Optional[str] = None,
+    ):
+        self.key_prefix = f"{tenant}:{region}"
+        self.ttl_seconds = ttl_seconds
+        self.cache_file = cache_file or os.path.join(
+            get_user_cache_dir(), "ai_answers.json"
+        )
+
+    def get(self, question: str) -> Optional[str]:
+        with _file_lock:
+            entry = self._read().get(self._key(question))
+        if entry is None or entry["expires_at"] <= time.time():
+            return None
+        return entry["answer"]
+
+    def put(self, question: str, answer: str) -> None:
+        with _file_lock:
+            now = time.time()
+            entries = {
+                key: entry
+                for key, entry in self._read().items()
+                if entry["expires_at"] > now
+            }
+            entries[self._key(question)] = {
+                "answer": answer,
+                "expires_at": now + self.ttl_seconds,
+            }
+            self._write(entries)
+
+    def _key(self, question: str) -> str:
+        return hashlib.sha256(
+            f"{self.key_prefix}\0{normalise_question(question)}".encode("utf-8")
+        ).hexdigest()
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_file, mode="r") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write(self, entries: Dict[str, Any]) -> None:
+        write_json_cache_file(self.cache_file, entries)
@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from cdo_sdk_python import AIAssistantApi, AiMessage, AiQuestion, ApiClient
+
+from models.ai_answer import AiAnswer
+from services.ai_answer_cache_service import AiAnswerCacheService
+from services.transaction_poller import TransactionCallback
+from services.transaction_service import TransactionService
+from utils.concurrency import bounded_submit
+
+
+class AiConversationIndex:
+    """Indexes the messages of a conversation by UID and by the message they reply
+    to, so pairing questions with answers does not rescan the whole conversation."""
+
+    def __init__(self, messages: List[AiMessage]):
+        self.messages_by_uid: Dict[str, AiMessage] = {}
+        self.replies_by_uid: Dict[str, AiMessage] = {}
+        self.requests_by_content: Dict[str, AiMessage] = {}
+        for message in messages:
+            self.messages_by_uid[message.uid] = message
+            if message.in_reply_to is not None:
+                self.replies_by_uid[message.in_reply_to] = message
+            elif message.content is not None:
+                # if a question was asked more than once, pair it with the latest
+                self.requests_by_content[message.content] = message
+
+    def get_message(self, message_uid: str) -> Optional[AiMessage]:
+        return self.messages_by_uid.get(message_uid)
+
+    def get_reply(self, message_uid: str) -> Optional[AiMessage]:
+        return self.replies_by_uid.get(message_uid)
+
+    def get_answer(self, question: str) -> Optional[AiMessage]:
+        request = self.requests_by_content.get(question)
+        return self.get_reply(request.uid) if request is not None else None
+
+
+class AiAssistantService:
+    def __init__(
+        self,
+        api_client: ApiClient,
+        answer_cache: Optional[AiAnswerCacheService] = None,
+    ):
+        self.ai_assistant_api = AIAssistantApi(api_client)
+        # waits on the poller shared by everything using `api_client` (see
+        # `get_transaction_poller`), so concurrent questions cost one polling thread
+        self.transaction_service = TransactionService(api_client)
+        self.answer_cache = answer_cache
+
+    def ask(
+        self, question: str, on_update: Optional[TransactionCallback] = None
+    ) -> str:
+        """Ask `question` in a new conversation and return the answer, or the cached
+        answer if the question was asked recently. Raises a `RuntimeError` if the
+        AI Assistant fails to answer."""
+        if self.answer_cache is not None:
+            answer = self.answer_cache.get(question)
+            if answer is not None:
+                return answer
+
+        cdo_transaction = self.ai_assistant_api.ask_ai_assistant_in_new_conversation(
+            ai_question=AiQuestion(content=question)
+        )
+        self.transaction_service.wait_for_transaction_to_finish(
+            cdo_transaction.transaction_uid, on_update=on_update
+        )
+        conversation_index = AiConversationIndex(
+            self.ai_assistant_api.get_ai_assistant_conversation_messages(
+                cdo_transaction.entity_uid
+            )
+        )
+        answer = conversation_index.get_answer(question)
+        if answer is None or answer.content is None:
+            raise RuntimeError("The AI Assistant did not answer the question.")
+
+        if self.answer_cache is not None:
+            self.answer_cache.put(question, answer.content)
+        return answer.content
+
+    def ask_many(
+        self, questions: Iterable[str], max_in_flight: int = 5
+    ) -> Iterator[AiAnswer]:
+        """Ask up to `max_in_flight` questions at once, each in its own conversation,
+        and yield the answers as they arrive (not in the order they were asked)."""
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            for question, future in bounded_submit(
+                executor, self.ask, questions, max_in_flight
+            ):
+                try:
+                    yield AiAnswer(question, answer=future.result())
+                except Exception as e:
+                    yield AiAnswer(question, error=str(e))
@@ -0,0 +1,92 @@
+import asyncio
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from utils.metrics import get_metrics_registry, get_operation_name
+from utils.rate_limiter import (
+    get_rate_limiter,
+    get_retry_statuses,
+    parse_retry_after,
+    DEFAULT_RETRY_BACKOFF_POLICY,
+    THROTTLED_STATUSES,
+)
+
+
+class AsyncApiClient:
+    """A non-blocking counterpart to `cdo_sdk_python.ApiClient`.
+
+    Requests go through a single pooled `aiohttp.ClientSession`, so one event loop
+    can keep thousands of requests in flight without a thread per request.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        access_token: str,
+        max_connections: int = 100,
+        max_retries: int = 5,
+    ):
+        self.base_url = base_url
+        self.access_token = access_token
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.rate_limiter = get_rate_limiter(base_url, access_token)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncApiClient":
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections),
+            headers={
+                "Authorization": f"Bearer {self.access_token}",
+                "Content-Type": "application/json",
+            },
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._session.close()
+
+    async def get(self, path: str, params: Optional[Dict[str, str]] = None) -> Any:
+        return await self._request("GET", path, params=params)
+
+    async def post(self, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
+        return await self._request("POST", path, json=body)
+
+    async def _request(self, method: str, path: str, **kwargs) -> Any:
+        if self._session is None:
+            raise RuntimeError(
+                "AsyncApiClient must be used as an async context manager"
+            )
+        metrics = get_metrics_registry()
+        operation = get_operation_name(method, f"{self.base_url}{path}")
+        retry_statuses = get_retry_statuses(method)
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire_async()
+            started_at = metrics.start_request(operation)
+            try:
+                response = await self._session.request(
+                    method, f"{self.base_url}{path}", **kwargs
+                )
+            except Exception:
+                metrics.finish_request(operation, started_at, "error")
+                raise
+            metrics.finish_request(operation, started_at, str(response.status))
+            async with response:
+                if response.status not in THROTTLED_STATUSES:
+                    self.rate_limiter.on_success()
+                    response.raise_for_status()
+                    return await response.json()
+                retry_after_seconds = parse_retry_after(
+                    response.headers.get("Retry-After")
+                )
+                self.rate_limiter.on_throttled(retry_after_seconds)
+                if response.status not in retry_statuses or attempt >= self.max_retries:
+                    response.raise_for_status()
+            if retry_after_seconds is None:
+                await asyncio.sleep(
+                    DEFAULT_RETRY_BACKOFF_POLICY.get_delay_seconds(attempt)
+                )
+            attempt += 1
+            metrics.increment_retries(operation)
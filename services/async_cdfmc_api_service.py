@@ -0,0 +1,32 @@
+from cdo_sdk_python import DevicePage
+
+from models.fmc import FmcAccessPolicy
+from services.async_api_client import AsyncApiClient
+
+
+class AsyncCdFmcApiService:
+    def __init__(self, api_client: AsyncApiClient, cdfmc_domain_uid: str):
+        self.api_client = api_client
+        self.cdfmc_domain_uid = cdfmc_domain_uid
+
+    @classmethod
+    async def create(cls, api_client: AsyncApiClient) -> "AsyncCdFmcApiService":
+        manager_page: DevicePage = DevicePage.from_dict(
+            await api_client.get(
+                "/v1/inventory/managers",
+                params={"limit": "1", "offset": "0", "q": "deviceType:CDFMC"},
+            )
+        )
+        if len(manager_page.items) != 1:
+            raise RuntimeError("CDFMC not found")
+        return cls(api_client, manager_page.items[0].fmc_domain_uid)
+
+    async def get_first_access_policy_uid(self) -> FmcAccessPolicy:
+        response = await self.api_client.get(
+            f"/v1/cdfmc/api/fmc_config/v1/domain/{self.cdfmc_domain_uid}/policy/accesspolicies"
+        )
+        first_access_policy = response["items"][0]
+        return FmcAccessPolicy(
+            name=first_access_policy["name"],
+            id=first_access_policy["id"],
+        )
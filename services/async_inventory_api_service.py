@@ -0,0 +1,82 @@
+from typing import Optional
+
+from cdo_sdk_python import (
+    FtdCreateOrUpdateInput,
+    ZtpOnboardingInput,
+    CdoTransaction,
+    Device,
+    FtdRegistrationInput,
+    DevicePage,
+)
+
+from services.async_api_client import AsyncApiClient
+from services.async_transaction_service import AsyncTransactionService
+
+
+class AsyncInventoryApiService:
+    def __init__(self, api_client: AsyncApiClient):
+        self.api_client = api_client
+        self.transaction_service = AsyncTransactionService(api_client)
+
+    async def get_device(self, device_uid: str) -> Device:
+        return Device.from_dict(
+            await self.api_client.get(f"/v1/inventory/devices/{device_uid}")
+        )
+
+    async def get_devices(
+        self, limit: int = 50, offset: int = 0, q: Optional[str] = None
+    ) -> DevicePage:
+        params = {"limit": str(limit), "offset": str(offset)}
+        if q is not None:
+            params["q"] = q
+        return DevicePage.from_dict(
+            await self.api_client.get("/v1/inventory/devices", params=params)
+        )
+
+    async def create_ftd_device(self, ftd_input: FtdCreateOrUpdateInput) -> Device:
+        transaction = CdoTransaction.from_dict(
+            await self.api_client.post(
+                "/v1/inventory/devices/ftds", ftd_input.to_dict()
+            )
+        )
+        return await self._get_device_after_transaction_finished(transaction)
+
+    async def register_ftd_device_with_scc(self, device: Device) -> Device:
+        transaction = CdoTransaction.from_dict(
+            await self.api_client.post(
+                "/v1/inventory/devices/ftds/register",
+                FtdRegistrationInput(ftd_uid=device.uid).to_dict(),
+            )
+        )
+        return await self._get_device_after_transaction_finished(transaction)
+
+    async def onboard_ftd_ztp_device(
+        self, ztp_onboarding_input: ZtpOnboardingInput
+    ) -> Device:
+        transaction = CdoTransaction.from_dict(
+            await self.api_client.post(
+                "/v1/inventory/devices/ftds/ztp", ztp_onboarding_input.to_dict()
+            )
+        )
+        await self.transaction_service.wait_for_transaction_to_finish(
+            transaction.transaction_uid
+        )
+        # workaround for https://jira-eng-rtp3.cisco.com/jira/browse/LH-87581
+        device_page: DevicePage = await self.get_devices(
+            q=f"name:{ztp_onboarding_input.name}"
+        )
+        if len(device_page.items) != 1:
+            raise RuntimeError(
+                f"Could not find device with name {ztp_onboarding_input.name}"
+            )
+        return device_page.items[0]
+
+    async def _get_device_after_transaction_finished(
+        self, transaction: CdoTransaction
+    ) -> Device:
+        finished_transaction: CdoTransaction = (
+            await self.transaction_service.wait_for_transaction_to_finish(
+                transaction.transaction_uid
+            )
+        )
+        return await self.get_device(finished_transaction.entity_uid)
@@ -0,0 +1,43 @@
+import asyncio
+
+from cdo_sdk_python import CdoTransaction
+from cdo_sdk_python.models.cdo_transaction_status import CdoTransactionStatus
+
+from services.async_api_client import AsyncApiClient
+from services.transaction_poller import (
+    BACKOFF_POLICIES,
+    DEFAULT_BACKOFF_POLICY,
+    TransactionFailedError,
+)
+
+
+class AsyncTransactionService:
+    def __init__(self, api_client: AsyncApiClient):
+        self.api_client = api_client
+
+    async def get_transaction(self, transaction_uid: str) -> CdoTransaction:
+        return CdoTransaction.from_dict(
+            await self.api_client.get(f"/v1/transactions/{transaction_uid}")
+        )
+
+    async def wait_for_transaction_to_finish(
+        self, transaction_uid: str
+    ) -> CdoTransaction:
+        transaction: CdoTransaction = await self.get_transaction(transaction_uid)
+        attempt = 0
+        while transaction.cdo_transaction_status not in [
+            CdoTransactionStatus.DONE,
+            CdoTransactionStatus.ERROR,
+        ]:
+            policy = BACKOFF_POLICIES.get(
+                transaction.transaction_type, DEFAULT_BACKOFF_POLICY
+            )
+            await asyncio.sleep(policy.get_delay_seconds(attempt))
+            attempt += 1
+            transaction = await self.get_transaction(transaction_uid)
+
+        if transaction.cdo_transaction_status == CdoTransactionStatus.ERROR:
+            raise TransactionFailedError(
+                f"Transaction {transaction_uid} failed: {transaction.transaction_details}"
+            )
+        return transaction
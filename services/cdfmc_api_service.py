@@ -1,33 +1,127 @@
+import threading
+from typing import Any, Dict, Iterator, Optional
+
 import requests
+from requests.adapters import HTTPAdapter
 from cdo_sdk_python import ApiClient, InventoryApi, DevicePage
 
 from models.fmc import FmcAccessPolicy
+from services.cdfmc_domain_cache_service import CdFmcDomainCacheService
+from utils.metrics import get_metrics_registry, get_operation_name
+from utils.rate_limiter import call_with_rate_limit, get_rate_limiter
+
+FMC_MAX_PAGE_SIZE = 1000
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_cdfmc_session() -> requests.Session:
+    """A keep-alive session shared by every cdFMC call in the process, so repeat calls
+    reuse pooled TLS connections instead of opening a new one per request."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+        return _session
 
 
 class CdFmcApiService:
-    def __init__(self, api_client: ApiClient):
+    def __init__(
+        self,
+        api_client: ApiClient,
+        domain_cache: Optional[CdFmcDomainCacheService] = None,
+    ):
         self.api_client = api_client
-        inventory_api = InventoryApi(api_client)
+        self.domain_cache = domain_cache
+        cached_domain_uid = domain_cache.get_domain_uid() if domain_cache else None
+        # a cached domain UID is trusted until a cdFMC call rejects it (see `_get`),
+        # so that the first real call doubles as the validation probe
+        self.is_domain_uid_from_cache = cached_domain_uid is not None
+        self.cdfmc_domain_uid = cached_domain_uid or self._discover_cdfmc_domain_uid()
+
+    def _discover_cdfmc_domain_uid(self) -> str:
+        inventory_api = InventoryApi(self.api_client)
         manager_page: DevicePage = inventory_api.get_device_managers(
             limit="1", offset="0", q="deviceType:CDFMC"
         )
         if len(manager_page.items) != 1:
             raise RuntimeError("CDFMC not found")
-        self.cdfmc_domain_uid = manager_page.items[0].fmc_domain_uid
+        if self.domain_cache is not None:
+            self.domain_cache.put(manager_page.items[0])
+        return manager_page.items[0].fmc_domain_uid
 
     def get_first_access_policy_uid(self) -> FmcAccessPolicy:
+        response = self._get("/policy/accesspolicies", params={"limit": 1})
+        first_access_policy = response["items"][0]
+        return FmcAccessPolicy(
+            name=first_access_policy["name"],
+            id=first_access_policy["id"],
+        )
+
+    def iter_access_policies(
+        self, page_size: int = FMC_MAX_PAGE_SIZE, expanded: bool = False
+    ) -> Iterator[FmcAccessPolicy]:
+        offset = 0
+        while True:
+            response = self._get(
+                "/policy/accesspolicies",
+                params={
+                    "limit": page_size,
+                    "offset": offset,
+                    "expanded": str(expanded).lower(),
+                },
+            )
+            items = response.get("items", [])
+            for access_policy in items:
+                yield FmcAccessPolicy(
+                    name=access_policy["name"], id=access_policy["id"]
+                )
+            offset += len(items)
+            if not items or offset >= response.get("paging", {}).get("count", 0):
+                return
+
+    def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        try:
+            return self._get_from_domain(path, params)
+        except requests.HTTPError as e:
+            if not self.is_domain_uid_from_cache or e.response.status_code not in [
+                403,
+                404,
+            ]:
+                raise
+            # the cached domain is stale (e.g. the cdFMC was reprovisioned)
+            self.domain_cache.invalidate()
+            self.is_domain_uid_from_cache = False
+            self.cdfmc_domain_uid = self._discover_cdfmc_domain_uid()
+            return self._get_from_domain(path, params)
+
+    def _get_from_domain(self, path: str, params: Optional[Dict[str, Any]]) -> Any:
         url = (
             f"{self.api_client.configuration.host}/v1/cdfmc/api/fmc_config/v1/domain/"
-            f"{self.cdfmc_domain_uid}/policy/accesspolicies"
+            f"{self.cdfmc_domain_uid}{path}"
         )
         headers = {
             "Authorization": f"Bearer {self.api_client.configuration.access_token}",
             "Content-Type": "application/json",
         }
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        first_access_policy = response.json()["items"][0]
-        return FmcAccessPolicy(
-            name=first_access_policy["name"],
-            id=first_access_policy["id"],
+        operation = get_operation_name("GET", url)
+        metrics = get_metrics_registry()
+        response = call_with_rate_limit(
+            lambda: metrics.time_request(
+                operation,
+                lambda: get_cdfmc_session().get(url, headers=headers, params=params),
+                get_status=lambda response: response.status_code,
+            ),
+            get_status=lambda response: response.status_code,
+            get_retry_after=lambda response: response.headers.get("Retry-After"),
+            discard=lambda response: response.close(),
+            on_retry=lambda: metrics.increment_retries(operation),
+            rate_limiter=get_rate_limiter(
+                self.api_client.configuration.host,
+                self.api_client.configuration.access_token,
+            ),
         )
+        response.raise_for_status()
+        return response.json()
@@ -0,0 +1,58 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from cdo_sdk_python import Device
+
+from utils.cache_dir import get_user_cache_dir, write_json_cache_file
+
+_file_lock = threading.Lock()
+
+
+class CdFmcDomainCacheService:
+    """Remembers the cdFMC manager (and its domain UID) for each tenant and region in
+    a small JSON file, so it does not have to be rediscovered on every run."""
+
+    def __init__(self, tenant: str, region: str, cache_file: Optional[str] = None):
+        self.key = f"{tenant}:{region}"
+        self.cache_file = cache_file or os.path.join(
+            get_user_cache_dir(), "cdfmc_domains.json"
+        )
+
+    def get(self) -> Optional[Dict[str, Any]]:
+        with _file_lock:
+            return self._read().get(self.key)
+
+    def get_domain_uid(self) -> Optional[str]:
+        entry = self.get()
+        return entry["fmc_domain_uid"] if entry else None
+
+    def put(self, cdfmc_manager: Device) -> None:
+        with _file_lock:
+            entries = self._read()
+            entries[self.key] = {
+                "fmc_domain_uid": cdfmc_manager.fmc_domain_uid,
+                "uid": cdfmc_manager.uid,
+                "name": cdfmc_manager.name,
+                "software_version": cdfmc_manager.software_version,
+                "cached_at": time.time(),
+            }
+            self._write(entries)
+
+    def invalidate(self) -> None:
+        with _file_lock:
+            entries = self._read()
+            if entries.pop(self.key, None) is not None:
+                self._write(entries)
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_file, mode="r") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write(self, entries: Dict[str, Any]) -> None:
+        write_json_cache_file(self.cache_file, entries, indent=2)
@@ -0,0 +1,117 @@
+import threading
+from concurrent.futures import Future
+from typing import Dict, Iterable, Optional
+
+from cdo_sdk_python import InventoryApi, Device
+
+from services.device_page_iterator import DevicePageIterator
+
+
+class DeviceNameResolver:
+    """Resolves device names to devices using as few inventory queries as possible.
+
+    Names requested by concurrent workers within `max_wait_seconds` of each other
+    are coalesced into a single `name:("a" OR "b" ...)` query (paged if needed), and
+    every device returned is kept in an in-memory name index shared by all callers.
+    The flusher thread only runs while there are names to resolve.
+    """
+
+    def __init__(
+        self,
+        inventory_api: InventoryApi,
+        batch_size: int = 50,
+        max_wait_seconds: float = 0.2,
+    ):
+        self.inventory_api = inventory_api
+        self.batch_size = batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self._lock = threading.Condition()
+        self._index: Dict[str, Dict[str, Device]] = {}
+        self._pending: Dict[str, Future] = {}
+        self._flusher_thread: Optional[threading.Thread] = None
+
+    def resolve(self, names: Iterable[str]) -> Dict[str, Device]:
+        futures = {name: self.get_device_async(name) for name in set(names)}
+        return {name: future.result() for name, future in futures.items()}
+
+    def get_device(self, name: str) -> Device:
+        return self.get_device_async(name).result()
+
+    def get_device_async(self, name: str) -> Future:
+        with self._lock:
+            if name in self._index:
+                future = Future()
+                self._set_result(future, name)
+                return future
+            future = self._pending.get(name)
+            if future is None:
+                future = Future()
+                self._pending[name] = future
+                self._ensure_flusher_started()
+                self._lock.notify()
+            return future
+
+    def add_to_index(self, devices: Iterable[Device]) -> None:
+        with self._lock:
+            for device in devices:
+                self._index.setdefault(device.name, {})[device.uid] = device
+
+    def _ensure_flusher_started(self) -> None:
+        if self._flusher_thread is None:
+            self._flusher_thread = threading.Thread(
+                target=self._run_flusher, name="device-name-resolver", daemon=True
+            )
+            self._flusher_thread.start()
+
+    def _run_flusher(self) -> None:
+        while True:
+            with self._lock:
+                if not self._pending:
+                    # exit once nothing is left to resolve; the next name requested
+                    # starts a new flusher
+                    self._flusher_thread = None
+                    return
+                # give other workers a moment to add their names to this batch
+                self._lock.wait_for(
+                    lambda: len(self._pending) >= self.batch_size,
+                    timeout=self.max_wait_seconds,
+                )
+                batch = dict(list(self._pending.items())[: self.batch_size])
+                for name in batch:
+                    del self._pending[name]
+            self._resolve_batch(batch)
+
+    def _resolve_batch(self, batch: Dict[str, Future]) -> None:
+        try:
+            devices = [
+                device
+                for device in DevicePageIterator(
+                    self.inventory_api, q=self._build_query(batch.keys())
+                )
+                # the search is tokenised, so only keep exact name matches
+                if device.name in batch
+            ]
+        except Exception as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+        self.add_to_index(devices)
+        with self._lock:
+            for name, future in batch.items():
+                self._set_result(future, name)
+
+    def _set_result(self, future: Future, name: str) -> None:
+        devices = list(self._index.get(name, {}).values())
+        if len(devices) != 1:
+            future.set_exception(
+                RuntimeError(f"Could not find device with name {name}")
+            )
+        else:
+            future.set_result(devices[0])
+
+    @staticmethod
+    def _build_query(names: Iterable[str]) -> str:
+        quoted_names = " OR ".join(
+            '"' + name.replace("\\", "\\\\").replace('"', '\\"') + '"' for name in names
+        )
+        return f"name:({quoted_names})"
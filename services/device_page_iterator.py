@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
+
+from cdo_sdk_python import InventoryApi, DevicePage, Device
+
+from utils.concurrency import bounded_map
+
+MAX_PAGE_SIZE = 200
+
+
+class DevicePageIterator:
+    """Iterates over every device in the inventory, one page at a time.
+
+    While the caller handles a page, the next one is already being fetched. With
+    `parallel_workers` > 1, the first page is used to learn the total count and the
+    rest of the offset range is fetched that many pages at a time; pages are still
+    yielded in order.
+    """
+
+    def __init__(
+        self,
+        inventory_api: InventoryApi,
+        q: Optional[str] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        parallel_workers: int = 1,
+    ):
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+        if parallel_workers < 1:
+            raise ValueError("parallel_workers must be at least 1")
+        self.inventory_api = inventory_api
+        self.q = q
+        self.page_size = page_size
+        self.parallel_workers = parallel_workers
+
+    def __iter__(self) -> Iterator[Device]:
+        for page in self.iter_pages():
+            yield from page.items
+
+    def iter_pages(self) -> Iterator[DevicePage]:
+        with ThreadPoolExecutor(max_workers=self.parallel_workers) as executor:
+            if self.parallel_workers == 1:
+                yield from self._iter_pages_with_prefetch(executor)
+            else:
+                yield from self._iter_pages_in_parallel(executor)
+
+    def _iter_pages_with_prefetch(
+        self, executor: ThreadPoolExecutor
+    ) -> Iterator[DevicePage]:
+        offset = 0
+        next_page = executor.submit(self._get_page, offset)
+        while True:
+            page: DevicePage = next_page.result()
+            offset += self.page_size
+            has_more = len(page.items) == self.page_size and (
+                page.count is None or offset < page.count
+            )
+            if has_more:
+                next_page = executor.submit(self._get_page, offset)
+            yield page
+            if not has_more:
+                return
+
+    def _iter_pages_in_parallel(
+        self, executor: ThreadPoolExecutor
+    ) -> Iterator[DevicePage]:
+        first_page: DevicePage = self._get_page(0)
+        yield first_page
+        if first_page.count is None:
+            # without a total we cannot split the range up front
+            yield from self._iter_remaining_pages_sequentially(first_page)
+            return
+        # a window of pages in flight, so a slow consumer does not end up with the
+        # whole inventory buffered in memory
+        yield from bounded_map(
+            executor,
+            self._get_page,
+            range(self.page_size, first_page.count, self.page_size),
+            self.parallel_workers,
+        )
+
+    def _iter_remaining_pages_sequentially(
+        self, page: DevicePage
+    ) -> Iterator[DevicePage]:
+        offset = 0
+        while len(page.items) == self.page_size:
+            offset += self.page_size
+            page = self._get_page(offset)
+            yield page
+
+    def _get_page(self, offset: int) -> DevicePage:
+        return self.inventory_api.get_devices(
+            limit=str(self.page_size), offset=str(offset), q=self.q
+        )
@@ -0,0 +1,124 @@
+import json
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Type
+
+from cdo_sdk_python import Device, InventoryApi
+from cdo_sdk_python.exceptions import ApiException
+from cdo_sdk_python.rest import RESTResponse
+
+from services.device_page_iterator import DevicePageIterator, MAX_PAGE_SIZE
+
+# SDK (snake_case) field name -> API (camelCase) field name
+_API_FIELD_NAMES: Dict[str, str] = {
+    field_name: field.alias or field_name
+    for field_name, field in Device.model_fields.items()
+}
+_FIELD_NAMES_BY_API_NAME: Dict[str, str] = {
+    api_field_name: field_name
+    for field_name, api_field_name in _API_FIELD_NAMES.items()
+}
+
+
+class ProjectedDevicePage(NamedTuple):
+    count: Optional[int]
+    limit: Optional[int]
+    offset: Optional[int]
+    items: List[tuple]
+
+
+def normalise_device_fields(fields: Iterable[str]) -> List[str]:
+    """`fields` by their API names (`connectivityState`), whether they were given by
+    those or by their SDK names (`connectivity_state`), without repeats."""
+    api_field_names = []
+    for field in fields:
+        field_name = _FIELD_NAMES_BY_API_NAME.get(field, field)
+        if field_name not in _API_FIELD_NAMES:
+            raise ValueError(f"Unknown device field: {field}")
+        if _API_FIELD_NAMES[field_name] not in api_field_names:
+            api_field_names.append(_API_FIELD_NAMES[field_name])
+    return api_field_names
+
+
+def get_device_record_type(fields: Iterable[str]) -> Type[tuple]:
+    """A compact, tuple-backed record type holding just `fields` of a device.
+
+    Fields may be given by their SDK or API names (`connectivity_state` or
+    `connectivityState`); the record's attributes use the SDK names, so it can stand
+    in for a `Device` wherever only those fields are read. Nested values (e.g.
+    `cd_fmc_info`) are left as the decoded JSON, not SDK models.
+    """
+    return _get_device_record_type(tuple(fields))
+
+
+@lru_cache(maxsize=None)
+def _get_device_record_type(fields: tuple) -> Type[tuple]:
+    api_field_names = tuple(normalise_device_fields(fields))
+    field_names = [
+        _FIELD_NAMES_BY_API_NAME[api_field_name] for api_field_name in api_field_names
+    ]
+
+    def from_json(cls, device_json: Dict[str, Any]) -> tuple:
+        return cls._make(
+            [device_json.get(api_field_name) for api_field_name in api_field_names]
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The record keyed by API field names, like `Device.to_dict()`."""
+        return dict(zip(api_field_names, self))
+
+    return type(
+        "DeviceRecord",
+        (namedtuple("DeviceRecord", field_names),),
+        {
+            "__slots__": (),
+            "api_field_names": api_field_names,
+            "from_json": classmethod(from_json),
+            "to_dict": to_dict,
+        },
+    )
+
+
+class ProjectedDevicePageIterator(DevicePageIterator):
+    """Iterates over the inventory like `DevicePageIterator`, but decodes each page
+    straight from the raw response into `get_device_record_type(fields)` records,
+    without building the `Device` models (which is where most of the time and
+    memory of a large scan goes)."""
+
+    def __init__(
+        self,
+        inventory_api: InventoryApi,
+        fields: Iterable[str],
+        q: Optional[str] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        parallel_workers: int = 1,
+    ):
+        super().__init__(
+            inventory_api,
+            q=q,
+            page_size=page_size,
+            parallel_workers=parallel_workers,
+        )
+        self.record_type = get_device_record_type(fields)
+
+    def _get_page(self, offset: int) -> ProjectedDevicePage:
+        response = RESTResponse(
+            self.inventory_api.get_devices_without_preload_content(
+                limit=str(self.page_size), offset=str(offset), q=self.q
+            )
+        )
+        body = response.read()
+        if not 200 <= response.status < 300:
+            raise ApiException.from_response(
+                http_resp=response, body=body.decode("utf-8"), data=None
+            )
+        page_json = json.loads(body)
+        return ProjectedDevicePage(
+            count=page_json.get("count"),
+            limit=page_json.get("limit"),
+            offset=page_json.get("offset"),
+            items=[
+                self.record_type.from_json(device_json)
+                for device_json in page_json.get("items") or []
+            ],
+        )
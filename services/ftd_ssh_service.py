@@ -0,0 +1,56 @@
+import time
+
+import paramiko
+
+from models.ftd_ssh_target import FtdSshTarget
+
+FTD_CLI_PROMPT = "> "
+SUCCESS_MESSAGE = "Manager successfully configured"
+
+
+class FtdSshService:
+    """Pastes `configure manager add ...` CLI keys into FTD terminals over SSH, so
+    non-ZTP onboarding does not need someone at the console."""
+
+    def __init__(
+        self, connect_timeout_seconds: float = 15, command_timeout_seconds: float = 60
+    ):
+        self.connect_timeout_seconds = connect_timeout_seconds
+        self.command_timeout_seconds = command_timeout_seconds
+
+    def push_cli_key(self, ssh_target: FtdSshTarget, cli_key: str) -> None:
+        with paramiko.SSHClient() as ssh_client:
+            # the FTDs being onboarded are freshly deployed, so their host keys
+            # cannot be known in advance
+            ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            ssh_client.connect(
+                hostname=ssh_target.address,
+                port=ssh_target.port,
+                username=ssh_target.username,
+                password=ssh_target.password,
+                timeout=self.connect_timeout_seconds,
+                look_for_keys=False,
+                allow_agent=False,
+            )
+            # the FTD CLI (clish) only accepts commands on an interactive shell
+            with ssh_client.invoke_shell() as shell:
+                shell.settimeout(self.command_timeout_seconds)
+                self._read_until_prompt(shell)
+                shell.send(f"{cli_key}\n")
+                output = self._read_until_prompt(shell)
+        if SUCCESS_MESSAGE not in output:
+            raise RuntimeError(
+                f"FTD {ssh_target.address} did not accept the CLI key: {output.strip()}"
+            )
+
+    def _read_until_prompt(self, shell: paramiko.Channel) -> str:
+        output = ""
+        deadline = time.monotonic() + self.command_timeout_seconds
+        while not output.rstrip(" ").endswith(FTD_CLI_PROMPT.rstrip(" ")):
+            if time.monotonic() > deadline:
+                raise TimeoutError("Timed out waiting for the FTD CLI prompt")
+            chunk = shell.recv(4096)
+            if not chunk:
+                raise RuntimeError("The FTD closed the SSH session")
+            output += chunk.decode("utf-8", errors="replace")
+        return output
@@ -1,8 +1,19 @@
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
-import pyperclip
-import questionary
 from cdo_sdk_python import (
+    AsaCreateOrUpdateInput,
+    ConnectorType,
     InventoryApi,
     ApiClient,
     FtdCreateOrUpdateInput,
@@ -10,42 +21,190 @@ from cdo_sdk_python import (
     CdoTransaction,
     Device,
     FtdRegistrationInput,
-    DevicePage,
 )
+from cdo_sdk_python.models.cdo_transaction_status import CdoTransactionStatus
 from rich.console import Console
-from rich.progress import SpinnerColumn, TextColumn, Progress, TaskID
+from rich.progress import (
+    SpinnerColumn,
+    TextColumn,
+    Progress,
+    TaskID,
+    BarColumn,
+    MofNCompleteColumn,
+)
 
+from models.ftd_ssh_target import FtdSshTarget
+from models.onboarding_result import OnboardingResult
+from services.device_name_resolver import DeviceNameResolver
+from services.device_page_iterator import DevicePageIterator, MAX_PAGE_SIZE
+from services.device_projection import (
+    ProjectedDevicePageIterator,
+    get_device_record_type,
+)
+from services.ftd_ssh_service import FtdSshService
+from services.onboarding_journal import (
+    OnboardingJournal,
+    CREATE_SUBMITTED,
+    CREATED,
+    KEY_PUSHED,
+    REGISTER_SUBMITTED,
+    ZTP_ONBOARD_SUBMITTED,
+    REGISTERED,
+    FAILED,
+)
+from services.inventory_cache_service import InventoryCacheService
+from services.inventory_index import InventoryIndex
 from services.transaction_service import TransactionService
+from utils.concurrency import bounded_submit, keyed_bounded_submit
+
+T = TypeVar("T")
 
 
 class InventoryApiService:
-    def __init__(self, api_client: ApiClient):
+    def __init__(
+        self,
+        api_client: ApiClient,
+        inventory_cache: Optional[InventoryCacheService] = None,
+    ):
         self.api_client = api_client
         self.inventory_api = InventoryApi(api_client)
         self.transaction_service = TransactionService(api_client)
+        self.inventory_cache = inventory_cache
+        self.device_name_resolver = DeviceNameResolver(self.inventory_api)
         self.console = Console()
 
-    def onboard_ftd_device(self, ftd_input: FtdCreateOrUpdateInput):
-        device: Device = self.create_ftd_device(ftd_input)
-        pyperclip.copy(device.cd_fmc_info.cli_key)
-        self.console.print(
-            "The CLI key below has been added to your clipboard. Paste it into the FTD terminal:"
-            f"\n{'=' * 10}\n"
-            f"{device.cd_fmc_info.cli_key}"
-            f"\n{'=' * 10}"
+    def iter_devices(
+        self,
+        q: Optional[str] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        parallel_workers: int = 1,
+    ) -> Iterator[Device]:
+        if q is None and self._is_cache_fresh():
+            return iter(self.inventory_cache.get_devices())
+        devices = iter(
+            DevicePageIterator(
+                self.inventory_api,
+                q=q,
+                page_size=page_size,
+                parallel_workers=parallel_workers,
+            )
+        )
+        if q is None and self.inventory_cache is not None:
+            return self.inventory_cache.iter_refreshing(devices)
+        return devices
+
+    def iter_device_records(
+        self,
+        fields: Iterable[str],
+        q: Optional[str] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        parallel_workers: int = 1,
+    ) -> Iterator[tuple]:
+        """Like `iter_devices`, but yields compact records holding only `fields` (see
+        `get_device_record_type`). Pages fetched this way do not refresh the cache,
+        since the records are not full devices."""
+        if q is None and self._is_cache_fresh():
+            record_type = get_device_record_type(fields)
+            return (
+                record_type.from_json(device_json)
+                for device_json in self.inventory_cache.get_device_jsons()
+            )
+        return iter(
+            ProjectedDevicePageIterator(
+                self.inventory_api,
+                fields,
+                q=q,
+                page_size=page_size,
+                parallel_workers=parallel_workers,
+            )
+        )
+
+    def get_inventory_index(self) -> InventoryIndex:
+        return InventoryIndex.from_devices(
+            self.iter_device_records(["name", "serial", "chassis_serial"])
         )
-        try:
-            while True:
-                answer = questionary.confirm(
-                    "Have you pasted the CLI key into the FTD terminal?", default=False
-                ).ask()
-                if answer:
-                    break
-        except KeyboardInterrupt:
-            sys.exit(1)
-        return self.register_ftd_device_with_scc(device)
-
-    def create_ftd_device(self, ftd_input: FtdCreateOrUpdateInput) -> Device:
+
+    def get_device(self, device_uid: str) -> Device:
+        if self._is_cache_fresh():
+            device = self.inventory_cache.get_device(device_uid)
+            if device is not None:
+                return device
+        return self._cache_device(self.inventory_api.get_device(device_uid=device_uid))
+
+    def onboard_ftd_device(
+        self,
+        ftd_input: FtdCreateOrUpdateInput,
+        journal: Optional[OnboardingJournal] = None,
+    ) -> Device:
+        """Onboard an FTD whose CLI key a human pastes into the FTD terminal. With a
+        journal, each step is recorded (transactions before they are waited on), so a
+        resumed run picks up from the last step the FTD reached."""
+        # only the interactive flow needs these, so keep them off the start-up path
+        import pyperclip
+        import questionary
+
+        entry = journal.get(ftd_input.name) if journal else None
+        state = entry.state if entry else None
+        if state in [None, CREATE_SUBMITTED]:
+            device: Device = self.create_ftd_device(ftd_input, journal)
+            state = CREATED
+        else:
+            device = self.get_device(entry.device_uid)
+        if state == CREATED:
+            pyperclip.copy(device.cd_fmc_info.cli_key)
+            self.console.print(
+                "The CLI key below has been added to your clipboard. Paste it into the FTD terminal:"
+                f"\n{'=' * 10}\n"
+                f"{device.cd_fmc_info.cli_key}"
+                f"\n{'=' * 10}"
+            )
+            try:
+                while True:
+                    answer = questionary.confirm(
+                        "Have you pasted the CLI key into the FTD terminal?",
+                        default=False,
+                    ).ask()
+                    if answer:
+                        break
+            except KeyboardInterrupt:
+                sys.exit(1)
+            self._record(journal, ftd_input.name, KEY_PUSHED)
+        device = self.register_ftd_device_with_scc(device, journal)
+        self._record(journal, ftd_input.name, REGISTERED, device_uid=device.uid)
+        return device
+
+    def onboard_ftd_devices(
+        self,
+        ftd_inputs: Iterable[FtdCreateOrUpdateInput],
+        journal: Optional[OnboardingJournal] = None,
+    ) -> List[OnboardingResult]:
+        """Onboard FTDs one at a time with `onboard_ftd_device`. An FTD that fails is
+        reported in its result, and the rest are still onboarded."""
+        results: List[OnboardingResult] = []
+        if journal is not None:
+            ftd_inputs = self._skip_finished(
+                ftd_inputs, lambda ftd_input: ftd_input.name, journal, results
+            )
+        for ftd_input in ftd_inputs:
+            try:
+                result = OnboardingResult(
+                    name=ftd_input.name,
+                    device=self.onboard_ftd_device(ftd_input, journal),
+                )
+            except Exception as e:
+                result = OnboardingResult(name=ftd_input.name, error=str(e))
+                self._record(journal, result.name, FAILED, error=result.error)
+                self.console.print(
+                    f"[red]Failed to onboard {result.name}: {result.error}[/red]"
+                )
+            results.append(result)
+        return results
+
+    def create_ftd_device(
+        self,
+        ftd_input: FtdCreateOrUpdateInput,
+        journal: Optional[OnboardingJournal] = None,
+    ) -> Device:
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -55,14 +214,21 @@ class InventoryApiService:
                 f"Generating configure manager CLI commands for FTD {ftd_input.name}...",
                 start=True,
             )
-            transaction: CdoTransaction = self.inventory_api.create_ftd_device(
-                ftd_input
-            )
-            return self._get_device_after_transaction_finished(
-                transaction, progress, create_ftd_task_id
-            )
+            try:
+                device = self._run_journaled_transaction(
+                    journal,
+                    ftd_input.name,
+                    CREATE_SUBMITTED,
+                    lambda: self.inventory_api.create_ftd_device(ftd_input),
+                )
+            finally:
+                progress.stop_task(task_id=create_ftd_task_id)
+        self._record(journal, ftd_input.name, CREATED, device_uid=device.uid)
+        return device
 
-    def register_ftd_device_with_scc(self, device: Device) -> Device:
+    def register_ftd_device_with_scc(
+        self, device: Device, journal: Optional[OnboardingJournal] = None
+    ) -> Device:
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -72,16 +238,21 @@ class InventoryApiService:
                 f"Registering FTD {device.name} with Security Cloud Control...",
                 start=True,
             )
-            transaction: CdoTransaction = (
-                self.inventory_api.finish_onboarding_ftd_device(
-                    FtdRegistrationInput(ftd_uid=device.uid)
+            try:
+                return self._run_journaled_transaction(
+                    journal,
+                    device.name,
+                    REGISTER_SUBMITTED,
+                    lambda: self.inventory_api.finish_onboarding_ftd_device(
+                        FtdRegistrationInput(ftd_uid=device.uid)
+                    ),
                 )
-            )
-            return self._get_device_after_transaction_finished(
-                transaction, progress, register_ftd_task_id
-            )
+            finally:
+                progress.stop_task(task_id=register_ftd_task_id)
 
-    def onboard_ftd_ztp_device(self, ztp_onboarding_input: ZtpOnboardingInput):
+    def onboard_ftd_ztp_device(
+        self, ztp_onboarding_input: ZtpOnboardingInput
+    ) -> Device:
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -90,44 +261,275 @@ class InventoryApiService:
             onboard_ftd_task_id: TaskID = progress.add_task(
                 f"Onboarding FTD {ztp_onboarding_input.name}...", start=True
             )
-            transaction: CdoTransaction = (
-                self.inventory_api.onboard_ftd_device_using_ztp(ztp_onboarding_input)
-            )
             try:
-                self.transaction_service.wait_for_transaction_to_finish(
-                    transaction_uid=transaction.transaction_uid
-                )
-                # workaround for https://jira-eng-rtp3.cisco.com/jira/browse/LH-87581
-                devicePage: DevicePage = self.inventory_api.get_devices(
-                    q=f"name:{ztp_onboarding_input.name}"
-                )
-                if len(devicePage.items) != 1:
-                    raise RuntimeError(
-                        f"Could not find device with name {ztp_onboarding_input.name}"
-                    )
+                return self._onboard_ftd_ztp_device(ztp_onboarding_input)
             except RuntimeError as e:
                 progress.update(task_id=onboard_ftd_task_id, description=f"Error:{e}")
-                sys.exit(1)
+                raise
             finally:
                 progress.stop_task(task_id=onboard_ftd_task_id)
-            return devicePage.items[0]
 
-    def _get_device_after_transaction_finished(
-        self, transaction: CdoTransaction, progress: Progress, task_id: TaskID
-    ) -> Device:
-        try:
-            finished_transaction: CdoTransaction = (
-                self.transaction_service.wait_for_transaction_to_finish(
-                    transaction_uid=transaction.transaction_uid
+    def onboard_ftd_ztp_devices(
+        self,
+        ztp_onboarding_inputs: Iterable[ZtpOnboardingInput],
+        max_in_flight: int,
+        journal: Optional[OnboardingJournal] = None,
+    ) -> List[OnboardingResult]:
+        def onboard_ftd_ztp_device(ztp_onboarding_input: ZtpOnboardingInput) -> Device:
+            return self._onboard_ftd_ztp_device(ztp_onboarding_input, journal)
+
+        return self._onboard_concurrently(
+            "Onboarding FTDs using ZTP...",
+            ztp_onboarding_inputs,
+            lambda ztp_onboarding_input: ztp_onboarding_input.name,
+            onboard_ftd_ztp_device,
+            max_in_flight,
+            journal,
+        )
+
+    def onboard_ftd_devices_headless(
+        self,
+        ftds: Iterable[Tuple[FtdCreateOrUpdateInput, FtdSshTarget]],
+        ftd_ssh_service: FtdSshService,
+        max_in_flight: int,
+        journal: Optional[OnboardingJournal] = None,
+    ) -> List[OnboardingResult]:
+        """Onboard FTDs without a human at the console: each worker creates the device,
+        pastes its CLI key into the FTD over SSH and registers it, so the three steps
+        overlap across devices. With a journal, each FTD picks up from the last step
+        it reached in a previous run."""
+
+        def onboard_ftd_device_headless(
+            ftd: Tuple[FtdCreateOrUpdateInput, FtdSshTarget],
+        ) -> Device:
+            ftd_input, ssh_target = ftd
+            entry = journal.get(ftd_input.name) if journal else None
+            state = entry.state if entry else None
+            if state in [None, CREATE_SUBMITTED]:
+                device = self._run_journaled_transaction(
+                    journal,
+                    ftd_input.name,
+                    CREATE_SUBMITTED,
+                    lambda: self.inventory_api.create_ftd_device(ftd_input),
+                )
+                self._record(journal, ftd_input.name, CREATED, device_uid=device.uid)
+                state = CREATED
+            else:
+                device = self.get_device(entry.device_uid)
+            if state == CREATED:
+                ftd_ssh_service.push_cli_key(ssh_target, device.cd_fmc_info.cli_key)
+                self._record(journal, ftd_input.name, KEY_PUSHED)
+            device = self._run_journaled_transaction(
+                journal,
+                ftd_input.name,
+                REGISTER_SUBMITTED,
+                lambda: self.inventory_api.finish_onboarding_ftd_device(
+                    FtdRegistrationInput(ftd_uid=device.uid)
+                ),
+            )
+            self._record(journal, ftd_input.name, REGISTERED, device_uid=device.uid)
+            return device
+
+        return self._onboard_concurrently(
+            "Onboarding FTDs...",
+            ftds,
+            lambda ftd: ftd[0].name,
+            onboard_ftd_device_headless,
+            max_in_flight,
+            journal,
+        )
+
+    def onboard_asa_devices(
+        self,
+        asa_inputs: Iterable[AsaCreateOrUpdateInput],
+        max_in_flight: int,
+        max_in_flight_per_sdc: int,
+        max_in_flight_cdg: int,
+        default_sdc_name: Optional[str] = None,
+    ) -> List[OnboardingResult]:
+        """Onboard ASAs concurrently, with at most `max_in_flight_per_sdc` onboarding
+        through any one SDC and `max_in_flight_cdg` through the CDG at a time, since
+        the connector does the handshake with each ASA. ASAs that do not name an SDC
+        count against `default_sdc_name`, the SDC they onboard through."""
+
+        def get_connector(
+            asa_input: AsaCreateOrUpdateInput,
+        ) -> Tuple[str, Optional[str]]:
+            connector_type = ConnectorType(asa_input.connector_type).value
+            if connector_type == ConnectorType.CDG.value:
+                return connector_type, None
+            return connector_type, asa_input.connector_name or default_sdc_name
+
+        def get_max_in_flight_for_connector(
+            connector: Tuple[str, Optional[str]],
+        ) -> int:
+            if connector[0] == ConnectorType.CDG.value:
+                return max_in_flight_cdg
+            return max_in_flight_per_sdc
+
+        def onboard_asa_device(asa_input: AsaCreateOrUpdateInput) -> Device:
+            return self._wait_for_device(
+                self.inventory_api.onboard_asa_device(
+                    asa_create_or_update_input=asa_input
+                )
+            )
+
+        return self._onboard_concurrently(
+            "Onboarding ASAs...",
+            asa_inputs,
+            lambda asa_input: asa_input.name,
+            onboard_asa_device,
+            max_in_flight,
+            get_key=get_connector,
+            get_max_in_flight_for_key=get_max_in_flight_for_connector,
+        )
+
+    def _onboard_concurrently(
+        self,
+        description: str,
+        items: Iterable[T],
+        get_name: Callable[[T], str],
+        onboard: Callable[[T], Device],
+        max_in_flight: int,
+        journal: Optional[OnboardingJournal] = None,
+        get_key: Optional[Callable[[T], Hashable]] = None,
+        get_max_in_flight_for_key: Optional[Callable[[Hashable], int]] = None,
+    ) -> List[OnboardingResult]:
+        results: List[OnboardingResult] = []
+        if journal is not None:
+            items = self._skip_finished(items, get_name, journal, results)
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            transient=True,
+        ) as progress, ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            onboard_task_id: TaskID = progress.add_task(description, total=None)
+            if get_key is None:
+                completed = bounded_submit(executor, onboard, items, max_in_flight)
+            else:
+                completed = keyed_bounded_submit(
+                    executor,
+                    onboard,
+                    items,
+                    max_in_flight,
+                    get_key,
+                    get_max_in_flight_for_key,
                 )
+            for item, future in completed:
+                try:
+                    result = OnboardingResult(
+                        name=get_name(item), device=future.result()
+                    )
+                except Exception as e:
+                    result = OnboardingResult(name=get_name(item), error=str(e))
+                    self._record(journal, result.name, FAILED, error=result.error)
+                    progress.console.print(
+                        f"[red]Failed to onboard {result.name}: {result.error}[/red]"
+                    )
+                results.append(result)
+                progress.advance(onboard_task_id)
+        return results
+
+    @staticmethod
+    def _skip_finished(
+        items: Iterable[T],
+        get_name: Callable[[T], str],
+        journal: OnboardingJournal,
+        results: List[OnboardingResult],
+    ) -> Iterator[T]:
+        # FTDs onboarded by a previous run are left alone, but still counted
+        for item in items:
+            name = get_name(item)
+            if journal.is_finished(name):
+                results.append(OnboardingResult(name=name, skipped=True))
+            else:
+                yield item
+
+    def _onboard_ftd_ztp_device(
+        self,
+        ztp_onboarding_input: ZtpOnboardingInput,
+        journal: Optional[OnboardingJournal] = None,
+    ) -> Device:
+        name = ztp_onboarding_input.name
+        self._wait_for_journaled_transaction(
+            journal,
+            name,
+            ZTP_ONBOARD_SUBMITTED,
+            lambda: self.inventory_api.onboard_ftd_device_using_ztp(
+                ztp_onboarding_input
+            ),
+        )
+        # workaround for https://jira-eng-rtp3.cisco.com/jira/browse/LH-87581
+        # names are resolved in batches shared with the other onboarding workers
+        device = self._cache_device(self.device_name_resolver.get_device(name))
+        self._record(journal, name, REGISTERED, device_uid=device.uid)
+        return device
+
+    def _run_journaled_transaction(
+        self,
+        journal: Optional[OnboardingJournal],
+        name: str,
+        submitted_state: str,
+        submit: Callable[[], CdoTransaction],
+    ) -> Device:
+        transaction = self._wait_for_journaled_transaction(
+            journal, name, submitted_state, submit
+        )
+        return self._cache_device(
+            self.inventory_api.get_device(device_uid=transaction.entity_uid)
+        )
+
+    def _wait_for_journaled_transaction(
+        self,
+        journal: Optional[OnboardingJournal],
+        name: str,
+        submitted_state: str,
+        submit: Callable[[], CdoTransaction],
+    ) -> CdoTransaction:
+        """Wait for the transaction a previous run submitted for this step, or submit
+        it if there is none (or it failed), journaling its UID before waiting on it."""
+        entry = journal.get(name) if journal else None
+        transaction_uid = (
+            entry.transaction_uid
+            if entry is not None and entry.state == submitted_state
+            else None
+        )
+        if transaction_uid is None or self._has_transaction_failed(transaction_uid):
+            transaction_uid = submit().transaction_uid
+            self._record(
+                journal, name, submitted_state, transaction_uid=transaction_uid
             )
-            device: Device = self.inventory_api.get_device(
-                device_uid=finished_transaction.entity_uid
+        return self.transaction_service.wait_for_transaction_to_finish(
+            transaction_uid=transaction_uid
+        )
+
+    def _has_transaction_failed(self, transaction_uid: str) -> bool:
+        transaction: CdoTransaction = (
+            self.transaction_service.transactions_api.get_transaction(transaction_uid)
+        )
+        return transaction.cdo_transaction_status == CdoTransactionStatus.ERROR
+
+    @staticmethod
+    def _record(journal: Optional[OnboardingJournal], name: str, state: str, **fields):
+        if journal is not None:
+            journal.record(name, state, **fields)
+
+    def _wait_for_device(self, transaction: CdoTransaction) -> Device:
+        finished_transaction: CdoTransaction = (
+            self.transaction_service.wait_for_transaction_to_finish(
+                transaction_uid=transaction.transaction_uid
             )
-        except RuntimeError as e:
-            progress.update(task_id=task_id, description=f"Error:{e}")
-            sys.exit(1)
-        finally:
-            progress.stop_task(task_id=task_id)
+        )
+        return self._cache_device(
+            self.inventory_api.get_device(device_uid=finished_transaction.entity_uid)
+        )
+
+    def _is_cache_fresh(self) -> bool:
+        return self.inventory_cache is not None and self.inventory_cache.is_fresh()
 
+    def _cache_device(self, device: Device) -> Device:
+        if self.inventory_cache is not None:
+            self.inventory_cache.upsert_device(device)
         return device
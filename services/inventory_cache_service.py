@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Generator, Iterable, List, Optional
+
+from cdo_sdk_python import Device
+
+from utils.cache_dir import get_user_cache_dir
+
+DEFAULT_TTL_SECONDS = 15 * 60
+_REFRESH_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (
+    tenant TEXT NOT NULL,
+    region TEXT NOT NULL,
+    uid TEXT NOT NULL,
+    name TEXT,
+    device_type TEXT,
+    device_json TEXT NOT NULL,
+    device_hash TEXT NOT NULL,
+    PRIMARY KEY (tenant, region, uid)
+);
+CREATE INDEX IF NOT EXISTS devices_by_name ON devices (tenant, region, name);
+CREATE INDEX IF NOT EXISTS devices_by_type ON devices (tenant, region, device_type);
+CREATE TABLE IF NOT EXISTS snapshots (
+    tenant TEXT NOT NULL,
+    region TEXT NOT NULL,
+    refreshed_at REAL NOT NULL,
+    PRIMARY KEY (tenant, region)
+);
+"""
+
+
+class InventoryCacheService:
+    """An on-disk snapshot of a tenant's inventory, stored in SQLite.
+
+    Reads are only served while the snapshot is younger than `ttl_seconds`; devices
+    written through `upsert_device` (e.g. just after onboarding) are visible
+    immediately. Use it as a context manager (or call `close`) to close the
+    database.
+    """
+
+    def __init__(
+        self,
+        tenant: str,
+        region: str,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        cache_file: Optional[str] = None,
+    ):
+        self.tenant = tenant
+        self.region = region
+        self.ttl_seconds = ttl_seconds
+        self.cache_file = cache_file or os.path.join(
+            get_user_cache_dir(), "inventory.sqlite3"
+        )
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.cache_file, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> "InventoryCacheService":
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def is_fresh(self) -> bool:
+        refreshed_at = self.get_refreshed_at()
+        return (
+            refreshed_at is not None and time.time() - refreshed_at < self.ttl_seconds
+        )
+
+    def get_refreshed_at(self) -> Optional[float]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT refreshed_at FROM snapshots WHERE tenant = ? AND region = ?",
+                (self.tenant, self.region),
+            ).fetchone()
+        return row[0] if row else None
+
+    def refresh(self, devices: Iterable[Device]) -> int:
+        """Bring the snapshot in line with `devices`, rewriting only the rows that
+        changed and dropping devices that no longer exist. Returns the number of
+        rows that were inserted, updated or deleted."""
+        refreshing_devices = self.iter_refreshing(devices)
+        while True:
+            try:
+                next(refreshing_devices)
+            except StopIteration as stop:
+                return stop.value
+
+    def iter_refreshing(
+        self, devices: Iterable[Device]
+    ) -> Generator[Device, None, int]:
+        """Like `refresh`, but yields each device as it is written, so a caller can
+        stream a full crawl to its own output while the snapshot is updated. The
+        snapshot is only marked fresh once every device has been consumed."""
+        cached_hashes = self.get_device_hashes()
+        changes = 0
+        batch = []
+        for device in devices:
+            row = self._to_row(device)
+            if cached_hashes.pop(device.uid, None) != row[-1]:
+                batch.append(row)
+            if len(batch) >= _REFRESH_BATCH_SIZE:
+                changes += self._write_rows(batch)
+                batch = []
+            yield device
+        changes += self._write_rows(batch)
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM devices WHERE tenant = ? AND region = ? AND uid = ?",
+                [(self.tenant, self.region, uid) for uid in cached_hashes],
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO snapshots (tenant, region, refreshed_at) VALUES (?, ?, ?)",
+                (self.tenant, self.region, time.time()),
+            )
+        return changes + len(cached_hashes)
+
+    def mark_refreshed(self, refreshed_at: float) -> None:
+        """Record that the snapshot matched the inventory as of `refreshed_at`, e.g.
+        after an incremental sync has applied every change up to then."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO snapshots (tenant, region, refreshed_at) VALUES (?, ?, ?)",
+                (self.tenant, self.region, refreshed_at),
+            )
+
+    def get_device_hashes(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(
+                self._connection.execute(
+                    "SELECT uid, device_hash FROM devices WHERE tenant = ? AND region = ?",
+                    (self.tenant, self.region),
+                )
+            )
+
+    def invalidate(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM snapshots WHERE tenant = ? AND region = ?",
+                (self.tenant, self.region),
+            )
+
+    def upsert_device(self, device: Device) -> None:
+        self._write_rows([self._to_row(device)])
+
+    def delete_device(self, device_uid: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM devices WHERE tenant = ? AND region = ? AND uid = ?",
+                (self.tenant, self.region, device_uid),
+            )
+
+    def get_device(self, device_uid: str) -> Optional[Device]:
+        devices = self._query("uid = ?", (device_uid,))
+        return devices[0] if devices else None
+
+    def get_devices(self, device_type: Optional[str] = None) -> List[Device]:
+        if device_type is None:
+            return self._query()
+        return self._query("device_type = ?", (device_type,))
+
+    def get_device_jsons(self) -> List[Dict[str, Any]]:
+        """The cached devices as decoded API JSON, skipping the `Device` models."""
+        return [json.loads(device_json) for device_json in self._query_json()]
+
+    @staticmethod
+    def hash_device(device: Device) -> str:
+        return InventoryCacheService._hash_device_json(device.to_json())
+
+    @staticmethod
+    def _hash_device_json(device_json: str) -> str:
+        return hashlib.sha1(device_json.encode("utf-8")).hexdigest()
+
+    def _to_row(self, device: Device) -> tuple:
+        device_json = device.to_json()
+        return (
+            self.tenant,
+            self.region,
+            device.uid,
+            device.name,
+            json.loads(device_json).get("deviceType"),
+            device_json,
+            self._hash_device_json(device_json),
+        )
+
+    def _write_rows(self, rows: List[tuple]) -> int:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO devices "
+                "(tenant, region, uid, name, device_type, device_json, device_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def _query(
+        self, condition: Optional[str] = None, params: tuple = ()
+    ) -> List[Device]:
+        return [Device.from_json(row) for row in self._query_json(condition, params)]
+
+    def _query_json(
+        self, condition: Optional[str] = None, params: tuple = ()
+    ) -> List[str]:
+        sql = "SELECT device_json FROM devices WHERE tenant = ? AND region = ?"
+        if condition:
+            sql += f" AND {condition}"
+        with self._lock:
+            rows = self._connection.execute(
+                sql + " ORDER BY name", (self.tenant, self.region, *params)
+            ).fetchall()
+        return [row[0] for row in rows]
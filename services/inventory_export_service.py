@@ -0,0 +1,183 @@
+import csv
+import gzip
+import json
+import sys
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Union
+
+from cdo_sdk_python import Device
+
+from services.device_page_iterator import MAX_PAGE_SIZE
+
+EXPORT_FORMATS = ["jsonl", "csv", "parquet"]
+# API (camelCase) field names, as they appear in the exported records
+DEFAULT_EXPORT_FIELDS = [
+    "uid",
+    "name",
+    "deviceType",
+    "connectivityState",
+    "configState",
+    "softwareVersion",
+    "serial",
+    "address",
+]
+# one batch per page of devices, so each page is written as soon as it arrives
+EXPORT_BATCH_SIZE = MAX_PAGE_SIZE
+
+
+def get_export_format(output_file: str) -> Optional[str]:
+    """`devices.csv.gz` -> `csv`, if the extension is one we can write."""
+    extension = output_file.removesuffix(".gz").rsplit(".", 1)[-1]
+    return extension if extension in EXPORT_FORMATS else None
+
+
+class InventoryExportService:
+    """Streams devices to a JSONL, CSV or Parquet file in batches, so that memory
+    stays flat however large the inventory is and output starts with the first
+    page. `fields` picks (and orders) the columns; all fields are exported to JSONL
+    if it is None.
+
+    Every CSV and Parquet column is a string: other values are written as they are
+    in JSON (`true`, `42`, and nested values as JSON text), so all three formats
+    agree. A bad combination of options (Parquet without pyarrow, or to stdout) is
+    reported when the service is created, before any device is fetched."""
+
+    def __init__(
+        self,
+        output_file: str,
+        export_format: str,
+        fields: Optional[List[str]] = None,
+        compress: bool = False,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        if export_format == "parquet":
+            _check_parquet_output(output_file)
+        if export_format != "jsonl" and fields is None:
+            fields = DEFAULT_EXPORT_FIELDS
+        self.output_file = output_file
+        self.export_format = export_format
+        self.fields = fields
+        self.compress = compress
+        self.batch_size = batch_size
+
+    def export(self, devices: Iterable[Union[Device, tuple]]) -> int:
+        writer = self._open_writer()
+        device_count = 0
+        batch: List[Dict[str, Any]] = []
+        try:
+            for device in devices:
+                batch.append(self._to_record(device))
+                if len(batch) >= self.batch_size:
+                    writer.write_batch(batch)
+                    device_count += len(batch)
+                    batch = []
+            if batch:
+                writer.write_batch(batch)
+                device_count += len(batch)
+        finally:
+            writer.close()
+        return device_count
+
+    def _to_record(self, device: Union[Device, tuple]) -> Dict[str, Any]:
+        if isinstance(device, tuple):
+            # a projected record (see `get_device_record_type`), already plain JSON
+            record = device.to_dict()
+        else:
+            record = device.model_dump(mode="json", by_alias=True, exclude_none=True)
+        if self.fields is None:
+            return record
+        return {field: record.get(field) for field in self.fields}
+
+    def _open_writer(self) -> "_BatchWriter":
+        if self.export_format == "parquet":
+            return _ParquetWriter(self.output_file, self.fields, self.compress)
+        if self.output_file == "-":
+            # gzip wraps the binary stream; closing the wrapper leaves stdout open
+            file = (
+                gzip.open(sys.stdout.buffer, mode="wt", newline="")
+                if self.compress
+                else sys.stdout
+            )
+        elif self.compress:
+            file = gzip.open(self.output_file, mode="wt", newline="")
+        else:
+            file = open(self.output_file, mode="w", newline="")
+        if self.export_format == "csv":
+            return _CsvWriter(file, self.fields)
+        return _JsonlWriter(file)
+
+
+class _BatchWriter(ABC):
+    @abstractmethod
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+
+class _JsonlWriter(_BatchWriter):
+    def __init__(self, file: TextIO):
+        self.file = file
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        self.file.write("".join(json.dumps(record) + "\n" for record in records))
+        self.file.flush()
+
+    def close(self) -> None:
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class _CsvWriter(_JsonlWriter):
+    def __init__(self, file: TextIO, fields: List[str]):
+        super().__init__(file)
+        self.writer = csv.DictWriter(file, fieldnames=fields)
+        self.writer.writeheader()
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        self.writer.writerows(_flatten(record) for record in records)
+        self.file.flush()
+
+
+def _check_parquet_output(output_file: str) -> None:
+    if output_file == "-":
+        raise ValueError("Parquet exports cannot be written to stdout.")
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise RuntimeError(
+            "Exporting to Parquet needs the optional pyarrow package (pip install pyarrow)."
+        )
+
+
+class _ParquetWriter(_BatchWriter):
+    def __init__(self, output_file: str, fields: List[str], compress: bool):
+        import pyarrow
+        import pyarrow.parquet
+
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema([(field, pyarrow.string()) for field in fields])
+        # every batch becomes a row group, so nothing is held back until close
+        self.writer = pyarrow.parquet.ParquetWriter(
+            output_file, self.schema, compression="gzip" if compress else "snappy"
+        )
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        records = [_flatten(record) for record in records]
+        self.writer.write_table(
+            self.pyarrow.Table.from_pylist(records, schema=self.schema)
+        )
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def _flatten(record: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    return {
+        field: (value if value is None or isinstance(value, str) else json.dumps(value))
+        for field, value in record.items()
+    }
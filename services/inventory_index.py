@@ -0,0 +1,34 @@
+from typing import Iterable, Optional, Set
+
+
+class InventoryIndex:
+    """The names and serial numbers already in use in the inventory, for checking a
+    batch of devices against before anything is submitted."""
+
+    def __init__(self, names: Set[str], serial_numbers: Set[str]):
+        self.names = names
+        self.serial_numbers = serial_numbers
+
+    @classmethod
+    def from_devices(cls, devices: Iterable) -> "InventoryIndex":
+        """Build the index from `Device`s, or records with `name`, `serial` and
+        `chassis_serial` fields (see `get_device_record_type`)."""
+        names = set()
+        serial_numbers = set()
+        for device in devices:
+            if device.name:
+                names.add(device.name)
+            for serial_number in (device.serial, device.chassis_serial):
+                if serial_number:
+                    serial_numbers.add(normalise_serial_number(serial_number))
+        return cls(names, serial_numbers)
+
+    def has_name(self, name: str) -> bool:
+        return name in self.names
+
+    def has_serial_number(self, serial_number: str) -> bool:
+        return normalise_serial_number(serial_number) in self.serial_numbers
+
+
+def normalise_serial_number(serial_number: Optional[str]) -> Optional[str]:
+    return serial_number.strip().upper() if serial_number else serial_number
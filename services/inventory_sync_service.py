@@ -0,0 +1,156 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Iterator, Optional, Set
+
+from cdo_sdk_python import ApiClient, ChangelogsApi, ChangelogPage, Device, InventoryApi
+from cdo_sdk_python.exceptions import NotFoundException
+
+from models.inventory_change import InventoryChange, ADDED, REMOVED, CHANGED
+from services.device_page_iterator import DevicePageIterator, MAX_PAGE_SIZE
+from services.device_projection import ProjectedDevicePageIterator
+from services.inventory_cache_service import InventoryCacheService
+from utils.cache_dir import get_user_cache_dir
+from utils.concurrency import bounded_submit
+
+INCREMENTAL = "incremental"
+FULL = "full"
+SYNC_SNAPSHOT_FILE_NAME = "inventory_sync.sqlite3"
+
+
+def get_sync_snapshot(tenant: str, region: str) -> InventoryCacheService:
+    """The snapshot that `InventorySyncService` keeps. It is kept apart from the
+    inventory cache that list-devices and export-devices read through, since those
+    refresh their cache without reporting what changed, which would hide those
+    changes from the next sync."""
+    return InventoryCacheService(
+        tenant=tenant,
+        region=region,
+        cache_file=os.path.join(get_user_cache_dir(), SYNC_SNAPSHOT_FILE_NAME),
+    )
+
+
+class InventorySyncService:
+    """Brings the inventory snapshot in `inventory_cache` up to date and reports
+    what changed since the last sync.
+
+    Instead of listing the whole inventory, an incremental sync asks the change log
+    which entities changed since the snapshot was taken (less `overlap_seconds`,
+    for clock skew) and fetches just those devices. It then lists only the UIDs of
+    the devices on the server, and fetches (or removes) any that were added or
+    removed without a change log entry. A full listing is used when there is no
+    snapshot yet.
+
+    `inventory_cache` should be a snapshot only this service writes to (see
+    `get_sync_snapshot`).
+    """
+
+    def __init__(
+        self,
+        api_client: ApiClient,
+        inventory_cache: InventoryCacheService,
+        overlap_seconds: float = 300,
+        max_in_flight: int = 8,
+    ):
+        self.inventory_api = InventoryApi(api_client)
+        self.changelogs_api = ChangelogsApi(api_client)
+        self.inventory_cache = inventory_cache
+        self.overlap_seconds = overlap_seconds
+        self.max_in_flight = max_in_flight
+        self.mode: Optional[str] = None
+
+    def sync(self, full: bool = False) -> Iterator[InventoryChange]:
+        started_at = time.time()
+        last_synced_at = self.inventory_cache.get_refreshed_at()
+        if full or last_synced_at is None:
+            self.mode = FULL
+            yield from self._sync_full()
+        else:
+            self.mode = INCREMENTAL
+            yield from self._sync_changed_devices(
+                self._get_changed_entity_uids(last_synced_at - self.overlap_seconds)
+            )
+            # comparing UIDs, not counts, also catches a device added and another
+            # removed in the same window
+            yield from self._sync_changed_devices(
+                self._get_server_device_uids()
+                ^ set(self.inventory_cache.get_device_hashes())
+            )
+        self.inventory_cache.mark_refreshed(started_at)
+
+    def _get_changed_entity_uids(self, since: float) -> Set[str]:
+        since_iso = (
+            datetime.fromtimestamp(since, tz=timezone.utc)
+            .isoformat(timespec="milliseconds")
+            .replace("+00:00", "Z")
+        )
+        entity_uids: Set[str] = set()
+        offset = 0
+        while True:
+            changelog_page: ChangelogPage = self.changelogs_api.get_changelogs(
+                limit=str(MAX_PAGE_SIZE),
+                offset=str(offset),
+                q=f"lastEventDate:[{since_iso} TO *]",
+            )
+            entity_uids.update(
+                changelog.entity_uid
+                for changelog in changelog_page.items
+                if changelog.entity_uid
+            )
+            offset += len(changelog_page.items)
+            if not changelog_page.items or offset >= changelog_page.count:
+                return entity_uids
+
+    def _sync_changed_devices(self, entity_uids: Set[str]) -> Iterator[InventoryChange]:
+        cached_hashes = self.inventory_cache.get_device_hashes()
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            for device_uid, future in bounded_submit(
+                executor, self._get_device, entity_uids, self.max_in_flight
+            ):
+                device: Optional[Device] = future.result()
+                if device is None:
+                    # change log entities are not all devices; only report removals
+                    # of devices we knew about
+                    if device_uid in cached_hashes:
+                        yield self._remove(device_uid)
+                    continue
+                change = self._apply(device, cached_hashes.get(device_uid))
+                if change is not None:
+                    yield change
+
+    def _sync_full(self) -> Iterator[InventoryChange]:
+        cached_hashes = self.inventory_cache.get_device_hashes()
+        for device in DevicePageIterator(self.inventory_api):
+            change = self._apply(device, cached_hashes.pop(device.uid, None))
+            if change is not None:
+                yield change
+        for device_uid in cached_hashes:
+            yield self._remove(device_uid)
+
+    def _apply(
+        self, device: Device, cached_hash: Optional[str]
+    ) -> Optional[InventoryChange]:
+        if cached_hash == InventoryCacheService.hash_device(device):
+            return None
+        self.inventory_cache.upsert_device(device)
+        return InventoryChange(
+            ADDED if cached_hash is None else CHANGED, device.uid, device
+        )
+
+    def _remove(self, device_uid: str) -> InventoryChange:
+        device = self.inventory_cache.get_device(device_uid)
+        self.inventory_cache.delete_device(device_uid)
+        return InventoryChange(REMOVED, device_uid, device)
+
+    def _get_device(self, device_uid: str) -> Optional[Device]:
+        try:
+            return self.inventory_api.get_device(device_uid=device_uid)
+        except NotFoundException:
+            return None
+
+    def _get_server_device_uids(self) -> Set[str]:
+        return {
+            device.uid
+            for device in ProjectedDevicePageIterator(self.inventory_api, ["uid"])
+        }
@@ -0,0 +1,144 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from models.onboarding_journal_entry import OnboardingJournalEntry
+
+# the steps an FTD goes through, in order. `*_SUBMITTED` states carry the UID of the
+# transaction that was started, so that a resumed run can wait for it instead of
+# starting it again
+CREATE_SUBMITTED = "create_submitted"
+CREATED = "created"
+KEY_PUSHED = "key_pushed"
+REGISTER_SUBMITTED = "register_submitted"
+ZTP_ONBOARD_SUBMITTED = "ztp_onboard_submitted"
+REGISTERED = "registered"
+FAILED = "failed"
+
+
+class OnboardingJournal:
+    """An append-only JSONL record of how far each FTD in a bulk onboarding run got.
+
+    Every record is flushed to the OS as soon as it is written, so a crash of this
+    process never loses it; fsync (which protects against the host going down) is
+    batched to every `fsync_batch_size` records or `fsync_interval_seconds`.
+    A `failed` record keeps the step the FTD had reached, so a resumed run retries
+    from that step rather than from scratch.
+    """
+
+    def __init__(
+        self,
+        journal_file: str,
+        resume: bool = False,
+        fsync_batch_size: int = 32,
+        fsync_interval_seconds: float = 1.0,
+    ):
+        self.journal_file = journal_file
+        self.fsync_batch_size = fsync_batch_size
+        self.fsync_interval_seconds = fsync_interval_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[str, OnboardingJournalEntry] = (
+            self._replay() if resume else {}
+        )
+        self._file = open(journal_file, mode="a" if resume else "w")
+        if resume and self._ends_with_torn_line():
+            self._file.write("\n")
+        self._unsynced_records = 0
+        self._last_synced_at = time.monotonic()
+
+    def __enter__(self) -> "OnboardingJournal":
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.close()
+
+    def get(self, name: str) -> Optional[OnboardingJournalEntry]:
+        with self._lock:
+            return self._entries.get(name)
+
+    def is_finished(self, name: str) -> bool:
+        entry = self.get(name)
+        return entry is not None and entry.state == REGISTERED
+
+    def count_finished(self) -> int:
+        with self._lock:
+            return sum(
+                1 for entry in self._entries.values() if entry.state == REGISTERED
+            )
+
+    def record(
+        self,
+        name: str,
+        state: str,
+        transaction_uid: Optional[str] = None,
+        device_uid: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        record = {
+            "name": name,
+            "state": state,
+            "transaction_uid": transaction_uid,
+            "device_uid": device_uid,
+            "error": error,
+            "recorded_at": time.time(),
+        }
+        line = json.dumps({k: v for k, v in record.items() if v is not None})
+        with self._lock:
+            self._apply(record)
+            self._file.write(line + "\n")
+            self._file.flush()
+            self._unsynced_records += 1
+            if (
+                self._unsynced_records >= self.fsync_batch_size
+                or time.monotonic() - self._last_synced_at
+                >= self.fsync_interval_seconds
+            ):
+                self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+    def _sync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._unsynced_records = 0
+        self._last_synced_at = time.monotonic()
+
+    def _ends_with_torn_line(self) -> bool:
+        with open(self.journal_file, mode="rb") as file:
+            file.seek(0, os.SEEK_END)
+            if file.tell() == 0:
+                return False
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) != b"\n"
+
+    def _replay(self) -> Dict[str, OnboardingJournalEntry]:
+        self._entries = {}
+        try:
+            with open(self.journal_file, mode="r") as file:
+                for line in file:
+                    try:
+                        self._apply(json.loads(line))
+                    except json.JSONDecodeError:
+                        # the last line is torn if we crashed half way through writing it
+                        continue
+        except FileNotFoundError:
+            pass
+        return self._entries
+
+    def _apply(self, record: dict) -> None:
+        entry = self._entries.setdefault(
+            record["name"], OnboardingJournalEntry(record["name"])
+        )
+        if record["state"] == FAILED:
+            entry.error = record.get("error")
+            return
+        entry.state = record["state"]
+        entry.error = None
+        # a submitted transaction is only relevant until the step it belongs to is done
+        entry.transaction_uid = record.get("transaction_uid")
+        entry.device_uid = record.get("device_uid") or entry.device_uid
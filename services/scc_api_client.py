@@ -0,0 +1,93 @@
+import threading
+from typing import Optional
+
+from cdo_sdk_python import ApiClient, Configuration, TransactionsApi, rest
+
+from services.token_cache_service import TokenCacheService
+from services.transaction_poller import TransactionPoller
+from utils.metrics import get_metrics_registry, get_operation_name
+from utils.rate_limiter import (
+    call_with_rate_limit,
+    get_rate_limiter,
+    get_retry_statuses,
+)
+
+
+class SccApiClient(ApiClient):
+    """An `ApiClient` that validates its API token lazily.
+
+    If the token is not already known to be valid, the first real API call doubles
+    as the validation: a 401 raises a `ValueError`, and a successful response
+    records the token in the token cache so later runs can skip validation.
+
+    It also owns the transaction poller its services share, which is shut down when
+    the client is used as a context manager and exits.
+    """
+
+    def __init__(
+        self,
+        configuration: Configuration,
+        token_cache: Optional[TokenCacheService] = None,
+    ):
+        super().__init__(configuration)
+        self.token_cache = token_cache
+        self.is_token_validated = token_cache is None or token_cache.is_validated(
+            configuration.access_token
+        )
+        self.rate_limiter = get_rate_limiter(
+            configuration.host, configuration.access_token
+        )
+        self._transaction_poller: Optional[TransactionPoller] = None
+        self._transaction_poller_lock = threading.Lock()
+
+    def get_transaction_poller(self) -> TransactionPoller:
+        """The poller shared by every `TransactionService` on this client, so that
+        creating services does not start more poll threads."""
+        with self._transaction_poller_lock:
+            if self._transaction_poller is None:
+                self._transaction_poller = TransactionPoller(TransactionsApi(self))
+            return self._transaction_poller
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        with self._transaction_poller_lock:
+            transaction_poller = self._transaction_poller
+            self._transaction_poller = None
+        if transaction_poller is not None:
+            transaction_poller.shutdown()
+        super().__exit__(exc_type, exc_value, traceback)
+
+    def call_api(
+        self,
+        method,
+        url,
+        header_params=None,
+        body=None,
+        post_params=None,
+        _request_timeout=None,
+    ) -> rest.RESTResponse:
+        # every SDK call for this tenant shares one rate limiter, and throttled
+        # calls are retried (see `call_with_rate_limit`); each attempt is timed
+        operation = get_operation_name(method, url)
+        metrics = get_metrics_registry()
+        response_data = call_with_rate_limit(
+            lambda: metrics.time_request(
+                operation,
+                lambda: super(SccApiClient, self).call_api(
+                    method, url, header_params, body, post_params, _request_timeout
+                ),
+                get_status=lambda response: response.status,
+            ),
+            get_status=lambda response: response.status,
+            get_retry_after=lambda response: response.getheader("Retry-After"),
+            discard=lambda response: response.read(),
+            on_retry=lambda: metrics.increment_retries(operation),
+            rate_limiter=self.rate_limiter,
+            retry_statuses=get_retry_statuses(method),
+        )
+        if not self.is_token_validated:
+            if response_data.status == 401:
+                raise ValueError("The provided API token is invalid.")
+            if 200 <= response_data.status < 300:
+                self.is_token_validated = True
+                self.token_cache.remember(self.configuration.access_token)
+        return response_data
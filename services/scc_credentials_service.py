@@ -1,17 +1,31 @@
 # services/scc_credentials_service.py
-import os
-import yaml
+from typing import Optional
+
+from cdo_sdk_python import Configuration
+
+from services.scc_api_client import SccApiClient
+from services.token_cache_service import TokenCacheService
 from services.token_validation_service import TokenValidationService
 from utils.region_mapping import get_scc_url
 
 
 class SccCredentialsService:
-    def __init__(self, region: str, api_token: str):
+    def __init__(
+        self,
+        region: str,
+        api_token: str,
+        token_cache: Optional[TokenCacheService] = None,
+        validate_eagerly: bool = False,
+    ):
         self.region = region
         self.api_token = api_token
         self.base_url = self.map_region_to_base_url()
-        if not TokenValidationService(self.base_url, self.api_token).validate_token():
-            raise ValueError("The provided API token is invalid.")
+        self.token_cache = token_cache or TokenCacheService()
+        self._api_client: Optional[SccApiClient] = None
+        # tokens that are not cached yet are validated by the first real API call
+        # (see SccApiClient), unless eager validation is asked for
+        if validate_eagerly and not self.token_cache.is_validated(self.api_token):
+            self.validate_token()
 
     def map_region_to_base_url(self):
         base_url = get_scc_url(self.region)
@@ -21,3 +35,31 @@ class SccCredentialsService:
 
     def get_credentials(self):
         return self.api_token, self.base_url
+
+    def validate_token(self) -> None:
+        token_info = TokenValidationService(
+            self.base_url, self.api_token
+        ).get_token_info(self.get_api_client())
+        if token_info is None:
+            raise ValueError("The provided API token is invalid.")
+        self.token_cache.remember(
+            self.api_token,
+            expires_at=(
+                token_info.expires_at.timestamp() if token_info.expires_at else None
+            ),
+        )
+        self.get_api_client().is_token_validated = True
+
+    def get_api_client(self, max_connections: Optional[int] = None) -> SccApiClient:
+        """The `ApiClient` for this token and region, built once and shared by every
+        caller. `max_connections` only has an effect on the first call."""
+        if self._api_client is None:
+            configuration = Configuration(
+                host=self.base_url, access_token=self.api_token
+            )
+            if max_connections is not None:
+                configuration.connection_pool_maxsize = max(
+                    configuration.connection_pool_maxsize, max_connections
+                )
+            self._api_client = SccApiClient(configuration, self.token_cache)
+        return self._api_client
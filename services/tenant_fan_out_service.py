@@ -0,0 +1,123 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from cdo_sdk_python import ApiClient
+
+from models.tenant import Tenant
+from services.scc_credentials_service import SccCredentialsService
+
+TenantOperation = Callable[[Tenant, ApiClient], Iterable[Dict[str, Any]]]
+
+_TENANT_FINISHED = object()
+# how often a worker blocked on a full queue checks whether the run was cancelled
+PUT_TIMEOUT_SECONDS = 0.5
+
+
+class _FanOutCancelled(Exception):
+    """The consumer of the records stopped reading them."""
+
+
+class TenantFanOutService:
+    """Runs one operation against many tenants at once and merges what each of them
+    yields into a single stream of records, in the order they are produced.
+
+    At most `max_tenants` tenants run at a time, and at most `max_tenants_per_region`
+    of those in the same region, so one busy region cannot starve the others or
+    trip that region's rate limits.
+    """
+
+    def __init__(self, max_tenants: int = 16, max_tenants_per_region: int = 4):
+        self.max_tenants = max_tenants
+        self.max_tenants_per_region = max_tenants_per_region
+        self._region_semaphores: Dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def run(
+        self, tenants: List[Tenant], operation: TenantOperation
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield `{"tenant", "region", **record}` for every record of every tenant, or
+        `{"tenant", "region", "error"}` if the operation fails for a tenant."""
+        # bounded, so a slow consumer applies back-pressure to the tenants
+        records: queue.Queue = queue.Queue(maxsize=1000)
+        cancelled = threading.Event()
+        tenants = self._interleave_regions(tenants)
+        with ThreadPoolExecutor(max_workers=self.max_tenants) as executor:
+            try:
+                for tenant in tenants:
+                    executor.submit(
+                        self._run_for_tenant, tenant, operation, records, cancelled
+                    )
+                finished_tenants = 0
+                while finished_tenants < len(tenants):
+                    record = records.get()
+                    if record is _TENANT_FINISHED:
+                        finished_tenants += 1
+                    else:
+                        yield record
+            finally:
+                # if the consumer stopped early, release the workers waiting to hand
+                # it records, and do not start the tenants that have not started
+                cancelled.set()
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run_for_tenant(
+        self,
+        tenant: Tenant,
+        operation: TenantOperation,
+        records: queue.Queue,
+        cancelled: threading.Event,
+    ) -> None:
+        tags = {"tenant": tenant.name, "region": tenant.region}
+        try:
+            try:
+                with self._get_region_semaphore(tenant.region):
+                    if cancelled.is_set():
+                        raise _FanOutCancelled()
+                    credentials_service = SccCredentialsService(
+                        region=tenant.region, api_token=tenant.api_token
+                    )
+                    with credentials_service.get_api_client() as api_client:
+                        for record in operation(tenant, api_client):
+                            self._put(records, {**tags, **record}, cancelled)
+            except _FanOutCancelled:
+                raise
+            except Exception as e:
+                self._put(records, {**tags, "error": str(e)}, cancelled)
+            self._put(records, _TENANT_FINISHED, cancelled)
+        except _FanOutCancelled:
+            pass
+
+    @staticmethod
+    def _put(records: queue.Queue, record: Any, cancelled: threading.Event) -> None:
+        while not cancelled.is_set():
+            try:
+                records.put(record, timeout=PUT_TIMEOUT_SECONDS)
+                return
+            except queue.Full:
+                pass
+        raise _FanOutCancelled()
+
+    @staticmethod
+    def _interleave_regions(tenants: List[Tenant]) -> List[Tenant]:
+        # submitting tenants region by region would tie up every worker waiting on
+        # the first region's semaphore while the other regions sit idle
+        tenants_by_region: Dict[str, List[Tenant]] = {}
+        for tenant in tenants:
+            tenants_by_region.setdefault(tenant.region, []).append(tenant)
+        return [
+            tenant
+            for round_of_tenants in itertools.zip_longest(*tenants_by_region.values())
+            for tenant in round_of_tenants
+            if tenant is not None
+        ]
+
+    def _get_region_semaphore(self, region: str) -> threading.Semaphore:
+        with self._lock:
+            if region not in self._region_semaphores:
+                self._region_semaphores[region] = threading.Semaphore(
+                    self.max_tenants_per_region
+                )
+            return self._region_semaphores[region]
@@ -0,0 +1,78 @@
+import base64
+import binascii
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from utils.cache_dir import get_user_cache_dir, write_json_cache_file
+
+# used when the token does not say when it expires
+DEFAULT_TOKEN_TTL_SECONDS = 60 * 60
+
+_file_lock = threading.Lock()
+
+
+class TokenCacheService:
+    """Remembers API tokens that have already been validated, by hash, until they
+    expire. The tokens themselves are never written to disk."""
+
+    def __init__(self, cache_file: Optional[str] = None):
+        self.cache_file = cache_file or os.path.join(
+            get_user_cache_dir(), "validated_tokens.json"
+        )
+
+    def is_validated(self, api_token: str) -> bool:
+        with _file_lock:
+            expires_at = self._read().get(self._hash(api_token))
+        return expires_at is not None and expires_at > time.time()
+
+    def remember(self, api_token: str, expires_at: Optional[float] = None) -> None:
+        if expires_at is None:
+            expires_at = get_token_expiry(api_token) or (
+                time.time() + DEFAULT_TOKEN_TTL_SECONDS
+            )
+        with _file_lock:
+            now = time.time()
+            entries = {
+                token_hash: token_expires_at
+                for token_hash, token_expires_at in self._read().items()
+                if token_expires_at > now
+            }
+            entries[self._hash(api_token)] = expires_at
+            self._write(entries)
+
+    def forget(self, api_token: str) -> None:
+        with _file_lock:
+            entries = self._read()
+            if entries.pop(self._hash(api_token), None) is not None:
+                self._write(entries)
+
+    @staticmethod
+    def _hash(api_token: str) -> str:
+        return hashlib.sha256(api_token.encode("utf-8")).hexdigest()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.cache_file, mode="r") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write(self, entries: dict) -> None:
+        write_json_cache_file(self.cache_file, entries)
+
+
+def get_token_expiry(api_token: str) -> Optional[float]:
+    """Read the `exp` claim of a JWT without verifying it; returns None if the token
+    is not a JWT or has no expiry."""
+    try:
+        payload = api_token.split(".")[1]
+        claims = json.loads(
+            base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        )
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError, binascii.Error):
+        return None
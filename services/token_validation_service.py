@@ -1,4 +1,12 @@
-from cdo_sdk_python import Configuration, UsersApi, ApiClient, ApiException
+from typing import Optional
+
+from cdo_sdk_python import (
+    Configuration,
+    UsersApi,
+    ApiClient,
+    ApiException,
+    CdoTokenInfo,
+)
 
 
 class TokenValidationService:
@@ -6,12 +14,21 @@ class TokenValidationService:
         self.base_url = base_url
         self.api_token = api_token
 
-    def validate_token(self):
+    def validate_token(self, api_client: Optional[ApiClient] = None):
+        return self.get_token_info(api_client) is not None
+
+    def get_token_info(
+        self, api_client: Optional[ApiClient] = None
+    ) -> Optional[CdoTokenInfo]:
+        if api_client is not None:
+            return self._get_token_info(api_client)
         configuration = Configuration(host=self.base_url, access_token=self.api_token)
         with ApiClient(configuration) as api_client:
-            api_instance = UsersApi(api_client)
-            try:
-                api_instance.get_token()
-            except ApiException as e:
-                return False
-        return True
+            return self._get_token_info(api_client)
+
+    @staticmethod
+    def _get_token_info(api_client: ApiClient) -> Optional[CdoTokenInfo]:
+        try:
+            return UsersApi(api_client).get_token()
+        except ApiException as e:
+            return None
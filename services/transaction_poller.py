@@ -0,0 +1,192 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from cdo_sdk_python import TransactionsApi, CdoTransaction
+from cdo_sdk_python.models.cdo_transaction_status import CdoTransactionStatus
+from cdo_sdk_python.models.cdo_transaction_type import CdoTransactionType
+
+from utils.backoff import BackoffPolicy
+
+DEFAULT_BACKOFF_POLICY = BackoffPolicy(initial_delay_seconds=2, max_delay_seconds=30)
+BACKOFF_POLICIES: Dict[str, BackoffPolicy] = {
+    CdoTransactionType.SEND_AI_ASSISTANT_MESSAGE.value: BackoffPolicy(1, 5),
+    CdoTransactionType.CREATE_FTD.value: BackoffPolicy(2, 15),
+    CdoTransactionType.ONBOARD_ASA.value: BackoffPolicy(3, 30),
+    CdoTransactionType.REGISTER_FTD.value: BackoffPolicy(10, 60),
+    CdoTransactionType.ONBOARD_FTD_ZTP.value: BackoffPolicy(10, 60),
+}
+
+TransactionCallback = Callable[[CdoTransaction], None]
+
+logger = logging.getLogger(__name__)
+
+
+class TransactionFailedError(RuntimeError):
+    """A transaction that finished in the ERROR state."""
+
+
+class _TrackedTransaction:
+    def __init__(self, transaction_uid: str):
+        self.transaction_uid = transaction_uid
+        self.future: Future = Future()
+        self.callbacks: List[TransactionCallback] = []
+        self.attempt = 0
+
+
+class TransactionPoller:
+    """Polls any number of transactions from a single scheduler thread.
+
+    Each transaction is polled on its own exponential backoff schedule (chosen by
+    transaction type), and the future returned by `submit` resolves as soon as the
+    transaction reaches DONE or ERROR. The scheduler thread only runs while there
+    are transactions to poll; `shutdown` also stops the poll workers.
+    """
+
+    def __init__(
+        self, transactions_api: TransactionsApi, max_concurrent_polls: int = 4
+    ):
+        self.transactions_api = transactions_api
+        self._poll_executor = ThreadPoolExecutor(max_workers=max_concurrent_polls)
+        self._condition = threading.Condition()
+        self._schedule: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._tracked: Dict[str, _TrackedTransaction] = {}
+        self._scheduler_thread: Optional[threading.Thread] = None
+        self._is_shut_down = False
+
+    def submit(
+        self, transaction_uid: str, on_update: Optional[TransactionCallback] = None
+    ) -> Future:
+        with self._condition:
+            if self._is_shut_down:
+                raise RuntimeError("The transaction poller has been shut down")
+            tracked = self._tracked.get(transaction_uid)
+            if tracked is None:
+                tracked = _TrackedTransaction(transaction_uid)
+                self._tracked[transaction_uid] = tracked
+                self._schedule_poll(transaction_uid, delay_seconds=0)
+            if on_update is not None:
+                tracked.callbacks.append(on_update)
+            self._ensure_scheduler_started()
+            return tracked.future
+
+    def wait(
+        self, transaction_uid: str, on_update: Optional[TransactionCallback] = None
+    ) -> CdoTransaction:
+        return self.submit(transaction_uid, on_update).result()
+
+    def shutdown(self) -> None:
+        """Stop polling. Transactions still being waited on fail with a RuntimeError."""
+        with self._condition:
+            self._is_shut_down = True
+            tracked_transactions = list(self._tracked.values())
+            self._tracked.clear()
+            self._schedule.clear()
+            self._condition.notify()
+        self._poll_executor.shutdown(wait=False)
+        for tracked in tracked_transactions:
+            if not tracked.future.done():
+                tracked.future.set_exception(
+                    RuntimeError("The transaction poller has been shut down")
+                )
+
+    def _ensure_scheduler_started(self) -> None:
+        if self._scheduler_thread is None:
+            self._scheduler_thread = threading.Thread(
+                target=self._run_scheduler, name="transaction-poller", daemon=True
+            )
+            self._scheduler_thread.start()
+
+    def _schedule_poll(self, transaction_uid: str, delay_seconds: float) -> None:
+        heapq.heappush(
+            self._schedule,
+            (time.monotonic() + delay_seconds, next(self._sequence), transaction_uid),
+        )
+        self._condition.notify()
+
+    def _run_scheduler(self) -> None:
+        while True:
+            with self._condition:
+                while not self._schedule:
+                    # exit once nothing is left to poll (a transaction being polled
+                    # right now is still tracked), so idle pollers hold no thread
+                    if self._is_shut_down or not self._tracked:
+                        self._scheduler_thread = None
+                        return
+                    self._condition.wait()
+                due_time, _, transaction_uid = self._schedule[0]
+                now = time.monotonic()
+                if due_time > now:
+                    self._condition.wait(timeout=due_time - now)
+                    continue
+                heapq.heappop(self._schedule)
+            try:
+                self._poll_executor.submit(self._poll, transaction_uid)
+            except RuntimeError:
+                # shut down while this poll was due
+                return
+
+    def _poll(self, transaction_uid: str) -> None:
+        with self._condition:
+            tracked = self._tracked.get(transaction_uid)
+        if tracked is None:
+            return
+        try:
+            transaction: CdoTransaction = self.transactions_api.get_transaction(
+                transaction_uid
+            )
+        except Exception as e:
+            self._finish(tracked, exception=e)
+            return
+
+        for callback in tracked.callbacks:
+            # a failing callback must not stop the transaction from being resolved
+            try:
+                callback(transaction)
+            except Exception:
+                logger.exception(
+                    "Update callback for transaction %s failed", transaction_uid
+                )
+
+        if transaction.cdo_transaction_status == CdoTransactionStatus.ERROR:
+            self._finish(
+                tracked,
+                exception=TransactionFailedError(
+                    f"Transaction {transaction_uid} failed: {transaction.transaction_details}"
+                ),
+            )
+        elif transaction.cdo_transaction_status == CdoTransactionStatus.DONE:
+            self._finish(tracked, transaction=transaction)
+        else:
+            policy = BACKOFF_POLICIES.get(
+                transaction.transaction_type, DEFAULT_BACKOFF_POLICY
+            )
+            with self._condition:
+                if self._is_shut_down:
+                    return
+                self._schedule_poll(
+                    transaction_uid, policy.get_delay_seconds(tracked.attempt)
+                )
+                tracked.attempt += 1
+
+    def _finish(
+        self,
+        tracked: _TrackedTransaction,
+        transaction: Optional[CdoTransaction] = None,
+        exception: Optional[BaseException] = None,
+    ) -> None:
+        with self._condition:
+            self._tracked.pop(tracked.transaction_uid, None)
+            # wake the scheduler, which exits if this was the last transaction
+            self._condition.notify()
+        if tracked.future.done():
+            return
+        if exception is not None:
+            tracked.future.set_exception(exception)
+        else:
+            tracked.future.set_result(transaction)
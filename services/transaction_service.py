@@ -1,29 +1,34 @@
-import time
+from concurrent.futures import Future
+from typing import Optional
 
 from cdo_sdk_python import ApiClient, Configuration, TransactionsApi, CdoTransaction
-from cdo_sdk_python.models.cdo_transaction_status import CdoTransactionStatus
-from cdo_sdk_python.models.cdo_transaction_type import CdoTransactionType
+
+from services.scc_api_client import SccApiClient
+from services.transaction_poller import TransactionPoller, TransactionCallback
+
+
+def get_transaction_poller(api_client: ApiClient) -> TransactionPoller:
+    """The poller shared by every `TransactionService` on `api_client` (see
+    `SccApiClient.get_transaction_poller`). A plain `ApiClient` has nowhere to keep
+    one, so each service gets its own."""
+    if isinstance(api_client, SccApiClient):
+        return api_client.get_transaction_poller()
+    return TransactionPoller(TransactionsApi(api_client))
 
 
 class TransactionService:
     def __init__(self, api_client):
         self.transactions_api: TransactionsApi = TransactionsApi(api_client)
+        self.transaction_poller = get_transaction_poller(api_client)
 
     def wait_for_transaction_to_finish(
-        self, transaction_uid: str, time_to_wait_between_retries_seconds: int = 5
+        self, transaction_uid: str, on_update: Optional[TransactionCallback] = None
     ) -> CdoTransaction:
-        transaction: CdoTransaction = self.transactions_api.get_transaction(
-            transaction_uid
-        )
-        while transaction.cdo_transaction_status not in [
-            CdoTransactionStatus.DONE,
-            CdoTransactionStatus.ERROR,
-        ]:
-            time.sleep(time_to_wait_between_retries_seconds)
-            transaction = self.transactions_api.get_transaction(transaction_uid)
-
-        if transaction.cdo_transaction_status == CdoTransactionStatus.ERROR:
-            raise RuntimeError(
-                f"Transaction {transaction_uid} failed: {transaction.transaction_details}"
-            )
-        return transaction
+        return self.wait_for_transaction_to_finish_async(
+            transaction_uid, on_update
+        ).result()
+
+    def wait_for_transaction_to_finish_async(
+        self, transaction_uid: str, on_update: Optional[TransactionCallback] = None
+    ) -> Future:
+        return self.transaction_poller.submit(transaction_uid, on_update)
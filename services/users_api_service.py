@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Set
+
+from cdo_sdk_python import ApiClient, UsersApi, User, UserPage, UserCreateOrUpdateInput
+
+from models.user_provisioning_result import (
+    UserProvisioningResult,
+    CREATED,
+    SKIPPED,
+    FAILED,
+)
+from utils.concurrency import bounded_submit
+
+USERS_MAX_PAGE_SIZE = 200
+
+
+class UsersApiService:
+    def __init__(self, api_client: ApiClient):
+        self.users_api = UsersApi(api_client)
+
+    def iter_users(self, page_size: int = USERS_MAX_PAGE_SIZE) -> Iterator[User]:
+        offset = 0
+        while True:
+            user_page: UserPage = self.users_api.get_users(
+                limit=str(page_size), offset=str(offset)
+            )
+            yield from user_page.items
+            offset += len(user_page.items)
+            if not user_page.items or offset >= user_page.count:
+                return
+
+    def get_existing_usernames(self) -> Set[str]:
+        # usernames are email addresses, which SCC treats case-insensitively
+        return {user.name.lower() for user in self.iter_users()}
+
+    def provision_users(
+        self,
+        users: Iterable[UserCreateOrUpdateInput],
+        max_in_flight: int,
+        existing_usernames: Optional[Set[str]] = None,
+    ) -> Iterator[UserProvisioningResult]:
+        """Create every user that does not exist yet, at most `max_in_flight` at a
+        time, yielding a result per user as soon as it is known. Users that already
+        exist (or appear twice in `users`) are skipped, so re-running is safe."""
+        if existing_usernames is None:
+            existing_usernames = self.get_existing_usernames()
+        seen_usernames = set(existing_usernames)
+        skipped: List[UserProvisioningResult] = []
+
+        def users_to_create() -> Iterator[UserCreateOrUpdateInput]:
+            for user in users:
+                if user.name.lower() in seen_usernames:
+                    skipped.append(UserProvisioningResult(user.name, status=SKIPPED))
+                    continue
+                seen_usernames.add(user.name.lower())
+                yield user
+
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            for user, future in bounded_submit(
+                executor, self._create_user, users_to_create(), max_in_flight
+            ):
+                yield from skipped
+                skipped.clear()
+                try:
+                    future.result()
+                    yield UserProvisioningResult(user.name, status=CREATED)
+                except Exception as e:
+                    yield UserProvisioningResult(user.name, status=FAILED, error=str(e))
+        yield from skipped
+
+    def _create_user(self, user: UserCreateOrUpdateInput) -> User:
+        return self.users_api.create_user(user_create_or_update_input=user)
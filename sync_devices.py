@@ -0,0 +1,63 @@
+import json
+from functools import partial
+
+import click
+from cdo_sdk_python import ApiClient
+
+from cdo_api import execute_using_cdo_api, get_api_host
+from services.inventory_cache_service import InventoryCacheService
+from services.inventory_sync_service import InventorySyncService, get_sync_snapshot
+from utils.cache_dir import get_tenant_key
+from utils.cli_options import base_url_option, cdo_api_token_option
+
+
+@click.command(
+    help="Update the local inventory snapshot and write the devices that were added, removed or changed since the last sync as JSON lines."
+)
+@base_url_option(prompt=False)
+@cdo_api_token_option(prompt=False)
+@click.option(
+    "--output-file",
+    type=click.File(mode="w"),
+    default="-",
+    help="Where to write the changes. Defaults to stdout.",
+)
+@click.option(
+    "--full",
+    is_flag=True,
+    help="List the whole inventory instead of only fetching the devices in the change log.",
+)
+def sync_devices_command(base_url: str, cdo_api_token: str, output_file, full: bool):
+    with get_sync_snapshot(
+        tenant=get_tenant_key(cdo_api_token), region=get_api_host(base_url)
+    ) as inventory_cache:
+        execute_using_cdo_api(
+            base_url,
+            cdo_api_token,
+            partial(sync_devices, inventory_cache, output_file, full),
+        )
+
+
+def sync_devices(
+    inventory_cache: InventoryCacheService,
+    output_file,
+    full: bool,
+    api_client: ApiClient,
+):
+    inventory_sync_service = InventorySyncService(api_client, inventory_cache)
+    counts = {}
+    for change in inventory_sync_service.sync(full=full):
+        counts[change.change] = counts.get(change.change, 0) + 1
+        output_file.write(json.dumps(change.to_json()) + "\n")
+    click.echo(
+        f"{inventory_sync_service.mode.capitalize()} sync: "
+        + (
+            ", ".join(f"{count} {change}" for change, count in counts.items())
+            or "no changes"
+        ),
+        err=True,
+    )
+
+
+if __name__ == "__main__":
+    sync_devices_command()
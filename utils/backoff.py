@@ -0,0 +1,21 @@
+import random
+
+
+class BackoffPolicy:
+    def __init__(
+        self,
+        initial_delay_seconds: float,
+        max_delay_seconds: float,
+        multiplier: float = 2.0,
+    ):
+        self.initial_delay_seconds = initial_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.multiplier = multiplier
+
+    def get_delay_seconds(self, attempt: int) -> float:
+        delay = min(
+            self.max_delay_seconds,
+            self.initial_delay_seconds * (self.multiplier**attempt),
+        )
+        # "equal jitter": keep at least half of the delay so we never poll in a tight loop
+        return delay / 2 + random.uniform(0, delay / 2)
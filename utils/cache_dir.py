@@ -0,0 +1,41 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Optional
+
+
+def get_user_cache_dir() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    cache_dir = os.path.join(cache_home, "cdo-python-sdk-example")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def get_tenant_key(api_token: str) -> str:
+    # API tokens are scoped to a single tenant, so a fingerprint of the token
+    # identifies the tenant without storing the token itself
+    return hashlib.sha256(api_token.encode("utf-8")).hexdigest()[:16]
+
+
+def write_json_cache_file(
+    cache_file: str, contents: Any, indent: Optional[int] = None
+) -> None:
+    """Replace `cache_file` with `contents` as JSON. The JSON is written to a
+    temporary file of our own first, so that other processes writing the same cache
+    at the same time cannot interleave with this write."""
+    with tempfile.NamedTemporaryFile(
+        mode="w",
+        dir=os.path.dirname(cache_file),
+        prefix=f"{os.path.basename(cache_file)}.",
+        suffix=".tmp",
+        delete=False,
+    ) as file:
+        json.dump(contents, file, indent=indent)
+    try:
+        os.replace(file.name, cache_file)
+    except OSError:
+        os.remove(file.name)
+        raise
@@ -0,0 +1,83 @@
+import os
+
+import click
+
+CDO_BASE_URLS = [
+    "https://www.defenseorchestrator.com",
+    "https://apj.cdo.cisco.com",
+    "https://www.defenseorchestator.eu",
+    "https://au.cdo.cisco.com",
+    "https://in.cdo.cisco.com",
+]
+
+
+def _get_api_token_from_environment():
+    return os.environ.get("CDO_API_TOKEN") or os.environ.get("BEARER_TOKEN")
+
+
+def base_url_option(prompt: bool = True):
+    return click.option(
+        "--base-url",
+        help="Enter the CDO Base URL",
+        prompt=prompt,
+        type=click.Choice(CDO_BASE_URLS, case_sensitive=True),
+        default="https://www.defenseorchestrator.com",
+    )
+
+
+def cdo_api_token_option(prompt: bool = True):
+    return click.option(
+        "--cdo-api-token",
+        help="Enter the CDO API token",
+        prompt=prompt,
+        hide_input=True,
+        required=True,
+        default=_get_api_token_from_environment,
+        show_default="CDO_API_TOKEN (or BEARER_TOKEN) environment variable",
+    )
+
+
+def metrics_file_option():
+    return click.option(
+        "--metrics-file",
+        type=str,
+        envvar="CDO_METRICS_FILE",
+        help="Write per-endpoint API latency, status code and retry metrics to this file: JSON if it ends in .json, Prometheus text otherwise.",
+    )
+
+
+def metrics_interval_option():
+    return click.option(
+        "--metrics-interval",
+        type=click.FloatRange(min=1),
+        help="Also rewrite the metrics file every this many seconds while running.",
+    )
+
+
+def answer_cache_ttl_option(default_ttl_seconds: float):
+    return click.option(
+        "--answer-cache-ttl",
+        type=float,
+        default=default_ttl_seconds,
+        show_default=True,
+        envvar="AI_ANSWER_CACHE_TTL_SECONDS",
+        help="How long, in seconds, an answer is reused when the same question is asked again in the same tenant.",
+    )
+
+
+def no_answer_cache_option():
+    return click.option(
+        "--no-cache",
+        is_flag=True,
+        help="Always ask the AI Assistant, without using or updating the answer cache.",
+    )
+
+
+def parallel_workers_option():
+    return click.option(
+        "--parallel-workers",
+        type=click.IntRange(min=1),
+        default=1,
+        show_default=True,
+        help="Fetch this many pages of devices at a time, which is much faster on large inventories. The devices are still returned in order.",
+    )
@@ -0,0 +1,159 @@
+from collections import deque
+from concurrent.futures import Executor, Future, FIRST_COMPLETED, wait
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+K = TypeVar("K", bound=Hashable)
+
+
+def bounded_submit(
+    executor: Executor,
+    function: Callable[[T], R],
+    items: Iterable[T],
+    max_in_flight: int,
+) -> Iterator[Tuple[T, Future]]:
+    """Submit `function(item)` for every item, keeping at most `max_in_flight`
+    futures outstanding, and yield (item, future) pairs as they complete.
+
+    Items are pulled from `items` lazily, so generators are never materialised.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+
+    in_flight: Set[Future] = set()
+    items_by_future = {}
+    item_iterator = iter(items)
+    exhausted = False
+    while True:
+        while not exhausted and len(in_flight) < max_in_flight:
+            try:
+                item = next(item_iterator)
+            except StopIteration:
+                exhausted = True
+                break
+            future = executor.submit(function, item)
+            in_flight.add(future)
+            items_by_future[future] = item
+        if not in_flight:
+            return
+        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield items_by_future.pop(future), future
+
+
+def bounded_map(
+    executor: Executor,
+    function: Callable[[T], R],
+    items: Iterable[T],
+    max_in_flight: int,
+) -> Iterator[R]:
+    """Like `executor.map`, yielding the results in the order of `items`, but with at
+    most `max_in_flight` items submitted ahead of the result being waited on, rather
+    than all of them up front."""
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+
+    in_flight: Deque[Future] = deque()
+    for item in items:
+        if len(in_flight) >= max_in_flight:
+            yield in_flight.popleft().result()
+        in_flight.append(executor.submit(function, item))
+    while in_flight:
+        yield in_flight.popleft().result()
+
+
+def keyed_bounded_submit(
+    executor: Executor,
+    function: Callable[[T], R],
+    items: Iterable[T],
+    max_in_flight: int,
+    get_key: Callable[[T], K],
+    get_max_in_flight_for_key: Callable[[K], int],
+    max_queued: Optional[int] = None,
+    max_queued_per_key: Optional[int] = None,
+) -> Iterator[Tuple[T, Future]]:
+    """Like `bounded_submit`, but also keeps at most `get_max_in_flight_for_key(key)`
+    items with the same `get_key(item)` in flight.
+
+    Items whose key is at its limit wait in a queue rather than in a worker, so they
+    never hold up items with other keys. At most `max_queued` items (by default, ten
+    times `max_in_flight`) are read ahead of the ones in flight, and at most
+    `max_queued_per_key` (by default, `max_in_flight`) of them with the same key, so
+    one saturated key cannot fill the whole read-ahead. Reading stops while either
+    limit is reached, even if workers are idle, so `items` is never read further
+    ahead than that.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+    max_queued = max_queued or 10 * max_in_flight
+    max_queued_per_key = max_queued_per_key or max_in_flight
+
+    queued: Dict[K, Deque[T]] = {}
+    queued_count = 0
+    in_flight: Set[Future] = set()
+    in_flight_by_key: Dict[K, int] = {}
+    keyed_items_by_future: Dict[Future, Tuple[K, T]] = {}
+    item_iterator = iter(items)
+    exhausted = False
+    # the key of the last item read; only it can have reached max_queued_per_key
+    last_key: Optional[K] = None
+
+    def submit_queued(key: K) -> None:
+        nonlocal queued_count
+        key_queue = queued[key]
+        max_in_flight_for_key = get_max_in_flight_for_key(key)
+        if max_in_flight_for_key < 1:
+            raise ValueError(f"The limit for {key} must be at least 1")
+        while (
+            key_queue
+            and len(in_flight) < max_in_flight
+            and in_flight_by_key.get(key, 0) < max_in_flight_for_key
+        ):
+            item = key_queue.popleft()
+            queued_count -= 1
+            future = executor.submit(function, item)
+            in_flight.add(future)
+            in_flight_by_key[key] = in_flight_by_key.get(key, 0) + 1
+            keyed_items_by_future[future] = (key, item)
+        if not key_queue:
+            del queued[key]
+
+    def may_read() -> bool:
+        return (
+            not exhausted
+            and queued_count < max_queued
+            and len(queued.get(last_key, ())) < max_queued_per_key
+        )
+
+    while True:
+        for key in list(queued):
+            submit_queued(key)
+        while may_read():
+            try:
+                item = next(item_iterator)
+            except StopIteration:
+                exhausted = True
+                break
+            last_key = get_key(item)
+            queued.setdefault(last_key, deque()).append(item)
+            queued_count += 1
+            submit_queued(last_key)
+        if not in_flight:
+            return
+        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            key, item = keyed_items_by_future.pop(future)
+            in_flight_by_key[key] -= 1
+            yield item, future
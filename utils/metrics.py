@@ -0,0 +1,220 @@
+import json
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+from urllib.parse import urlparse
+
+R = TypeVar("R")
+
+# seconds; SCC calls range from fast reads to multi-second transaction submissions
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+_ID_SEGMENT_REGEX = re.compile(
+    r"^([a-fA-F0-9]{8}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{12}|\d+)$"
+)
+
+
+def get_operation_name(method: str, url: str) -> str:
+    """`GET /api/rest/v1/inventory/devices/{uid}`: the host and query string are
+    dropped and IDs are templated, so that calls to the same endpoint are grouped."""
+    path = "/".join(
+        "{uid}" if _ID_SEGMENT_REGEX.match(segment) else segment
+        for segment in urlparse(url).path.split("/")
+    )
+    return f"{method.upper()} {path}"
+
+
+class Histogram:
+    def __init__(self, buckets: List[float] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for index, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                self.bucket_counts[index] += 1
+                break
+
+    def get_cumulative_counts(self) -> List[Tuple[float, int]]:
+        cumulative_counts, total = [], 0
+        for upper_bound, count in zip(self.buckets, self.bucket_counts):
+            total += count
+            cumulative_counts.append((upper_bound, total))
+        return cumulative_counts
+
+
+class MetricsRegistry:
+    """Request latencies, status codes, retries and in-flight requests per API
+    operation, for every SCC and cdFMC call made in this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Histogram] = {}
+        self._status_counts: Dict[Tuple[str, str], int] = {}
+        self._retries: Dict[str, int] = {}
+        self._in_flight: Dict[str, int] = {}
+        self.started_at = time.time()
+
+    def start_request(self, operation: str) -> float:
+        with self._lock:
+            self._in_flight[operation] = self._in_flight.get(operation, 0) + 1
+        return time.monotonic()
+
+    def finish_request(self, operation: str, started_at: float, status: str) -> None:
+        duration_seconds = time.monotonic() - started_at
+        with self._lock:
+            self._in_flight[operation] -= 1
+            self._latencies.setdefault(operation, Histogram()).observe(duration_seconds)
+            key = (operation, status)
+            self._status_counts[key] = self._status_counts.get(key, 0) + 1
+
+    def time_request(
+        self, operation: str, send: Callable[[], R], get_status: Callable[[R], int]
+    ) -> R:
+        started_at = self.start_request(operation)
+        status = "error"
+        try:
+            response = send()
+            status = str(get_status(response))
+            return response
+        finally:
+            self.finish_request(operation, started_at, status)
+
+    def increment_retries(self, operation: str) -> None:
+        with self._lock:
+            self._retries[operation] = self._retries.get(operation, 0) + 1
+
+    def to_json(self) -> dict:
+        with self._lock:
+            operations = {}
+            for operation, histogram in self._latencies.items():
+                operations[operation] = {
+                    "count": histogram.count,
+                    "latency_seconds_sum": histogram.sum,
+                    "latency_seconds_buckets": {
+                        str(upper_bound): count
+                        for upper_bound, count in histogram.get_cumulative_counts()
+                    },
+                    "status_codes": {},
+                    "retries": self._retries.get(operation, 0),
+                    "in_flight": self._in_flight.get(operation, 0),
+                }
+            for (operation, status), count in self._status_counts.items():
+                operations[operation]["status_codes"][status] = count
+            return {
+                "started_at": self.started_at,
+                "elapsed_seconds": time.time() - self.started_at,
+                "operations": operations,
+            }
+
+    def to_prometheus_text(self) -> str:
+        lines = [
+            "# HELP scc_api_request_duration_seconds Latency of SCC API requests.",
+            "# TYPE scc_api_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            for operation, histogram in sorted(self._latencies.items()):
+                labels = f'operation="{_escape_label(operation)}"'
+                for upper_bound, count in histogram.get_cumulative_counts():
+                    lines.append(
+                        f'scc_api_request_duration_seconds_bucket{{{labels},le="{upper_bound}"}} {count}'
+                    )
+                lines.append(
+                    f'scc_api_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}'
+                )
+                lines.append(
+                    f"scc_api_request_duration_seconds_sum{{{labels}}} {histogram.sum}"
+                )
+                lines.append(
+                    f"scc_api_request_duration_seconds_count{{{labels}}} {histogram.count}"
+                )
+            lines += [
+                "# HELP scc_api_requests_total SCC API requests by status code.",
+                "# TYPE scc_api_requests_total counter",
+            ]
+            for (operation, status), count in sorted(self._status_counts.items()):
+                lines.append(
+                    f'scc_api_requests_total{{operation="{_escape_label(operation)}",status="{status}"}} {count}'
+                )
+            lines += [
+                "# HELP scc_api_retries_total Throttled SCC API requests that were retried.",
+                "# TYPE scc_api_retries_total counter",
+            ]
+            for operation, count in sorted(self._retries.items()):
+                lines.append(
+                    f'scc_api_retries_total{{operation="{_escape_label(operation)}"}} {count}'
+                )
+            lines += [
+                "# HELP scc_api_requests_in_flight SCC API requests waiting for a response.",
+                "# TYPE scc_api_requests_in_flight gauge",
+            ]
+            for operation, count in sorted(self._in_flight.items()):
+                lines.append(
+                    f'scc_api_requests_in_flight{{operation="{_escape_label(operation)}"}} {count}'
+                )
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+_metrics_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    return _metrics_registry
+
+
+class MetricsExporter:
+    """Writes the registry to `metrics_file` when the `with` block exits and, if
+    `interval_seconds` is set, every `interval_seconds` until then. Files ending in
+    `.json` get JSON; anything else gets the Prometheus text format."""
+
+    def __init__(
+        self,
+        metrics_file: Optional[str],
+        interval_seconds: Optional[float] = None,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        self.metrics_file = metrics_file
+        self.interval_seconds = interval_seconds
+        self.registry = registry or get_metrics_registry()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "MetricsExporter":
+        if self.metrics_file and self.interval_seconds:
+            self._thread = threading.Thread(
+                target=self._run, name="metrics-exporter", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.export()
+
+    def export(self) -> None:
+        if not self.metrics_file:
+            return
+        if self.metrics_file.endswith(".json"):
+            content = json.dumps(self.registry.to_json(), indent=2)
+        else:
+            content = self.registry.to_prometheus_text()
+        temporary_file = f"{self.metrics_file}.tmp"
+        with open(temporary_file, mode="w") as file:
+            file.write(content)
+        os.replace(temporary_file, self.metrics_file)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval_seconds):
+            self.export()
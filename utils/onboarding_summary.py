@@ -0,0 +1,28 @@
+from typing import List
+
+from rich.console import Console
+
+from models.onboarding_result import OnboardingResult
+
+
+def print_onboarding_summary(
+    console: Console,
+    results: List[OnboardingResult],
+    rejected_rows: List[OnboardingResult],
+    device_kind: str,
+) -> None:
+    """Print how many devices were onboarded and why the others were not, and exit
+    with status 1 if any were not."""
+    succeeded = [result for result in results if result.succeeded]
+    skipped = [result for result in succeeded if result.skipped]
+    failed = [result for result in results if not result.succeeded] + rejected_rows
+    if results:
+        console.print(
+            f"[green]Onboarded {len(succeeded)} of {len(succeeded) + len(failed)} {device_kind}(s)"
+            + (f", {len(skipped)} of them by the run being resumed" if skipped else "")
+            + ".[/green]"
+        )
+    for result in failed:
+        console.print(f"[red]{result.name}: {result.error}[/red]")
+    if failed:
+        raise SystemExit(1)
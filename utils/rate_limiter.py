@@ -0,0 +1,179 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Hashable, List, Optional, TypeVar
+
+from utils.backoff import BackoffPolicy
+from utils.cache_dir import get_tenant_key
+
+R = TypeVar("R")
+
+THROTTLED_STATUSES = [429, 503]
+# a 429 means the request was turned away, but a 503 may come from a proxy after the
+# request took effect, so only requests that are safe to repeat are retried on it
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+NON_IDEMPOTENT_RETRY_STATUSES = [429]
+DEFAULT_RETRY_BACKOFF_POLICY = BackoffPolicy(
+    initial_delay_seconds=1, max_delay_seconds=30
+)
+
+
+class RateLimiter:
+    """A token bucket shared by every caller of the SCC APIs for one tenant (see
+    `get_rate_limiter`).
+
+    The refill rate adapts to the server (AIMD): every successful call nudges the
+    rate up towards `max_rate`, and every throttled call halves it (down to
+    `min_rate`) and, if the server sent a `Retry-After`, holds all callers back until
+    then. Each call reserves a token up front, so the wait can be spent in
+    `time.sleep` or `asyncio.sleep` alike.
+    """
+
+    def __init__(
+        self,
+        initial_rate: float = 10.0,
+        min_rate: float = 0.5,
+        max_rate: float = 100.0,
+        burst: int = 10,
+        rate_increase_per_success: float = 0.1,
+    ):
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.rate_increase_per_success = rate_increase_per_success
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._decreased_at = float("-inf")
+
+    def acquire(self) -> None:
+        delay_seconds = self._reserve()
+        if delay_seconds > 0:
+            time.sleep(delay_seconds)
+
+    async def acquire_async(self) -> None:
+        delay_seconds = self._reserve()
+        if delay_seconds > 0:
+            await asyncio.sleep(delay_seconds)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.rate_increase_per_success)
+
+    def on_throttled(self, retry_after_seconds: Optional[float] = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # concurrent callers tend to be throttled together; count that as one
+            # signal rather than halving the rate once per caller
+            if now - self._decreased_at >= 1.0:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self._decreased_at = now
+            if retry_after_seconds:
+                self._blocked_until = max(
+                    self._blocked_until, now + retry_after_seconds
+                )
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # tokens may go negative: that is a queue of callers already waiting
+            self._tokens -= 1
+            wait_for_token = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait_for_token, self._blocked_until - now)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._refilled_at) * self.rate
+        )
+        self._refilled_at = now
+
+
+_rate_limiters: Dict[Hashable, RateLimiter] = {}
+_shared_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    base_url: Optional[str] = None, api_token: Optional[str] = None
+) -> RateLimiter:
+    """The rate limiter for one tenant (an API token) in one region. SCC throttles
+    each tenant separately, so one tenant being throttled must not slow down the
+    others the process is working on."""
+    key = (base_url, get_tenant_key(api_token) if api_token else None)
+    with _rate_limiter_lock:
+        if _shared_rate_limiter is not None:
+            return _shared_rate_limiter
+        if key not in _rate_limiters:
+            _rate_limiters[key] = RateLimiter()
+        return _rate_limiters[key]
+
+
+def set_rate_limiter(rate_limiter: RateLimiter) -> None:
+    """Use `rate_limiter` for every tenant and region, e.g. to lift the limits in
+    benchmarks."""
+    global _shared_rate_limiter
+    with _rate_limiter_lock:
+        _shared_rate_limiter = rate_limiter
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """`Retry-After` is either a number of seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def get_retry_statuses(method: str) -> List[int]:
+    """The throttled statuses on which a `method` request can be sent again."""
+    if method.upper() in IDEMPOTENT_METHODS:
+        return THROTTLED_STATUSES
+    return NON_IDEMPOTENT_RETRY_STATUSES
+
+
+def call_with_rate_limit(
+    send: Callable[[], R],
+    get_status: Callable[[R], int],
+    get_retry_after: Callable[[R], Optional[str]],
+    discard: Callable[[R], None] = lambda _response: None,
+    max_retries: int = 5,
+    backoff_policy: BackoffPolicy = DEFAULT_RETRY_BACKOFF_POLICY,
+    rate_limiter: Optional[RateLimiter] = None,
+    on_retry: Callable[[], None] = lambda: None,
+    retry_statuses: List[int] = THROTTLED_STATUSES,
+) -> R:
+    """Call `send` once `rate_limiter` (by default, one shared by callers that do
+    not name a tenant) allows it, retrying responses with one of `retry_statuses`
+    (see `get_retry_statuses`) up to `max_retries` times. The last response is
+    returned as-is, so callers keep their own error handling."""
+    rate_limiter = rate_limiter or get_rate_limiter()
+    attempt = 0
+    while True:
+        rate_limiter.acquire()
+        response = send()
+        status = get_status(response)
+        if status not in THROTTLED_STATUSES:
+            rate_limiter.on_success()
+            return response
+        retry_after_seconds = parse_retry_after(get_retry_after(response))
+        rate_limiter.on_throttled(retry_after_seconds)
+        if status not in retry_statuses or attempt >= max_retries:
+            return response
+        discard(response)
+        # the limiter holds everyone back for Retry-After; the backoff spreads out
+        # retries when the server did not say how long to wait
+        if retry_after_seconds is None:
+            time.sleep(backoff_policy.get_delay_seconds(attempt))
+        attempt += 1
+        on_retry()
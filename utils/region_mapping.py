@@ -1,18 +1,29 @@
-from questionary import Choice
+import os
 
 supported_regions = ["us", "eu", "aus", "apj", "in", "staging", "scale"]
-supported_regions_choices = [
-    Choice(value="us", title="United States"),
-    Choice(value="eu", title="Europe"),
-    Choice(value="aus", title="Australia"),
-    Choice(value="apj", title="Asia Pacific Japan"),
-    Choice(value="in", title="India"),
-    Choice(value="staging", title="Staging (Cisco Developers only)"),
-    Choice(value="scale", title="Scale (Cisco Developers only)"),
-]
+
+
+def __getattr__(name):
+    # questionary is slow to import, so only build the choices when they are used
+    if name == "supported_regions_choices":
+        from questionary import Choice
+
+        return [
+            Choice(value="us", title="United States"),
+            Choice(value="eu", title="Europe"),
+            Choice(value="aus", title="Australia"),
+            Choice(value="apj", title="Asia Pacific Japan"),
+            Choice(value="in", title="India"),
+            Choice(value="staging", title="Staging (Cisco Developers only)"),
+            Choice(value="scale", title="Scale (Cisco Developers only)"),
+        ]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_scc_url(region):
+    # lets the scripts be pointed at a test server, e.g. benchmarks/mock_scc_server.py
+    if os.environ.get("SCC_BASE_URL"):
+        return os.environ["SCC_BASE_URL"]
     if region not in supported_regions:
         raise ValueError(f"Region {region} is not supported")
     return f"https://{region}.manage.security.cisco.com/api/rest"
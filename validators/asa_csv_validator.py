@@ -0,0 +1,35 @@
+from typing import List
+
+from cdo_sdk_python import ConnectorType
+
+from validators.device_csv_validator import DeviceCsvValidator, RowRule
+
+REQUIRED_COLUMNS = ["name", "address", "username", "password", "connector_type"]
+CONNECTOR_TYPES = frozenset(connector_type.value for connector_type in ConnectorType)
+
+# (column, check, reason); checks get the value, which may be None
+ROW_RULES = [
+    ("name", bool, "name is missing"),
+    ("address", bool, "address is missing"),
+    ("username", bool, "username is missing"),
+    ("password", bool, "password is missing"),
+    (
+        "connector_type",
+        lambda connector_type: connector_type in CONNECTOR_TYPES,
+        f"connector_type must be one of {', '.join(sorted(CONNECTOR_TYPES))}",
+    ),
+    (
+        "ignore_certificate",
+        lambda ignore_certificate: (ignore_certificate or "").lower()
+        in ["", "true", "false"],
+        "ignore_certificate must be true or false",
+    ),
+]
+
+
+class AsaCsvValidator(DeviceCsvValidator):
+    def get_required_columns(self) -> List[str]:
+        return REQUIRED_COLUMNS
+
+    def get_row_rules(self, row: dict) -> List[RowRule]:
+        return ROW_RULES
@@ -0,0 +1,92 @@
+import csv
+import os
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional, Tuple
+
+from models.csv_row_error import CsvRowError
+from services.inventory_index import InventoryIndex
+from validators.duplicate_checker import DuplicateChecker
+
+# (column, check, reason); checks get the value, which may be None
+RowRule = Tuple[str, Callable[[Optional[str]], bool], str]
+
+
+class DeviceCsvValidator(ABC):
+    """The checks shared by the CSV files of devices to onboard: the header, a rule
+    table per row, and names repeated in the file or already in the inventory."""
+
+    def __init__(self, csv_file: str):
+        self.csv_file = csv_file
+
+    @abstractmethod
+    def get_required_columns(self) -> List[str]:
+        pass
+
+    @abstractmethod
+    def get_row_rules(self, row: dict) -> List[RowRule]:
+        pass
+
+    def validate_header(self) -> bool:
+        if not os.path.exists(self.csv_file):
+            raise FileNotFoundError(f"CSV file {self.csv_file} does not exist.")
+
+        with open(self.csv_file, mode="r") as file:
+            header = next(csv.reader(file), [])
+        return all(column in header for column in self.get_required_columns())
+
+    def validate(self) -> bool:
+        return not self.validate_file()
+
+    def validate_file(
+        self, inventory_index: Optional[InventoryIndex] = None
+    ) -> List[CsvRowError]:
+        """Check the whole file in one pass and return every error, rather than
+        stopping at the first one."""
+        if not os.path.exists(self.csv_file):
+            raise FileNotFoundError(f"CSV file {self.csv_file} does not exist.")
+
+        with open(self.csv_file, mode="r") as file:
+            reader = csv.DictReader(file)
+            check_row = self.row_checker(inventory_index)
+            return [
+                error for row in reader for error in check_row(row, reader.line_num)
+            ]
+
+    def row_checker(
+        self, inventory_index: Optional[InventoryIndex] = None
+    ) -> Callable[[dict, int], List[CsvRowError]]:
+        """A check for the rows of one pass over the file, which also catches names
+        repeated in the file or, with `inventory_index`, already in the inventory."""
+        names = DuplicateChecker("name")
+
+        def check_row(row: dict, line_number: int) -> List[CsvRowError]:
+            name = row.get("name")
+            errors = [
+                CsvRowError(line_number, name, reason)
+                for reason in self.get_row_errors(row)
+            ]
+            duplicate_name = names.check(name, line_number)
+            if duplicate_name:
+                errors.append(CsvRowError(line_number, name, duplicate_name))
+            if inventory_index is not None and name and inventory_index.has_name(name):
+                errors.append(
+                    CsvRowError(
+                        line_number,
+                        name,
+                        f"a device named {name} is already onboarded",
+                        is_inventory_conflict=True,
+                    )
+                )
+            return errors
+
+        return check_row
+
+    def validate_row(self, row: dict) -> bool:
+        return not self.get_row_errors(row)
+
+    def get_row_errors(self, row: dict) -> List[str]:
+        return [
+            reason
+            for column, check, reason in self.get_row_rules(row)
+            if not check(row.get(column))
+        ]
@@ -0,0 +1,25 @@
+from typing import Callable, Dict, Optional
+
+
+class DuplicateChecker:
+    """Remembers the line each value of a column was first seen on, so that repeats
+    are caught in the same pass that validates the rows."""
+
+    def __init__(
+        self, column: str, normalise: Callable[[str], str] = lambda value: value
+    ):
+        self.column = column
+        self.normalise = normalise
+        self.first_seen_on: Dict[str, int] = {}
+
+    def check(self, value: Optional[str], line_number: int) -> Optional[str]:
+        if not value:
+            return None
+        first_seen_on = self.first_seen_on.setdefault(
+            self.normalise(value), line_number
+        )
+        if first_seen_on != line_number:
+            return (
+                f"duplicate {self.column} {value} (first seen on line {first_seen_on})"
+            )
+        return None
@@ -1,44 +1,55 @@
-import csv
-import os
-
-
-class FtdCsvValidator:
-    def __init__(self, csv_file: str):
-        self.csv_file = csv_file
-
-    def validate(self) -> bool:
-        if not os.path.exists(self.csv_file):
-            raise FileNotFoundError(f"CSV file {self.csv_file} does not exist.")
-
-        with open(self.csv_file, mode="r") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                if not self._validate_row(row):
-                    return False
-        return True
-
-    def _validate_row(self, row: dict) -> bool:
-        name = row.get("name")
-        is_virtual = row.get("virtual", "").lower() == "true"
-        performance_tier = row.get("performance_tier")
-        licenses = row.get("licenses")
-
-        if not name:
-            return False
-
-        if is_virtual:
-            if performance_tier not in [
-                "FTDv5",
-                "FTDv10",
-                "FTDv20",
-                "FTDv30",
-                "FTDv50",
-            ]:
-                return False
-            if not licenses or not all(
-                l in ["BASE", "CARRIER", "MALWARE", "THREAT", "URLFilter"]
-                for l in licenses.split(";")
-            ):
-                return False
-
-        return True
+from typing import List
+
+from validators.device_csv_validator import DeviceCsvValidator, RowRule
+
+REQUIRED_COLUMNS = ["name", "virtual", "performance_tier", "licenses"]
+SSH_COLUMNS = ["address", "username", "password"]
+VALID_PERFORMANCE_TIERS = frozenset(["FTDv5", "FTDv10", "FTDv20", "FTDv30", "FTDv50"])
+VALID_LICENSES = frozenset(["BASE", "CARRIER", "MALWARE", "THREAT", "URLFilter"])
+
+# (column, check, reason); checks get the value, which may be None
+ROW_RULES = [
+    ("name", bool, "name is missing"),
+    (
+        "virtual",
+        lambda virtual: (virtual or "").lower() in ["true", "false"],
+        "virtual must be true or false",
+    ),
+    (
+        "licenses",
+        lambda licenses: bool(licenses) and set(licenses.split(";")) <= VALID_LICENSES,
+        f"licenses must be ;-separated values from {', '.join(sorted(VALID_LICENSES))}",
+    ),
+]
+VIRTUAL_ROW_RULES = [
+    (
+        "performance_tier",
+        lambda performance_tier: performance_tier in VALID_PERFORMANCE_TIERS,
+        f"performance_tier must be one of {', '.join(sorted(VALID_PERFORMANCE_TIERS))} for a virtual FTD",
+    ),
+]
+SSH_ROW_RULES = [
+    (column, bool, f"{column} is needed to onboard over SSH") for column in SSH_COLUMNS
+] + [
+    (
+        "ssh_port",
+        lambda ssh_port: not ssh_port or ssh_port.isdigit(),
+        "ssh_port must be a number",
+    )
+]
+
+
+class FtdCsvValidator(DeviceCsvValidator):
+    def __init__(self, csv_file: str, requires_ssh_credentials: bool = False):
+        super().__init__(csv_file)
+        self.requires_ssh_credentials = requires_ssh_credentials
+        self.row_rules = ROW_RULES + (SSH_ROW_RULES if requires_ssh_credentials else [])
+        self.virtual_row_rules = self.row_rules + VIRTUAL_ROW_RULES
+
+    def get_required_columns(self) -> List[str]:
+        return REQUIRED_COLUMNS + (SSH_COLUMNS if self.requires_ssh_credentials else [])
+
+    def get_row_rules(self, row: dict) -> List[RowRule]:
+        if (row.get("virtual") or "").lower() == "true":
+            return self.virtual_row_rules
+        return self.row_rules
@@ -1,43 +1,71 @@
-import csv
-import os
 import re
+from typing import Callable, List, Optional
 
+from models.csv_row_error import CsvRowError
+from services.inventory_index import InventoryIndex, normalise_serial_number
+from validators.device_csv_validator import DeviceCsvValidator, RowRule
+from validators.duplicate_checker import DuplicateChecker
 
-class FtdZtpCsvValidator:
-    def __init__(self, csv_file: str):
-        self.csv_file = csv_file
+REQUIRED_COLUMNS = ["name", "serial_number", "licenses", "admin_password"]
+VALID_LICENSES = frozenset(["BASE", "CARRIER", "MALWARE", "THREAT", "URLFilter"])
+NAME_REGEX = re.compile(r"^[A-Za-z0-9-_*]+$")
 
-    def validate(self) -> bool:
-        if not os.path.exists(self.csv_file):
-            raise FileNotFoundError(f"CSV file {self.csv_file} does not exist.")
+# (column, check, reason) for every row; checks get the value, which may be None
+ROW_RULES = [
+    (
+        "name",
+        lambda name: bool(name) and NAME_REGEX.match(name) is not None,
+        "name must be letters, digits, -, _ or *",
+    ),
+    ("serial_number", bool, "serial_number is missing"),
+    (
+        "licenses",
+        lambda licenses: bool(licenses) and set(licenses.split(";")) <= VALID_LICENSES,
+        f"licenses must be ;-separated values from {', '.join(sorted(VALID_LICENSES))}",
+    ),
+    (
+        "admin_password",
+        lambda admin_password: bool(admin_password) and " " not in admin_password,
+        "admin_password is missing or contains spaces",
+    ),
+]
 
-        with open(self.csv_file, mode="r") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                if not self._validate_row(row):
-                    return False
-        return True
 
-    def _validate_row(self, row: dict) -> bool:
-        name = row.get("name")
-        serial_number = row.get("serial_number")
-        licenses = row.get("licenses")
-        admin_password = row.get("admin_password")
+class FtdZtpCsvValidator(DeviceCsvValidator):
+    def get_required_columns(self) -> List[str]:
+        return REQUIRED_COLUMNS
 
-        if not name or not re.match(r"^[A-Za-z0-9-_*]+$", name):
-            print(f"Invalid name {name}")
-            return False
+    def get_row_rules(self, row: dict) -> List[RowRule]:
+        return ROW_RULES
 
-        if not serial_number:
-            return False
+    def row_checker(
+        self, inventory_index: Optional[InventoryIndex] = None
+    ) -> Callable[[dict, int], List[CsvRowError]]:
+        """Like `DeviceCsvValidator.row_checker`, but also catches serial numbers
+        repeated in the file or already in the inventory."""
+        check_name_and_rules = super().row_checker(inventory_index)
+        serial_numbers = DuplicateChecker("serial_number", normalise_serial_number)
 
-        if not licenses or not all(
-            license in ["BASE", "CARRIER", "MALWARE", "THREAT", "URLFilter"]
-            for license in licenses.split(";")
-        ):
-            return False
+        def check_row(row: dict, line_number: int) -> List[CsvRowError]:
+            errors = check_name_and_rules(row, line_number)
+            name = row.get("name")
+            serial_number = row.get("serial_number")
+            duplicate_serial_number = serial_numbers.check(serial_number, line_number)
+            if duplicate_serial_number:
+                errors.append(CsvRowError(line_number, name, duplicate_serial_number))
+            if (
+                inventory_index is not None
+                and serial_number
+                and inventory_index.has_serial_number(serial_number)
+            ):
+                errors.append(
+                    CsvRowError(
+                        line_number,
+                        name,
+                        f"a device with serial number {serial_number} is already onboarded",
+                        is_inventory_conflict=True,
+                    )
+                )
+            return errors
 
-        if not admin_password or " " in admin_password:
-            return False
-
-        return True
+        return check_row
@@ -0,0 +1,51 @@
+import csv
+import os
+import re
+from typing import List
+
+from cdo_sdk_python import UserRole
+
+REQUIRED_COLUMNS = ["name", "role"]
+ROLES = [role.value for role in UserRole]
+NAME_REGEX = re.compile(r"^\S+$")
+
+# (column, check, reason); checks get the value, which may be None
+ROW_RULES = [
+    (
+        "name",
+        lambda name: isinstance(name, str) and NAME_REGEX.match(name) is not None,
+        "name is missing or contains spaces",
+    ),
+    ("role", lambda role: role in ROLES, f"role must be one of {', '.join(ROLES)}"),
+    (
+        "api_only_user",
+        # JSON lines give booleans and CSV files give strings, in any case
+        lambda api_only_user: api_only_user in [None, ""]
+        or str(api_only_user).lower() in ["true", "false"],
+        "api_only_user must be true or false",
+    ),
+]
+
+
+class UserFileValidator:
+    def __init__(self, users_file: str):
+        self.users_file = users_file
+
+    def validate_header(self) -> bool:
+        if not os.path.exists(self.users_file):
+            raise FileNotFoundError(f"Users file {self.users_file} does not exist.")
+
+        # JSONL files have no header; each line is checked as it is read
+        if self.users_file.endswith(".jsonl"):
+            return True
+        with open(self.users_file, mode="r") as file:
+            header = next(csv.reader(file), [])
+        return all(column in header for column in REQUIRED_COLUMNS)
+
+    def validate_row(self, row: dict) -> bool:
+        return not self.get_row_errors(row)
+
+    def get_row_errors(self, row: dict) -> List[str]:
+        return [
+            reason for column, check, reason in ROW_RULES if not check(row.get(column))
+        ]